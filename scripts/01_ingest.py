@@ -2,24 +2,46 @@
 import sys, os
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
 
-import json
-from pathlib import Path
-from src.ingestion.pdf_reader import read_pdf_text
-from src.ingestion.sanitizer import clean_page
+import argparse
+from src.ingestion.backends import BACKENDS, DEFAULT_BACKEND
+from src.ingestion.cache import CACHE_PATH, PageCache
+from src.ingestion.pipeline import ingest_pdf
 
 PDF_PATH = "data/raw/VOLUME_II_NON_COAL_2015.pdf"
 OUT_PATH = "data/interim/2015_pages.jsonl"
+STORE_PATH = "data/interim/2015_pages.arrow"
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Extract & clean page text from a DGMS PDF")
+    ap.add_argument("--pdf", default=PDF_PATH)
+    ap.add_argument("--out", default=OUT_PATH, help="JSONL export (for debugging)")
+    ap.add_argument("--store", default=STORE_PATH, help="Arrow page store read by 02_extract")
+    ap.add_argument("--no-jsonl", action="store_true", help="only write the page store")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="processes for page extraction (0 = all cores)")
+    ap.add_argument("--cache", default=CACHE_PATH, help="page cache database")
+    ap.add_argument("--no-cache", action="store_true", help="re-extract every page")
+    ap.add_argument("--backend", default=DEFAULT_BACKEND, choices=sorted(BACKENDS),
+                    help="text extraction backend (pypdfium2 is faster, pdfplumber more layout-faithful)")
+    return ap.parse_args()
 
 def main():
-    pages = read_pdf_text(PDF_PATH)
-    Path(os.path.dirname(OUT_PATH)).mkdir(parents=True, exist_ok=True)
+    args = parse_args()
+    workers = args.workers or None
+    out = None if args.no_jsonl else args.out
 
-    with open(OUT_PATH, "w", encoding="utf-8") as f:
-        for p in pages:
-            p["text"] = clean_page(p["text"])
-            f.write(json.dumps(p, ensure_ascii=False) + "\n")
+    if args.no_cache:
+        m = ingest_pdf(args.pdf, out, workers=workers, backend=args.backend,
+                       store_path=args.store)
+    else:
+        with PageCache(args.cache) as cache:
+            m = ingest_pdf(args.pdf, out, workers=workers, cache=cache,
+                           backend=args.backend, store_path=args.store)
 
-    print(f"[OK] Extracted & cleaned pages → {OUT_PATH} | total pages = {len(pages)}")
+    print(f"[INFO] pages extracted = {m['extracted']} | re-cleaned = {m['recleaned']} "
+          f"| from cache = {m['cached']} | {m['seconds']:.2f}s")
+    print(f"[OK] Extracted & cleaned pages → {args.store}"
+          + (f" (+ {out})" if out else "") + f" | total pages = {m['pages']}")
 
 if __name__ == "__main__":
     main()
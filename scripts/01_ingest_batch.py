@@ -0,0 +1,35 @@
+# scripts/01_ingest_batch.py
+import sys, os
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import argparse
+from src.ingestion.batch import OUT_DIR, RAW_DIR, SUMMARY_NAME, ingest_batch
+from src.ingestion.backends import BACKENDS, DEFAULT_BACKEND
+from src.ingestion.cache import CACHE_PATH
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Ingest every DGMS PDF under a directory")
+    ap.add_argument("--raw-dir", default=RAW_DIR)
+    ap.add_argument("--out-dir", default=OUT_DIR)
+    ap.add_argument("--workers", type=int, default=0, help="volumes in parallel (0 = all cores)")
+    ap.add_argument("--cache", default=CACHE_PATH, help="page cache database")
+    ap.add_argument("--no-cache", action="store_true", help="re-extract every page")
+    ap.add_argument("--no-jsonl", action="store_true", help="only write the page stores")
+    ap.add_argument("--backend", default=DEFAULT_BACKEND, choices=sorted(BACKENDS),
+                    help="text extraction backend (pypdfium2 is faster, pdfplumber more layout-faithful)")
+    return ap.parse_args()
+
+def main():
+    args = parse_args()
+    s = ingest_batch(args.raw_dir, args.out_dir, workers=args.workers or None,
+                     cache_path=None if args.no_cache else args.cache,
+                     backend=args.backend, jsonl=not args.no_jsonl)
+
+    print(f"[INFO] {s['succeeded']}/{s['volumes']} volumes | {s['pages']} pages "
+          f"| {s['seconds']:.2f}s | {s['pages_per_sec']} pages/s")
+    print(f"[OK] Run summary → {os.path.join(args.out_dir, SUMMARY_NAME)}")
+    if s["failed"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
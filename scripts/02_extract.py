@@ -1,37 +1,97 @@
 import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
 
+import argparse
+import glob
 import json
-import pandas as pd
-from pathlib import Path
-from src.extraction.regex_bootstrap import split_records, parse_block
+import pyarrow.parquet as pq
+from src.extraction.canonical import NAMES_PATH, NameIndex, canonicalize_table
+from src.extraction.postprocess import (mark_dataset_duplicates, mark_duplicates, normalize_table,
+                                        parse_failures, read_secondary_csvs)
+from src.extraction.regex_bootstrap import CHUNK_SIZE, iter_record_dicts
+from src.storage.arrow_builder import ParquetRecordWriter
+from src.storage.dataset import DATASET_DIR, write_volume
+from src.storage.normalized import read_accidents, write_accidents, write_normalized
+from src.storage.page_store import PageStore
 
+STORE_FILE = "data/interim/2015_pages.arrow"
 INPUT_FILE = "data/interim/2015_pages.jsonl"
 OUT_FILE = "data/processed/2015.parquet"
+NORM_DIR = "data/processed/2015"  # accidents.parquet + victims.parquet
 SOURCE_FILE = "VOLUME_II_NON_COAL_2015.pdf"
+SECONDARY_CSVS = "secondary_model/extracted_data/*.csv"   # compared for duplicates, not merged
+SECONDARY_DUPS_FILE = "data/processed/secondary_duplicates.parquet"
+YEAR = 2015
+
+def iter_pages():
+    # Clean page dicts, one at a time (memory-mapped page store; JSONL if 01_ingest predates it)
+    if os.path.exists(STORE_FILE):
+        with PageStore(STORE_FILE) as store:
+            yield from store.iter_pages()
+    else:
+        with open(INPUT_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Parse accident records from cleaned pages")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="processes for block parsing (0 = all cores)")
+    ap.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="blocks per worker task")
+    ap.add_argument("--validate", choices=["all", "sample", "none"], default="sample",
+                    help="pydantic checks on records before writing (default: every 100th)")
+    return ap.parse_args()
 
 def main():
-    # Load clean page text
-    with open(INPUT_FILE, "r", encoding="utf-8") as f:
-        pages = [json.loads(line)["text"] for line in f]
+    args = parse_args()
+
+    # Stream pages → accident blocks (records may straddle page breaks) → record
+    # dicts → Arrow columns → Parquet row groups; nothing is held in full
+    records = iter_record_dicts(iter_pages(), SOURCE_FILE,
+                                workers=args.workers or None, chunk_size=args.chunk_size)
+    with ParquetRecordWriter(OUT_FILE, validate=args.validate) as writer:
+        for rec in records:
+            writer.write(rec)
+    print(f"[INFO] Found {writer.rows} accident blocks")
 
-    blob = "\n".join(pages)
+    print(f"[OK] Saved structured records → {OUT_FILE}")
 
-    # Split into accident blocks
-    blocks = split_records(blob)
-    print(f"[INFO] Found {len(blocks)} accident blocks")
+    # Partitioned copy (year/volume/state) that readers can filter without
+    # loading other volumes; only this volume's partitions are replaced
+    write_volume(OUT_FILE, DATASET_DIR, year=YEAR)
+    print(f"[OK] Updated {YEAR} partitions → {DATASET_DIR}/")
 
-    # Parse each block
-    records = []
-    for b in blocks:
-        rec = parse_block(b, SOURCE_FILE)
-        records.append(rec.model_dump())
+    # Near-duplicates across every volume of the dataset (reprints, overlapping
+    # volumes) and against the secondary_model CSVs; rows stay, duplicate_of
+    # points at the first copy and 03_build_index skips the rest
+    reference = read_secondary_csvs(sorted(glob.glob(SECONDARY_CSVS)))
+    marked, secondary = mark_dataset_duplicates(DATASET_DIR, reference)
+    print(f"[INFO] Marked {marked} near-duplicate records across {DATASET_DIR}/")
+    if secondary.num_rows:
+        pq.write_table(secondary, SECONDARY_DUPS_FILE)
+        print(f"[INFO] {secondary.num_rows - secondary.column('duplicate_of').null_count}/{secondary.num_rows} "
+              f"secondary_model CSV rows duplicate an earlier record → {SECONDARY_DUPS_FILE}")
 
-    # Save to parquet
-    Path(os.path.dirname(OUT_FILE)).mkdir(parents=True, exist_ok=True)
-    pd.DataFrame(records).to_parquet(OUT_FILE, index=False)
+    # Normalized copy: victims as their own table keyed by accident_id, with
+    # dates, times, counts and ages parsed into typed columns
+    counts = write_normalized(OUT_FILE, NORM_DIR, transform=normalize_table)
+    accidents = read_accidents(NORM_DIR)
+    failures = parse_failures(accidents)
+    if any(failures.values()):
+        print(f"[INFO] Unparsed values (kept in *_raw columns): {failures}")
 
-    print(f"[OK] Saved structured records → {OUT_FILE}")
+    # Canonical mine/owner IDs; the index persists, so names seen in earlier
+    # volumes resolve to the same IDs
+    with NameIndex(NAMES_PATH) as names:
+        accidents = canonicalize_table(accidents, names)
+
+    # Copies within this volume, by accident_id (the dataset above also has
+    # the verdict across volumes)
+    accidents = mark_duplicates(accidents, key_columns=("date", "mine_id", "persons_killed"))
+    write_accidents(accidents, NORM_DIR)
+    n_dup = accidents.num_rows - accidents.column("duplicate_of").null_count
+    print(f"[INFO] Marked {n_dup} near-duplicate accidents within the volume")
+    print(f"[OK] Saved {counts['accidents']} accidents / {counts['victims']} victims → {NORM_DIR}/")
 
 if __name__ == "__main__":
     main()
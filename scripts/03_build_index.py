@@ -1,50 +1,99 @@
 # scripts/03_build_index.py
 
+import argparse
 import os
-from pathlib import Path
+import shutil
 
 # ensure project package is importable
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
 
-import pandas as pd
 from dotenv import load_dotenv
 
 # Load env vars if present
 load_dotenv()
 
-# LangChain imports
-from langchain_community.vectorstores import Chroma
-from langchain_community.embeddings import HuggingFaceEmbeddings
+import pyarrow.parquet as pq
 
 # our code
-from src.storage.table import records_to_documents
+from src.storage.dataset import DATASET_DIR
+from src.storage.embed_cache import CACHE_DIR, EmbeddingCache
+from src.storage.index_build import (DOC_BATCH_SIZE, EMBED_MODEL, INDEX_DIR, INSERT_CHUNK,
+                                     ChromaSink, build_index, dataset_documents)
+from src.storage.quantize import QUANTIZATIONS
+from src.storage.vectorstore import STORE_DIR, NumpyVectorStore
 
-DATA_FILE = "data/processed/2015.parquet"
-INDEX_DIR = "indexes/accidents"
+def parse_args():
+    ap = argparse.ArgumentParser(description="Embed accident records into the vector index")
+    ap.add_argument("--year", type=int, nargs="+", help="only these years")
+    ap.add_argument("--state", nargs="+", help="only these states")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="encoder processes (0 = all cores)")
+    ap.add_argument("--batch-size", type=int, default=DOC_BATCH_SIZE, help="documents per encode task")
+    ap.add_argument("--chunk-size", type=int, default=INSERT_CHUNK, help="vectors per index upsert")
+    ap.add_argument("--no-cache", action="store_true",
+                    help=f"re-encode every record instead of reusing vectors in {CACHE_DIR}")
+    ap.add_argument("--store", choices=["chroma", "numpy"], default="chroma",
+                    help=f"Chroma collection in {INDEX_DIR} or memory-mapped store in {STORE_DIR}")
+    ap.add_argument("--quantize", choices=QUANTIZATIONS,
+                    help="with --store numpy, also write int8 or 1-bit codes for in-RAM search")
+    ap.add_argument("--fresh", action="store_true", help="drop the existing collection first")
+    ap.add_argument("--compact", action="store_true",
+                    help="only de-duplicate and shrink the existing index, then exit")
+    args = ap.parse_args()
+    if args.quantize and args.store != "numpy":
+        ap.error("--quantize needs --store numpy (Chroma keeps float32 vectors only)")
+    return args
 
 def main():
-    print("[INFO] Loading accident records...")
-    df = pd.read_parquet(DATA_FILE)
+    args = parse_args()
+    if args.compact:
+        print("[INFO] Compacting vector index...")
+        stats = ChromaSink(INDEX_DIR).compact()
+        print(f"[OK] {stats['before']} → {stats['after']} records, chroma.sqlite3 "
+              f"{stats['sqlite_bytes_before']} → {stats['sqlite_bytes_after']} bytes")
+        return
+
+    filters = []
+    if args.year:
+        filters.append(("year", "in", args.year))
+    if args.state:
+        filters.append(("state", "in", args.state))
+    expr = pq.filters_to_expression(filters) if filters else None
 
-    docs = records_to_documents(df)
-    print(f"[INFO] Preparing to embed {len(docs)} records...")
+    print("[INFO] Loading accident records...")
+    total, batches = dataset_documents(DATASET_DIR, filter=expr, batch_size=args.batch_size)
+    print(f"[INFO] Preparing to embed {total} records...")
 
-    # ✅ Local embedding model (no API key, no quota issues)
-    model_name = "sentence-transformers/all-MiniLM-L6-v2"
-    embeddings = HuggingFaceEmbeddings(model_name=model_name)
+    # ✅ Local embedding model (no API key, no quota issues). Batches are
+    # streamed from Parquet and encoded in worker processes; unchanged records
+    # are skipped, cached vectors reused, and a full (unfiltered) build also
+    # deletes records that are gone and evicts unused cached vectors
+    cache = None if args.no_cache else EmbeddingCache(EMBED_MODEL)
 
-    # Create index directory
-    Path(INDEX_DIR).mkdir(parents=True, exist_ok=True)
+    if args.store == "numpy":
+        if args.fresh:
+            shutil.rmtree(STORE_DIR, ignore_errors=True)
+        sink, out_dir = NumpyVectorStore(STORE_DIR, quantization=args.quantize), STORE_DIR
+    else:
+        sink, out_dir = ChromaSink(INDEX_DIR, reset=args.fresh), INDEX_DIR
 
-    print("[INFO] Creating vector index using Chroma...")
-    Chroma.from_documents(
-        docs,
-        embedding=embeddings,
-        persist_directory=INDEX_DIR
+    print(f"[INFO] Building vector index using {args.store}...")
+    state = build_index(
+        batches, total,
+        index_dir=out_dir,
+        model_name=EMBED_MODEL,
+        workers=args.workers or None,
+        insert_chunk=args.chunk_size,
+        full=not filters,
+        sink=sink,
+        cache=cache,
     )
 
-    print(f"[✅ SUCCESS] Vector index stored in: {INDEX_DIR}")
+    print(f"[INFO] {state['checked']} documents: {state['upserted']} upserted ({state['encoded']} encoded), "
+          f"{state['unchanged']} unchanged, {state['deleted']} deleted in {state['seconds']}s "
+          f"({state['docs_per_sec']} docs/s)")
+    print(f"[✅ SUCCESS] Vector index stored in: {out_dir}")
 
 if __name__ == "__main__":
     main()
@@ -11,18 +11,38 @@ from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_community.llms import Ollama
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnablePassthrough, RunnableLambda
+from src.storage.bm25 import BM25Index
+from src.storage.hybrid import HybridRetriever
 
 INDEX_DIR = "indexes/accidents"
 
+# "chroma" or "numpy" (the memory-mapped store built by 03_build_index --store numpy)
+VECTOR_STORE = os.getenv("VECTOR_STORE", "chroma")
+# numpy store only: search "int8" or "binary" codes, re-ranking k * VECTOR_RESCORE by exact cosine
+VECTOR_QUANTIZATION = os.getenv("VECTOR_QUANTIZATION") or None
+VECTOR_RESCORE = int(os.getenv("VECTOR_RESCORE", "4"))
+# "hybrid" fuses dense results with BM25 over the same records (bm25.npz next to the index); "dense" doesn't
+RETRIEVER = os.getenv("RETRIEVER", "hybrid")
+
 def build_pipeline():
     embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
 
-    db = Chroma(
-        embedding_function=embeddings,
-        persist_directory=INDEX_DIR
-    )
-
-    retriever = db.as_retriever(search_type="similarity", search_kwargs={"k": 5})
+    if VECTOR_STORE == "numpy":
+        from src.storage.vectorstore import STORE_DIR, NumpyVectorStore
+        db = NumpyVectorStore(STORE_DIR, embedding=embeddings,
+                              quantization=VECTOR_QUANTIZATION, rescore=VECTOR_RESCORE)
+        index_dir = STORE_DIR
+    else:
+        db = Chroma(
+            embedding_function=embeddings,
+            persist_directory=INDEX_DIR
+        )
+        index_dir = INDEX_DIR
+
+    if RETRIEVER == "hybrid":
+        retriever = HybridRetriever(vectorstore=db, lexical=BM25Index.load(index_dir), k=5)
+    else:
+        retriever = db.as_retriever(search_type="similarity", search_kwargs={"k": 5})
 
     llm = Ollama(model="llama3")
 
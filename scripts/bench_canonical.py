@@ -0,0 +1,81 @@
+# scripts/bench_canonical.py
+# Mine-name canonicalization: trigram-blocked NameIndex vs. scoring every
+# known entity, on synthetic names with spelling/suffix variants (both must
+# find the same entities); then a warm rerun that only hits the alias cache.
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+import random
+import tempfile
+import time
+from src.extraction.canonical import MATCH_THRESHOLD, NameIndex, mine_key, trigrams
+
+SYLLABLES = [c + v for c in ["b", "bh", "ch", "d", "dh", "g", "h", "j", "k", "kh", "l", "m", "n",
+                              "p", "r", "s", "sh", "t", "th", "v"] for v in "aeiou"]
+MINERALS = ["LIMESTONE", "IRON ORE", "MARBLE", "GRANITE", "COPPER", "MANGANESE", "BAUXITE"]
+SUFFIXES = ["MINE", "MINES", "QUARRY", "PROJECT", "MINE(M.L.NO.12/09", "OPEN CAST MINE"]
+
+def names(n, seed=0):
+    """n raw names over ~n/3 mines: each mine reappears with suffix and one-letter variants."""
+    rng = random.Random(seed)
+    mines = [(("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) + " " +
+               "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))).upper(),
+              rng.choice(MINERALS)) for _ in range(n // 3)]
+    out = []
+    for _ in range(n):
+        base, mineral = rng.choice(mines)
+        if rng.random() < 0.2:
+            i = rng.randrange(len(base))
+            base = base[:i] + rng.choice("AEIOU") + base[i + 1:]
+        out.append(f"{base} {mineral} {rng.choice(SUFFIXES)}")
+    return out
+
+def all_pairs(raws, threshold=MATCH_THRESHOLD):
+    # Same keys and scoring, but every new key is compared with every entity
+    entities = []
+    for raw in raws:
+        grams = trigrams(mine_key(raw))
+        for g in entities:
+            if 2 * len(grams & g) / (len(grams) + len(g)) >= threshold:
+                break
+        else:
+            entities.append(grams)
+    return len(entities)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[3_000, 30_000])
+    ap.add_argument("--all-pairs-max", type=int, default=30_000)
+    args = ap.parse_args()
+
+    print(f"{'names':>8} {'entities':>9} {'blocked s':>10} {'all-pairs s':>12} {'warm s':>8}")
+    for n in args.sizes:
+        raws = names(n)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "names.sqlite3")
+            t0 = time.perf_counter()
+            with NameIndex(path) as idx:
+                for raw in raws:
+                    idx.resolve("mine", raw)
+                n_entities = len(idx.names["mine"])
+            t_blocked = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            with NameIndex(path) as idx:
+                for raw in raws:
+                    idx.resolve("mine", raw)
+                assert len(idx.names["mine"]) == n_entities
+            t_warm = time.perf_counter() - t0
+
+        if n <= args.all_pairs_max:
+            t0 = time.perf_counter()
+            # Blocking must not miss a match: both create the same entities
+            assert all_pairs(list(dict.fromkeys(raws))) == n_entities
+            t_all = f"{time.perf_counter() - t0:.2f}"
+        else:
+            t_all = "-"
+        print(f"{n:>8} {n_entities:>9} {t_blocked:>10.2f} {t_all:>12} {t_warm:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# scripts/bench_dataset_query.py
+# "Multi-fatality accidents in one state and year": read the single records
+# file and filter in pandas (what consumers of data/processed/2015.parquet do)
+# vs. read_dataset with the filter pushed down to partitions and row groups.
+# The 2015 volume is replicated as several volumes per year.
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+import tempfile
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.storage.dataset import open_dataset, read_dataset, write_volume
+
+DATA_FILE = "data/processed/2015.parquet"
+COLUMNS = ["date", "mine", "state", "persons_killed", "narrative"]
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data", default=DATA_FILE)
+    ap.add_argument("--years", type=int, default=10)
+    ap.add_argument("--volumes", type=int, default=4, help="volumes per year")
+    ap.add_argument("--copies", type=int, default=500, help="copies of the records per volume")
+    ap.add_argument("--state", default="Andhra Pradesh")
+    ap.add_argument("--min-killed", type=int, default=2)
+    args = ap.parse_args()
+
+    base = pq.read_table(args.data).replace_schema_metadata(None)
+    volume = pa.concat_tables([base] * args.copies)
+    year = 2015
+    with tempfile.TemporaryDirectory() as tmp:
+        single, root = os.path.join(tmp, "all.parquet"), os.path.join(tmp, "dataset")
+        writer = None
+        t0 = time.perf_counter()
+        for y in range(2015, 2015 + args.years):
+            for v in range(args.volumes):
+                write_volume(volume, root, year=y, volume=f"VOL{v}")
+                t = volume.append_column("year", pa.array([y] * volume.num_rows, pa.int16()))
+                writer = writer or pq.ParquetWriter(single, t.schema)
+                writer.write_table(t)
+        writer.close()
+        n = open_dataset(root).count_rows()
+        print(f"[INFO] {n} rows in {args.years} years x {args.volumes} volumes ({time.perf_counter() - t0:.1f}s to write)")
+
+        def pandas_filter():
+            df = pd.read_parquet(single, columns=COLUMNS + ["year"])
+            return df[(df["year"] == year) & (df["state"] == args.state) & (df["persons_killed"] >= args.min_killed)]
+
+        def pushdown():
+            return read_dataset(root, columns=COLUMNS, filters=[
+                ("year", "=", year), ("state", "=", args.state), ("persons_killed", ">=", args.min_killed)])
+
+        a, t_pd = timed(pandas_filter)
+        b, t_ds = timed(pushdown)
+        assert len(a) == b.num_rows
+        assert sorted(a["mine"]) == sorted(b.column("mine").to_pylist())
+        print(f"{'query':>12} {'rows':>7} {'sec':>8}")
+        print(f"{'full read':>12} {len(a):>7} {t_pd:>8.4f}")
+        print(f"{'pushdown':>12} {b.num_rows:>7} {t_ds:>8.4f}  ({t_pd / t_ds:.0f}x)")
+
+if __name__ == "__main__":
+    main()
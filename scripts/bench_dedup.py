@@ -0,0 +1,92 @@
+# scripts/bench_dedup.py
+# Near-duplicate detection: MinHash/LSH vs. exact all-pairs Jaccard (recall
+# and precision on a small corpus), then LSH time as the corpus grows, without
+# and with exact keys (half of them missing, as for records with no date).
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+import random
+import re
+import time
+import pandas as pd
+from src.extraction.postprocess import DUP_THRESHOLD, SHINGLE_SIZE, duplicate_groups
+
+DATA_FILE = "data/processed/2015.parquet"
+
+def corpus(n, vocab, dup_rate=0.1, seed=0):
+    """n narratives of ~150 random corpus words; dup_rate of them are lightly edited copies."""
+    rng = random.Random(seed)
+    texts, truth = [], []
+    for i in range(n):
+        if texts and rng.random() < dup_rate:
+            src = rng.randrange(len(texts))
+            words = texts[src].split()
+            for _ in range(rng.randint(0, 3)):    # a reprint: a few words changed
+                words[rng.randrange(len(words))] = rng.choice(vocab)
+            texts.append(" ".join(words))
+            truth.append(truth[src])
+        else:
+            texts.append(" ".join(rng.choice(vocab) for _ in range(150)))
+            truth.append(i)
+    return texts, truth
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a | b else 0.0
+
+def shingle_set(text):
+    w = text.lower().split()
+    return {" ".join(w[i:i + SHINGLE_SIZE]) for i in range(len(w) - SHINGLE_SIZE + 1)}
+
+def brute_force_pairs(texts, threshold):
+    sets = [shingle_set(t) for t in texts]
+    return {(i, j) for i in range(len(sets)) for j in range(i + 1, len(sets))
+            if jaccard(sets[i], sets[j]) >= threshold}
+
+def group_pairs(groups):
+    by = {}
+    for i, g in enumerate(groups):
+        by.setdefault(int(g), []).append(i)
+    return {(a, b) for m in by.values() for x, a in enumerate(m) for b in m[x + 1:]}
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data", default=DATA_FILE)
+    ap.add_argument("--exact-n", type=int, default=2000)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    args = ap.parse_args()
+
+    narratives = pd.read_parquet(args.data, columns=["narrative"])["narrative"].dropna()
+    vocab = sorted({w for t in narratives for w in re.findall(r"[A-Za-z]+", t.lower())})
+
+    texts, _ = corpus(args.exact_n, vocab)
+    t0 = time.perf_counter()
+    exact = brute_force_pairs(texts, DUP_THRESHOLD)
+    t_exact = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    found = group_pairs(duplicate_groups(texts))
+    t_lsh = time.perf_counter() - t0
+    hit = len(exact & found)
+    print(f"n={args.exact_n}: all-pairs {t_exact:.2f}s, LSH {t_lsh:.2f}s; "
+          f"recall {hit / max(len(exact), 1):.3f}, precision {hit / max(len(found), 1):.3f} "
+          f"({len(exact)} true pairs at Jaccard >= {DUP_THRESHOLD})")
+    assert hit >= 0.9 * len(exact), "LSH recall dropped"
+
+    print(f"\n{'records':>8} {'LSH s':>7} {'keyed s':>8} {'dup groups found/planted':>25}")
+    for n in args.sizes:
+        texts, truth = corpus(n, vocab)
+        t0 = time.perf_counter()
+        groups = duplicate_groups(texts)
+        t = time.perf_counter() - t0
+        keys = [None if i % 2 else ("key", truth[i]) for i in range(n)]
+        t0 = time.perf_counter()
+        keyed = duplicate_groups(texts, keys)
+        t_keyed = time.perf_counter() - t0
+        planted = n - len(set(truth))
+        print(f"{n:>8} {t:>7.2f} {t_keyed:>8.2f} {n - len(set(groups.tolist())):>12}/{planted}")
+        # Missing keys must not pair up with each other
+        assert t_keyed < 2 * t + 1, f"exact keys made dedup superlinear: {t_keyed:.2f}s vs {t:.2f}s"
+        assert len(set(keyed.tolist())) <= len(set(groups.tolist()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# scripts/bench_documents.py
+# records_to_documents as it was (iterrows + record_to_text + clean_metadata
+# per row) vs. the column-wise builder, on the 2015 records replicated to
+# 100k+ rows. tests/test_table.py checks that both build the same documents.
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+import time
+import pandas as pd
+from langchain_core.documents import Document
+from src.storage.table import clean_metadata, iter_documents, record_to_text, records_to_documents
+
+DATA_FILE = "data/processed/2015.parquet"
+
+def legacy_records_to_documents(df):
+    docs = []
+    for _, row in df.iterrows():
+        text = record_to_text(row)
+        meta = clean_metadata(row.to_dict())
+        docs.append(Document(page_content=text, metadata=meta))
+    return docs
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data", default=DATA_FILE)
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--batch-size", type=int, default=1024)
+    args = ap.parse_args()
+
+    base = pd.read_parquet(args.data)
+    df = pd.concat([base] * (args.rows // len(base) + 1), ignore_index=True).iloc[:args.rows]
+    print(f"[INFO] {len(df)} records")
+
+    old, t_old = timed(lambda: legacy_records_to_documents(df))
+    new, t_new = timed(lambda: records_to_documents(df))
+    batches, t_iter = timed(lambda: [len(b) for b in iter_documents(df, batch_size=args.batch_size)])
+    assert len(old) == len(new) == sum(batches)
+
+    print(f"{'builder':>18} {'sec':>8} {'speedup':>8}")
+    print(f"{'iterrows':>18} {t_old:>8.2f} {1:>8.1f}")
+    print(f"{'column-wise':>18} {t_new:>8.2f} {t_old / t_new:>8.1f}")
+    print(f"{'batches of ' + str(args.batch_size):>18} {t_iter:>8.2f} {t_old / t_iter:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# scripts/bench_extract.py
+# Record extraction throughput as the corpus grows (streaming tokenizer vs.
+# the join-everything-then-split path), then as worker processes are added.
+# That parallel parsing matches serial parsing is checked by
+# tests/test_regex_bootstrap.py.
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+import json
+import time
+from src.extraction.regex_bootstrap import (FIELD_PATS, iter_blocks, iter_record_dicts,
+                                            parse_block, parse_victims, split_records)
+from src.storage.schema import AccidentRecord
+
+INPUT_FILE = "data/interim/2015_pages.jsonl"
+SOURCE_FILE = "VOLUME_II_NON_COAL_2015.pdf"
+
+def legacy_parse(block):
+    # parse_block before FIELD_SCAN: two searches per field, a third for victims
+    vals = {key: (FIELD_PATS[key].search(block).group(1).strip()
+                  if FIELD_PATS[key].search(block) else None)
+            for key in FIELD_PATS}
+    victims = parse_victims(block)
+    return AccidentRecord(
+        date=vals["date"] or "", time=vals["time"], mine=vals["mine"], owner=vals["owner"],
+        district=vals["district"], state=vals["state"], code=None, cause=None,
+        narrative=block.strip(), prevention=None,
+        persons_killed=max(len(victims), 1 if vals["persons"] else 0),
+        victims=victims, source_doc=SOURCE_FILE, page_span=[])
+
+def run_legacy(pages):
+    blob = "\n".join(p["text"] for p in pages)
+    return [legacy_parse(b) for b in split_records(blob)]
+
+def run_stream(pages):
+    return [parse_block(b, SOURCE_FILE, page_span=s) for b, s in iter_blocks(iter(pages))]
+
+def replicate(pages, copies):
+    n = len(pages)
+    return [{"page": c * n + p["page"], "text": p["text"]} for c in range(copies) for p in pages]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--input", default=INPUT_FILE)
+    ap.add_argument("--copies", type=int, nargs="+", default=[10, 50, 100, 200])
+    ap.add_argument("--workers", type=int, nargs="+",
+                    default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = ap.parse_args()
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        pages = [json.loads(line) for line in f]
+
+    print(f"{'pages':>7} {'records':>8} {'legacy rec/s':>13} {'stream rec/s':>13}")
+    for c in args.copies:
+        corpus = replicate(pages, c)
+        t0 = time.perf_counter()
+        legacy = run_legacy(corpus)
+        t_legacy = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        stream = run_stream(corpus)
+        t_stream = time.perf_counter() - t0
+        assert len(legacy) == len(stream)
+        print(f"{len(corpus):>7} {len(stream):>8} {len(legacy) / t_legacy:>13.0f} "
+              f"{len(stream) / t_stream:>13.0f}")
+
+    # Throughput curve vs. worker count on the largest corpus
+    corpus = replicate(pages, max(args.copies))
+    baseline = None
+    print(f"\n{'workers':>7} {'rec/s':>8} {'speedup':>8}")
+    for w in args.workers:
+        t0 = time.perf_counter()
+        out = list(iter_record_dicts(iter(corpus), SOURCE_FILE, workers=w))
+        t = time.perf_counter() - t0
+        baseline = baseline or t
+        print(f"{w:>7} {len(out) / t:>8.0f} {baseline / t:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# scripts/bench_hybrid.py
+# BM25 index built by build_index next to a NumpyVectorStore, and the hybrid
+# retriever of 04_chat_cli on top of both: latency of a lexical lookup, of the
+# dense retriever 04_chat_cli used before and of the hybrid one, for
+# exact-token queries (mine, owner and district names). BM25 scores and merged
+# builds are checked in tests/test_bm25.py.
+# The stub encoder of check_embed_cache stands in for sentence-transformers, so
+# dense timings exclude query embedding and dense rankings are arbitrary.
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+import tempfile
+import time
+import numpy as np
+import pyarrow.parquet as pq
+import src.storage.index_build as index_build
+from scripts.check_embed_cache import StubModel, stub_load_model, volume
+from src.storage.bm25 import BM25Index
+from src.storage.dataset import write_volume
+from src.storage.hybrid import HybridRetriever
+from src.storage.vectorstore import NumpyVectorStore
+
+DATA_FILE = "data/processed/2015.parquet"
+
+class StubEmbeddings:
+    # Query vectors are made up front, so timings are of search alone
+    def __init__(self, queries):
+        self.vectors = {q: v for q, v in zip(queries, StubModel().encode(queries))}
+
+    def embed_query(self, text):
+        return self.vectors[text] if text in self.vectors else StubModel().encode([text])[0]
+
+    def embed_documents(self, texts):
+        return list(StubModel().encode(texts))
+
+def per_call(fn, queries, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for q in queries:
+            fn(q)
+        best = min(best, (time.perf_counter() - t0) / len(queries))
+    return best
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data", default=DATA_FILE)
+    ap.add_argument("--years", type=int, default=10)
+    ap.add_argument("--copies", type=int, default=100, help="copies of the records per year")
+    args = ap.parse_args()
+
+    index_build._load_model = stub_load_model
+    base = pq.read_table(args.data).replace_schema_metadata(None)
+    quiet = lambda *a: None
+
+    def build(root, index_dir):
+        total, batches = index_build.dataset_documents(root)
+        index_build.build_index(batches, total, index_dir=index_dir, sink=NumpyVectorStore(index_dir), log=quiet)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root, full_dir = os.path.join(tmp, "dataset"), os.path.join(tmp, "full")
+        for y in range(2015, 2015 + args.years):
+            write_volume(volume(base, y, args.copies), root, year=y, volume=f"V{y}")
+
+        t0 = time.perf_counter()
+        build(root, full_dir)
+        lexical = BM25Index.load(full_dir)
+        size = os.path.getsize(os.path.join(full_dir, "bm25.npz"))
+        print(f"[INFO] {len(lexical)} documents, {len(lexical.terms)} terms, {len(lexical.post_doc)} postings; "
+              f"bm25.npz {size / 2**20:.1f} MB; build {time.perf_counter() - t0:.1f}s")
+
+        records = base.to_pylist()
+        queries = sorted({r[f] for r in records for f in ("mine", "owner", "district") if r.get(f)})
+
+        store = NumpyVectorStore(full_dir, embedding=StubEmbeddings(queries))
+        hybrid = HybridRetriever(vectorstore=store, lexical=lexical, k=5)
+        t_lex = per_call(lambda q: lexical.search(q, hybrid.fetch_k), queries)
+        t_dense = per_call(store.as_retriever(search_type="similarity", search_kwargs={"k": 5}).invoke, queries)
+        t_hybrid = per_call(hybrid.invoke, queries)
+
+        hits = np.mean([any(q in d.page_content or q == d.metadata.get("owner") for d in hybrid.invoke(q))
+                        for q in queries])
+        print(f"{'search':>8} {'ms/query':>9}")
+        print(f"{'bm25':>8} {t_lex * 1e3:>9.3f}")
+        print(f"{'dense':>8} {t_dense * 1e3:>9.3f}")
+        print(f"{'hybrid':>8} {t_hybrid * 1e3:>9.3f}  (+{(t_hybrid - t_dense) * 1e3:.3f} over dense)")
+        print(f"[OK] hybrid top-5 holds the queried name for {hits:.0%} of {len(queries)} exact-name queries")
+
+if __name__ == "__main__":
+    main()
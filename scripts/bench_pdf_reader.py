@@ -0,0 +1,47 @@
+# scripts/bench_pdf_reader.py
+# Pages/sec per text backend, serial vs. process-pool page extraction.
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+import time
+from src.ingestion.backends import BACKENDS
+from src.ingestion.pdf_reader import read_pdf_text
+
+PDF_PATH = "data/raw/VOLUME_II_NON_COAL_2015.pdf"
+
+def bench(pdf_path, workers, repeat, backend):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        pages = read_pdf_text(pdf_path, workers=workers, backend=backend)
+        best = min(best, time.perf_counter() - t0)
+    return pages, best
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pdf", default=PDF_PATH)
+    ap.add_argument("--backends", nargs="+", default=sorted(BACKENDS), choices=sorted(BACKENDS))
+    ap.add_argument("--workers", type=int, nargs="+",
+                    default=sorted({2, 4, os.cpu_count() or 1}))
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    print(f"{'backend':>11} {'workers':>8} {'sec':>8} {'pages/s':>9} {'speedup':>8}")
+    reference = None
+    for backend in args.backends:
+        baseline, t_serial = bench(args.pdf, 1, args.repeat, backend)
+        n = len(baseline)
+        reference = reference or t_serial
+        print(f"{backend:>11} {1:>8} {t_serial:>8.2f} {n / t_serial:>9.1f} {reference / t_serial:>8.2f}")
+
+        for w in args.workers:
+            if w <= 1:
+                continue
+            pages, t = bench(args.pdf, w, args.repeat, backend)
+            assert pages == baseline, f"{backend} workers={w} output differs from serial"
+            print(f"{backend:>11} {w:>8} {t:>8.2f} {n / t:>9.1f} {reference / t:>8.2f}")
+    print(f"[INFO] {args.pdf}: {n} pages | speedup is vs. serial {args.backends[0]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# scripts/bench_postprocess.py
+# Date/time normalization: the per-entry strptime loop over DATE_FORMATS used
+# in secondary_model vs. parse-once-per-distinct-value columns.
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+import pyarrow as pa
+from src.extraction.postprocess import DATE_FORMATS, normalize_dates, normalize_times, parse_date, parse_time
+
+def legacy_dates(values):
+    out = []
+    for s in values:
+        date_obj = None
+        for fmt in DATE_FORMATS:
+            try:
+                date_obj = datetime.strptime(s, fmt)
+                break
+            except:
+                continue
+        out.append(date_obj.date() if date_obj else None)
+    return out
+
+def synthetic(n, seed=0):
+    # A decade of day-first dates in mixed formats, plus some junk; times to the minute
+    rng = random.Random(seed)
+    start = date(2010, 1, 1)
+    fmts = ["%d/%m/%y", "%d.%m.%Y", "%d-%m-%y"]
+    dates, times = [], []
+    for _ in range(n):
+        d = start + timedelta(days=rng.randrange(3650))
+        dates.append(d.strftime(rng.choice(fmts)) if rng.random() > 0.01 else "illegible")
+        times.append(f"{rng.randrange(24)}.{rng.randrange(60):02d}")
+    return dates, times
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = ap.parse_args()
+
+    # Digits around a date shape don't make it a date
+    for raw in ("16/05/201", "116/05/150", "16/05/15 extra", "1/1/20155"):
+        assert parse_date(raw) is None, raw
+    assert parse_date(" 16/05/15 ") == date(2015, 5, 16)
+
+    print(f"{'rows':>9} {'legacy s':>9} {'columnar s':>11} {'speedup':>8}")
+    for n in args.rows:
+        dates, times = synthetic(n)
+        parse_date.cache_clear()
+        parse_time.cache_clear()
+
+        t0 = time.perf_counter()
+        legacy = legacy_dates(dates)
+        t_legacy = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        col = normalize_dates(pa.array(dates))
+        normalize_times(pa.array(times))
+        t_col = time.perf_counter() - t0
+
+        assert col.to_pylist() == legacy, "date results differ"
+        print(f"{n:>9} {t_legacy:>9.3f} {t_col:>11.3f} {t_legacy / t_col:>8.1f}")
+
+if __name__ == "__main__":
+    main()
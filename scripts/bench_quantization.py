@@ -0,0 +1,77 @@
+# scripts/bench_quantization.py
+# NumpyVectorStore with float32, int8 and binary codes, with and without
+# rescoring: bytes of vectors held in RAM for search, query latency, and
+# recall@5 against the exact float32 results. Vectors are synthetic 384-d
+# embeddings grouped in topics and sub-topics of a few records each, and each
+# query is a noisy copy of one record. Recall floors on a smaller set of the
+# same kind are enforced by tests/test_quantization.py.
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+import tempfile
+import time
+import numpy as np
+from src.storage.vectorstore import NumpyVectorStore
+
+DIM = 384
+PER_SUBTOPIC = 5
+SUBTOPICS_PER_TOPIC = 20
+# Noise norms, chosen so that top-5 cosines land around 0.4-0.8
+SUB_NOISE, DOC_NOISE, QUERY_NOISE = 0.8, 0.9, 0.8
+
+def unit(x):
+    return (x / np.linalg.norm(x, axis=-1, keepdims=True)).astype(np.float32)
+
+def noise(rng, n, scale):
+    return rng.standard_normal((n, DIM)) * scale / np.sqrt(DIM)
+
+def synthetic(n: int, queries: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    subtopics = n // PER_SUBTOPIC
+    topics = unit(rng.standard_normal((subtopics // SUBTOPICS_PER_TOPIC + 1, DIM)))
+    subs = unit(topics[np.arange(subtopics) // SUBTOPICS_PER_TOPIC] + noise(rng, subtopics, SUB_NOISE))
+    vectors = unit(subs[np.arange(n) // PER_SUBTOPIC % subtopics] + noise(rng, n, DOC_NOISE))
+    q = unit(vectors[rng.integers(0, n, queries)] + noise(rng, queries, QUERY_NOISE))
+    return vectors, q
+
+def search_bytes(store) -> int:
+    if store.quantization is None:
+        return store._segments[0][1].nbytes
+    return sum(c.nbytes for c in store._quantized())
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=100_000)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--k", type=int, default=5)
+    ap.add_argument("--rescore", type=int, nargs="+", default=[0, 4, 10], help="shortlist sizes, as multiples of k")
+    args = ap.parse_args()
+
+    vectors, queries = synthetic(args.docs, args.queries)
+    ids = [f"doc{i}" for i in range(args.docs)]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = NumpyVectorStore(tmp)
+        store.upsert(ids, vectors, ids, [{} for _ in ids])
+        store.flush()
+        del store
+
+        exact = None
+        print(f"[INFO] {args.docs} docs, {args.queries} queries, top-{args.k}")
+        print(f"{'mode':>8} {'rescore':>8} {'RAM MB':>8} {'ms/query':>9} {'recall@' + str(args.k):>9}")
+        modes = [(None, 0)] + [(m, r) for m in ("int8", "binary") for r in args.rescore]
+        for mode, rescore in modes:
+            store = NumpyVectorStore(tmp, quantization=mode, rescore=rescore)
+            store.search_vectors(queries[:1], args.k)      # quantize if not flushed, warm up
+            # One query at a time, as the chat assistant issues them
+            t0 = time.perf_counter()
+            results = [store.search_vectors(q, args.k)[0][0] for q in queries]
+            latency = (time.perf_counter() - t0) / len(queries)
+            if exact is None:
+                exact = results
+            recall = np.mean([len(set(r) & set(e)) / args.k for r, e in zip(results, exact)])
+            print(f"{mode or 'float32':>8} {rescore if mode else '-':>8} {search_bytes(store) / 2**20:>8.1f} "
+                  f"{latency * 1e3:>9.2f} {recall:>9.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# scripts/bench_record_text.py
+# Size of the text embedded / prompted per record: the whole raw block (old
+# record_to_text) vs. the section-aware projection, at a few field settings.
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+import json
+from src.extraction.regex_bootstrap import block_values, iter_blocks
+from src.storage.table import FULL_TEXT_FIELDS, record_to_text
+
+INPUT_FILE = "data/interim/2015_pages.jsonl"
+SOURCE_FILE = "VOLUME_II_NON_COAL_2015.pdf"
+
+def legacy_record_to_text(record):
+    fields = [
+        f"Date: {record.get('date')}",
+        f"Mine: {record.get('mine')}",
+        f"Owner: {record.get('owner')}",
+        f"State: {record.get('state')}",
+        f"District: {record.get('district')}",
+        f"Persons Killed: {record.get('persons_killed')}",
+        f"Narrative: {record.get('narrative')}",
+    ]
+    return "\n".join([f for f in fields if f is not None])
+
+def approx_tokens(text):
+    # ~4 characters per token for English prose under common BPE vocabularies
+    return len(text) / 4
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--input", default=INPUT_FILE)
+    args = ap.parse_args()
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        pages = [json.loads(line) for line in f]
+
+    old, new = [], []
+    for block, span, section in iter_blocks(iter(pages), sections=True):
+        rec = block_values(block, SOURCE_FILE, span, section)
+        old.append(legacy_record_to_text({**rec, "narrative": block.strip()}))
+        new.append(rec)
+
+    variants = [
+        ("raw block (old)", old),
+        ("full fields", [record_to_text(r, FULL_TEXT_FIELDS) for r in new]),
+        ("default", [record_to_text(r) for r in new]),
+        ("default, 300 chars", [record_to_text(r, max_chars=300) for r in new]),
+    ]
+    base = sum(map(len, old))
+    print(f"{len(old)} records")
+    print(f"{'projection':>20} {'chars/rec':>10} {'~tokens/rec':>12} {'vs old':>7}")
+    for name, texts in variants:
+        total = sum(map(len, texts))
+        print(f"{name:>20} {total / len(texts):>10.0f} "
+              f"{sum(map(approx_tokens, texts)) / len(texts):>12.0f} {total / base:>7.2f}")
+
+if __name__ == "__main__":
+    main()
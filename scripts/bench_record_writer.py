@@ -0,0 +1,69 @@
+# scripts/bench_record_writer.py
+# Records → Parquet: pydantic objects + model_dump + DataFrame.to_parquet (the
+# old 02_extract path) vs. plain dicts through the columnar Arrow builder.
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+import pyarrow.parquet as pq
+from src.extraction.regex_bootstrap import iter_blocks, iter_record_dicts, parse_block
+from src.storage.arrow_builder import write_records_parquet
+
+INPUT_FILE = "data/interim/2015_pages.jsonl"
+SOURCE_FILE = "VOLUME_II_NON_COAL_2015.pdf"
+
+def run_pydantic(pages, out):
+    recs = [parse_block(b, SOURCE_FILE, page_span=s).model_dump() for b, s in iter_blocks(iter(pages))]
+    pd.DataFrame(recs).to_parquet(out, index=False)
+    return len(recs)
+
+def run_builder(pages, out, validate):
+    return write_records_parquet(iter_record_dicts(iter(pages), SOURCE_FILE), out, validate=validate)
+
+def replicate(pages, copies):
+    n = len(pages)
+    return [{"page": c * n + p["page"], "text": p["text"]} for c in range(copies) for p in pages]
+
+def measure(fn, *args):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    n = fn(*args)
+    t = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return n, t, peak / 2**20
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--input", default=INPUT_FILE)
+    ap.add_argument("--copies", type=int, nargs="+", default=[10, 100, 400])
+    args = ap.parse_args()
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        pages = [json.loads(line) for line in f]
+
+    print(f"{'records':>8} {'path':>16} {'rec/s':>8} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for c in args.copies:
+            corpus = replicate(pages, c)
+            outs = {}
+            for name, fn, extra in [("pydantic+pandas", run_pydantic, ()),
+                                    ("builder/sample", run_builder, ("sample",)),
+                                    ("builder/all", run_builder, ("all",)),
+                                    ("builder/none", run_builder, ("none",))]:
+                out = os.path.join(tmp, name.replace("/", "_") + ".parquet")
+                n, t, peak = measure(fn, corpus, out, *extra)
+                outs[name] = out
+                print(f"{n:>8} {name:>16} {n / t:>8.0f} {peak:>8.1f}")
+            # Same rows and values either way
+            ref = pq.read_table(outs["pydantic+pandas"]).to_pylist()
+            for name, out in outs.items():
+                assert pq.read_table(out).to_pylist() == ref, f"{name} output differs"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# scripts/bench_sanitizer.py
+# Speed of the single-pass sanitizer against the original regex-per-line
+# implementation (with sanitizer v2's rule: Code lines kept). Byte identity
+# is checked by tests/test_sanitizer.py.
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+import re
+import time
+from src.ingestion.pdf_reader import read_pdf_text
+from src.ingestion.sanitizer import clean_page, clean_pages
+
+PDF_PATH = "data/raw/VOLUME_II_NON_COAL_2015.pdf"
+
+_HEADER = re.compile(r"^\s*STATEMENT NO", re.IGNORECASE)
+
+def legacy_clean_page(text: str):
+    lines = []
+    for line in text.splitlines():
+        if _HEADER.match(line.strip()):
+            continue
+        lines.append(line)
+
+    cleaned = "\n".join(lines)
+    cleaned = re.sub(r"[ \t]+", " ", cleaned)
+    return cleaned.strip()
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pdf", default=PDF_PATH)
+    ap.add_argument("--copies", type=int, default=200, help="replicate raw pages to this many volumes")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    # Raw extractor output, which is what ingestion feeds in
+    raw = [p["text"] for p in read_pdf_text(args.pdf)] * args.copies
+    _, t_old = timed(lambda: [legacy_clean_page(t) for t in raw], args.repeat)
+    _, t_new = timed(lambda: [clean_page(t) for t in raw], args.repeat)
+    _, t_batch = timed(lambda: list(clean_pages(raw)), args.repeat)
+
+    print(f"{'impl':>12} {'sec':>8} {'pages/s':>10} {'speedup':>8}")
+    for name, t in (("legacy", t_old), ("clean_page", t_new), ("clean_pages", t_batch)):
+        print(f"{name:>12} {t:>8.3f} {len(raw) / t:>10.0f} {t_old / t:>8.2f}")
+
+if __name__ == "__main__":
+    main()
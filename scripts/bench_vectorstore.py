@@ -0,0 +1,112 @@
+# scripts/bench_vectorstore.py
+# NumpyVectorStore vs. Chroma on synthetic 384-d unit vectors: cold start
+# (open the persisted store and answer one query), single and batched query
+# latency, filtered queries, and memory. Chroma is skipped when chromadb isn't
+# installed. Results are checked against brute force in tests/test_vectorstore.py.
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+import importlib.util
+import resource
+import tempfile
+import time
+import numpy as np
+from src.storage.vectorstore import NumpyVectorStore
+
+DIM = 384
+STATES = ["Jharkhand", "Odisha", "Rajasthan", "Andhra Pradesh", "Madhya Pradesh", "Telangana"]
+
+def rss_mb() -> float:
+    # Peak resident set size of this process (ru_maxrss is in KiB on Linux)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def synthetic(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((n, DIM)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    ids = [f"doc{i}" for i in range(n)]
+    texts = [f"accident record {i}" for i in range(n)]
+    metas = [{"state": STATES[i % len(STATES)], "year": 2015 + i % 10, "persons_killed": i % 4}
+             for i in range(n)]
+    return ids, vectors, texts, metas
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+def bench_numpy(path, data, queries, k, flt):
+    ids, vectors, texts, metas = data
+    t0 = time.perf_counter()
+    store = NumpyVectorStore(path)
+    store.upsert(ids, vectors, texts, metas)
+    store.flush()
+    build = time.perf_counter() - t0
+    del store
+
+    t0 = time.perf_counter()
+    store = NumpyVectorStore(path)
+    store.search_vectors(queries[:1], k)
+    cold = time.perf_counter() - t0
+
+    _, single = best_of(lambda: store.search_vectors(queries[:1], k))
+    _, t_batch = best_of(lambda: store.search_vectors(queries, k))
+    _, t_filter = best_of(lambda: store.search_vectors(queries, k, flt))
+    return {"build": build, "cold": cold, "single": single,
+            "batch": t_batch / len(queries), "filter": t_filter / len(queries)}
+
+def bench_chroma(path, data, queries, k, flt):
+    import chromadb
+    ids, vectors, texts, metas = data
+    t0 = time.perf_counter()
+    client = chromadb.PersistentClient(path=path)
+    col = client.get_or_create_collection("bench", metadata={"hnsw:space": "cosine"})
+    for i in range(0, len(ids), 2048):
+        col.upsert(ids=ids[i:i + 2048], embeddings=vectors[i:i + 2048].tolist(),
+                   documents=texts[i:i + 2048], metadatas=metas[i:i + 2048])
+    build = time.perf_counter() - t0
+    del col, client
+
+    t0 = time.perf_counter()
+    col = chromadb.PersistentClient(path=path).get_collection("bench")
+    col.query(query_embeddings=queries[:1].tolist(), n_results=k)
+    cold = time.perf_counter() - t0
+
+    _, single = best_of(lambda: col.query(query_embeddings=queries[:1].tolist(), n_results=k))
+    _, t_batch = best_of(lambda: col.query(query_embeddings=queries.tolist(), n_results=k))
+    where = {"$and": [{"state": flt["state"]}, {"persons_killed": flt["persons_killed"]}]}
+    _, t_filter = best_of(lambda: col.query(query_embeddings=queries.tolist(), n_results=k, where=where))
+    return {"build": build, "cold": cold, "single": single,
+            "batch": t_batch / len(queries), "filter": t_filter / len(queries)}
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    ap.add_argument("--queries", type=int, default=64)
+    ap.add_argument("--k", type=int, default=5)
+    args = ap.parse_args()
+
+    if importlib.util.find_spec("chromadb"):
+        backends = {"numpy": bench_numpy, "chroma": bench_chroma}
+    else:
+        print("[INFO] chromadb not installed; Chroma comparison skipped")
+        backends = {"numpy": bench_numpy}
+
+    flt = {"state": "Odisha", "persons_killed": {"$gte": 2}}
+    print(f"{'store':>7} {'docs':>7} {'build s':>8} {'cold ms':>8} {'1 query ms':>11} "
+          f"{'batched ms/q':>13} {'filtered ms/q':>14} {'peak RSS MB':>12}")
+    for n in args.sizes:
+        data = synthetic(n)
+        queries = synthetic(args.queries, seed=1)[1]
+        for name, bench in backends.items():
+            with tempfile.TemporaryDirectory() as tmp:
+                r = bench(tmp, data, queries, args.k, flt)
+            print(f"{name:>7} {n:>7} {r['build']:>8.2f} {r['cold'] * 1e3:>8.1f} {r['single'] * 1e3:>11.2f} "
+                  f"{r['batch'] * 1e3:>13.3f} {r['filter'] * 1e3:>14.3f} {rss_mb():>12.0f}")
+
+if __name__ == "__main__":
+    main()
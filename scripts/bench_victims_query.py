@@ -0,0 +1,65 @@
+# scripts/bench_victims_query.py
+# "Age distribution of drillers killed": walking the nested victims column
+# (and the str(...) blobs kept in Chroma metadata) vs. a scan of the
+# normalized victims table.
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+import ast
+import tempfile
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.storage.normalized import read_victims, write_normalized
+
+DATA_FILE = "data/processed/2015.parquet"
+ROLE = "Driller"
+
+def nested_ages(df):
+    return sorted(v["age"] for vs in df["victims"] for v in vs if v["role"].strip() == ROLE)
+
+def stringified_ages(blobs):
+    # What a consumer of clean_metadata() has to do today
+    return sorted(v["age"] for s in blobs for v in ast.literal_eval(s) if v["role"].strip() == ROLE)
+
+def normalized_ages(out_dir):
+    ages = read_victims(out_dir, columns=["age"], filters=[("role", "=", ROLE)]).column("age")
+    return sorted(ages.to_pylist())
+
+def timed(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data", default=DATA_FILE)
+    ap.add_argument("--copies", type=int, nargs="+", default=[1, 100, 1000])
+    args = ap.parse_args()
+
+    base = pq.read_table(args.data)
+    print(f"{'accidents':>9} {'nested s':>9} {'str blobs s':>11} {'normalized s':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for c in args.copies:
+            table = pa.concat_tables([base] * c)
+            nested_path = os.path.join(tmp, "nested.parquet")
+            pq.write_table(table, nested_path)
+            out_dir = os.path.join(tmp, "norm")
+            write_normalized(nested_path, out_dir)
+
+            df = pd.read_parquet(nested_path, columns=["victims"])
+            blobs = [str(list(vs)) for vs in df["victims"]]
+
+            a, t_nested = timed(lambda: nested_ages(pd.read_parquet(nested_path, columns=["victims"])))
+            b, t_str = timed(stringified_ages, blobs)
+            n, t_norm = timed(normalized_ages, out_dir)
+            assert a == b == n, "age lists differ"
+            print(f"{table.num_rows:>9} {t_nested:>9.4f} {t_str:>11.4f} {t_norm:>12.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# scripts/check_backend_parity.py
+# Runs the regex extractor over the output of two text backends and reports
+# field-level differences between the resulting accident records.
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+import time
+from collections import Counter
+from src.extraction.regex_bootstrap import split_records, parse_block
+from src.ingestion.backends import BACKENDS, DEFAULT_BACKEND
+from src.ingestion.pipeline import iter_clean_pages
+
+PDF_PATH = "data/raw/VOLUME_II_NON_COAL_2015.pdf"
+
+def extract_records(pdf_path, backend):
+    t0 = time.perf_counter()
+    pages = [p["text"] for p in iter_clean_pages(pdf_path, backend=backend)]
+    seconds = time.perf_counter() - t0
+    source = os.path.basename(pdf_path)
+    records = [parse_block(b, source).model_dump() for b in split_records("\n".join(pages))]
+    return records, len(pages), seconds
+
+def normalize(field, value):
+    # Line wrapping inside the narrative is layout, not content
+    if field == "narrative" and isinstance(value, str):
+        return " ".join(value.split())
+    return value
+
+def diff_context(va, vb, width=40):
+    """Short excerpts of both values around the first position where they differ."""
+    va, vb = str(va), str(vb)
+    k = next((i for i, (x, y) in enumerate(zip(va, vb)) if x != y), min(len(va), len(vb)))
+    lo = max(0, k - width // 2)
+    return va[lo:k + width], vb[lo:k + width]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pdf", default=PDF_PATH)
+    ap.add_argument("--reference", default=DEFAULT_BACKEND, choices=sorted(BACKENDS))
+    ap.add_argument("--candidate", default="pypdfium2", choices=sorted(BACKENDS))
+    ap.add_argument("--show", type=int, default=3, help="example diffs to print per field")
+    args = ap.parse_args()
+
+    ref, n_pages, t_ref = extract_records(args.pdf, args.reference)
+    cand, _, t_cand = extract_records(args.pdf, args.candidate)
+
+    print(f"[INFO] {args.reference}: {n_pages / t_ref:.1f} pages/s | "
+          f"{args.candidate}: {n_pages / t_cand:.1f} pages/s | speedup {t_ref / t_cand:.1f}x")
+    print(f"[INFO] records: {args.reference}={len(ref)} {args.candidate}={len(cand)}")
+
+    diffs = Counter()
+    examples = {}
+    for i, (a, b) in enumerate(zip(ref, cand)):
+        for field in a:
+            va, vb = normalize(field, a[field]), normalize(field, b[field])
+            if va != vb:
+                diffs[field] += 1
+                examples.setdefault(field, []).append((i, va, vb))
+
+    compared = min(len(ref), len(cand))
+    print(f"{'field':>15} {'mismatches':>11}")
+    for field in ref[0] if ref else []:
+        print(f"{field:>15} {diffs[field]:>7}/{compared}")
+    for field, rows in examples.items():
+        for i, va, vb in rows[:args.show]:
+            ea, eb = diff_context(va, vb)
+            print(f"  [{field}] record {i}: {args.reference}=…{ea!r}… {args.candidate}=…{eb!r}…")
+
+    if len(ref) != len(cand) or diffs:
+        print("[WARN] backends disagree — see field diffs above")
+        sys.exit(1)
+    print("[OK] backends produce identical records")
+
+if __name__ == "__main__":
+    main()
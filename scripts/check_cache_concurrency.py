@@ -0,0 +1,76 @@
+# scripts/check_cache_concurrency.py
+# Several batch workers sharing one page cache must not serialize on its write
+# lock or fail with "database is locked". Extraction is simulated with a fixed
+# sleep per page (so workers overlap even on one core); each worker ingests one
+# volume through PageCache, as ingest_batch does. A second run must come
+# entirely from the cache.
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+import multiprocessing as mp
+import tempfile
+import time
+import src.ingestion.cache as cache_mod
+from src.ingestion.cache import PageCache
+
+def fake_page_count(pdf_path, backend=None):
+    return PAGES
+
+def fake_iter_pdf_text(pdf_path, workers=1, pages=None, backend=None):
+    for n in pages:
+        time.sleep(DELAY)
+        yield {"page": n, "text": f"STATEMENT NO. {n}\\n{os.path.basename(pdf_path)}  page\\t{n}"}
+
+def ingest(args):
+    cache_path, pdf = args
+    t0 = time.perf_counter()
+    try:
+        stats = {}
+        with PageCache(cache_path) as cache:
+            n = sum(1 for _ in cache.iter_clean_pages(pdf, stats=stats))
+        return "ok", n, stats["extracted"], time.perf_counter() - t0
+    except Exception as e:
+        return f"{type(e).__name__}: {e}", 0, 0, time.perf_counter() - t0
+
+def run(pool, cache_path, pdfs):
+    t0 = time.perf_counter()
+    results = pool.map(ingest, [(cache_path, p) for p in pdfs])
+    return results, time.perf_counter() - t0
+
+def main():
+    global PAGES, DELAY
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--pages", type=int, default=200)
+    ap.add_argument("--delay", type=float, default=0.005, help="seconds per simulated page")
+    args = ap.parse_args()
+    PAGES, DELAY = args.pages, args.delay
+    cache_mod.page_count = fake_page_count
+    cache_mod.iter_pdf_text = fake_iter_pdf_text
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdfs = []
+        for i in range(args.workers):
+            pdfs.append(os.path.join(tmp, f"vol{i}.pdf"))
+            with open(pdfs[-1], "wb") as f:
+                f.write(os.urandom(1024))
+        cache_path = os.path.join(tmp, "pages.sqlite3")
+        ideal = args.pages * args.delay
+
+        # fork, so workers see the patched extractor
+        with mp.get_context("fork").Pool(args.workers) as pool:
+            first, wall = run(pool, cache_path, pdfs)
+            again, wall_again = run(pool, cache_path, pdfs)
+
+        failed = [r[0] for r in first + again if r[0] != "ok"]
+        print(f"[INFO] {args.workers} workers x {args.pages} pages, {args.delay * 1e3:.0f} ms/page")
+        print(f"[INFO] first run {wall:.2f}s (one volume alone: {ideal:.2f}s), cached run {wall_again:.2f}s")
+        assert not failed, failed
+        assert all(r[1] == args.pages and r[2] == args.pages for r in first)
+        assert all(r[1] == args.pages and r[2] == 0 for r in again)
+        assert wall < 2 * ideal, f"workers serialized on the cache: {wall:.2f}s vs {ideal:.2f}s"
+    print("[OK] Workers extracted in parallel without lock errors; second run fully cached")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# scripts/check_embed_cache.py
+# Index rebuilds with the embedding cache: a second build of the same data
+# encodes nothing, adding a year encodes only that year's records, and
+# removing a volume evicts its vectors. A stub encoder stands in for
+# sentence-transformers (it counts what it is asked to encode) and an
+# in-memory sink for Chroma, so this runs without either installed.
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+import hashlib
+import shutil
+import tempfile
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import src.storage.index_build as index_build
+from src.storage.dataset import write_volume
+from src.storage.embed_cache import EmbeddingCache
+
+DATA_FILE = "data/processed/2015.parquet"
+DIM = 384
+
+class StubModel:
+    calls = 0
+
+    def encode(self, texts, batch_size=None, show_progress_bar=False):
+        StubModel.calls += len(texts)
+        seeds = [int.from_bytes(hashlib.blake2b(t.encode(), digest_size=8).digest(), "little") for t in texts]
+        return np.stack([np.random.default_rng(s).standard_normal(DIM, dtype=np.float32) for s in seeds])
+
+def stub_load_model(model_name, threads=None):
+    index_build._model = StubModel()
+    return index_build._model
+
+class MemorySink:
+    def __init__(self):
+        self.vectors = {}
+
+    def existing(self):
+        return {}
+
+    def upsert(self, ids, vectors, texts, metadatas):
+        self.vectors.update(zip(texts, vectors))
+
+    def delete(self, ids):
+        pass
+
+    def flush(self):
+        pass
+
+def volume(base, year, copies):
+    # Distinct narratives per copy, so every row is its own text
+    tables = []
+    for c in range(copies):
+        narrative = pc.binary_join_element_wise(base.column("narrative"), pa.scalar(f" [{year}/{c}]"), "")
+        tables.append(base.set_column(base.column_names.index("narrative"), "narrative", narrative))
+    return pa.concat_tables(tables)
+
+def build(root, cache, sink, full=True):
+    StubModel.calls = 0
+    total, batches = index_build.dataset_documents(root)
+    with tempfile.TemporaryDirectory() as index_dir:
+        state = index_build.build_index(batches, total, index_dir=index_dir, sink=sink,
+                                        cache=cache, full=full, log=lambda *a: None)
+    assert state["encoded"] == StubModel.calls
+    return state
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data", default=DATA_FILE)
+    ap.add_argument("--copies", type=int, default=200, help="copies of the records per year")
+    args = ap.parse_args()
+
+    index_build._load_model = stub_load_model
+    base = pq.read_table(args.data).replace_schema_metadata(None)
+    with tempfile.TemporaryDirectory() as tmp:
+        root, cache_dir = os.path.join(tmp, "dataset"), os.path.join(tmp, "cache")
+        write_volume(volume(base, 2015, args.copies), root, year=2015, volume="V2015")
+        n_year = base.num_rows * args.copies
+
+        print(f"{'build':>26} {'docs':>7} {'encoded':>8} {'evicted':>8} {'cached':>7} {'sec':>6}")
+        def report(label, state, cache):
+            print(f"{label:>26} {state['checked']:>7} {state['encoded']:>8} {state.get('evicted', 0):>8} "
+                  f"{len(cache):>7} {state['seconds']:>6.2f}")
+
+        steps = [
+            ("first build", None, n_year),
+            ("same data again", None, 0),
+            ("+ 2016", lambda: write_volume(volume(base, 2016, args.copies), root, year=2016, volume="V2016"), n_year),
+            ("- 2015", lambda: shutil.rmtree(os.path.join(root, "year=2015")), 0),
+        ]
+        reference = MemorySink()
+        for label, change, expect in steps:
+            if change:
+                change()
+            # Re-open each time, as separate runs of 03_build_index would
+            with EmbeddingCache(index_build.EMBED_MODEL, cache_dir) as cache:
+                sink = MemorySink()
+                state = build(root, cache, sink)
+                report(label, state, cache)
+                assert state["encoded"] == expect, (label, state["encoded"], expect)
+                assert len(cache) == state["checked"]
+            # Cached vectors equal freshly encoded ones
+            build(root, None, reference, full=False)
+            assert all(np.array_equal(v, reference.vectors[t]) for t, v in sink.vectors.items())
+    print("[OK] Only new texts were encoded; evicted entries match removed records")
+
+if __name__ == "__main__":
+    main()
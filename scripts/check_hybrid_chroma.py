@@ -0,0 +1,121 @@
+# scripts/check_hybrid_chroma.py
+# The hybrid retriever of 04_chat_cli over its default store, langchain
+# Chroma, whose similarity_search returns Documents without IDs and which has
+# no get_by_ids. For every exact-name query the retriever must return the
+# fused top k with IDs and stored texts, fetching lexical-only hits from the
+# collection. With chromadb and langchain_community installed the index is a
+# real persisted Chroma collection; otherwise an in-memory stand-in with the
+# same query / get results and the same ID-less similarity_search is used.
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+import tempfile
+import numpy as np
+import pyarrow.parquet as pq
+import src.storage.index_build as index_build
+from langchain_core.documents import Document
+from scripts.bench_hybrid import StubEmbeddings
+from scripts.check_embed_cache import DATA_FILE, stub_load_model, volume
+from src.storage.bm25 import BM25Index
+from src.storage.dataset import write_volume
+from src.storage.hybrid import HybridRetriever, rrf
+
+class MemoryChromaCollection:
+    """chromadb Collection.query / get over a dict, squared-L2 like Chroma's default space."""
+
+    def __init__(self):
+        self.rows = {}
+
+    def query(self, query_embeddings, n_results, include):
+        ids = list(self.rows)
+        vectors = np.stack([self.rows[i][0] for i in ids])
+        out = {"ids": [], "documents": [], "metadatas": []}
+        for q in query_embeddings:
+            order = np.argsort(((vectors - np.asarray(q)) ** 2).sum(axis=1), kind="stable")[:n_results]
+            out["ids"].append([ids[i] for i in order])
+            out["documents"].append([self.rows[ids[i]][1] for i in order])
+            out["metadatas"].append([self.rows[ids[i]][2] for i in order])
+        return out
+
+    def get(self, ids, include):
+        found = [i for i in ids if i in self.rows]
+        return {"ids": found, "documents": [self.rows[i][1] for i in found],
+                "metadatas": [self.rows[i][2] for i in found]}
+
+class MemoryChroma:
+    """Index sink for build_index and, once built, a langchain_community Chroma look-alike."""
+
+    def __init__(self):
+        self._collection = MemoryChromaCollection()
+        self.embeddings = None
+
+    def existing(self):
+        return {}
+
+    def upsert(self, ids, vectors, texts, metadatas):
+        for id_, v, text, meta in zip(ids, vectors, texts, metadatas):
+            self._collection.rows[id_] = (np.asarray(v), text, {k: x for k, x in meta.items() if x is not None})
+
+    def delete(self, ids):
+        for id_ in ids:
+            self._collection.rows.pop(id_, None)
+
+    def flush(self):
+        pass
+
+    def similarity_search(self, query, k=4, **kwargs):
+        res = self._collection.query([self.embeddings.embed_query(query)], k, ["documents", "metadatas"])
+        return [Document(page_content=t, metadata=m) for t, m in zip(res["documents"][0], res["metadatas"][0])]
+
+def open_store(index_dir, embeddings):
+    """(sink, store) on real Chroma if it is installed, else (stand-in, same stand-in)."""
+    try:
+        from langchain_community.vectorstores import Chroma
+        from src.storage.index_build import ChromaSink
+        sink = ChromaSink(index_dir)
+        return sink, lambda: Chroma(embedding_function=embeddings, persist_directory=index_dir)
+    except ImportError:
+        store = MemoryChroma()
+        store.embeddings = embeddings
+        return store, lambda: store
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data", default=DATA_FILE)
+    ap.add_argument("--copies", type=int, default=5, help="copies of the records")
+    args = ap.parse_args()
+
+    index_build._load_model = stub_load_model
+    base = pq.read_table(args.data).replace_schema_metadata(None)
+    records = base.to_pylist()
+    queries = sorted({r[f] for r in records for f in ("mine", "owner", "district") if r.get(f)})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root, index_dir = os.path.join(tmp, "dataset"), os.path.join(tmp, "index")
+        write_volume(volume(base, 2015, args.copies), root, year=2015, volume="V2015")
+        sink, open_db = open_store(index_dir, StubEmbeddings(queries))
+        total, batches = index_build.dataset_documents(root)
+        index_build.build_index(batches, total, index_dir=index_dir, sink=sink, log=lambda *a: None)
+        db = open_db()
+        print(f"[INFO] {total} documents in {type(db).__name__}")
+
+        hybrid = HybridRetriever(vectorstore=db, lexical=BM25Index.load(index_dir), k=5)
+        fetched = 0
+        for q in queries:
+            dense = db._collection.query(query_embeddings=[db.embeddings.embed_query(q)],
+                                         n_results=hybrid.fetch_k, include=["documents"])["ids"][0]
+            lexical = [id_ for id_, _ in hybrid.lexical.search(q, hybrid.fetch_k)]
+            expect = rrf([dense, lexical], hybrid.rrf_k)[:hybrid.k]
+            docs = hybrid.invoke(q)
+            assert [d.id for d in docs] == expect, q
+            stored = db._collection.get(ids=expect, include=["documents"])
+            texts = dict(zip(stored["ids"], stored["documents"]))
+            assert all(d.page_content == texts[d.id] for d in docs), q
+            fetched += sum(1 for id_ in expect if id_ not in dense)
+        assert fetched, "no lexical-only hit was fetched by ID"
+    print(f"[OK] Hybrid retrieval over Chroma returned the fused top {hybrid.k} for {len(queries)} queries "
+          f"({fetched} lexical-only hits fetched from the collection)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# scripts/check_ingest_memory.py
+# Peak memory of streaming ingestion vs. the old build-a-list path, on
+# synthetic volumes made by repeating the pages of a real DGMS PDF. Each run
+# is a child process and its peak RSS (ru_maxrss) is reported, so buffers
+# held by pdfminer's and PDFium's C code count too, not only the Python heap.
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+import json
+import subprocess
+import tempfile
+import pdfplumber
+import pypdfium2 as pdfium
+from src.ingestion.pipeline import ingest_pdf
+from src.ingestion.sanitizer import clean_page
+
+PDF_PATH = "data/raw/VOLUME_II_NON_COAL_2015.pdf"
+
+def make_volume(src_path, copies, out_path):
+    src = pdfium.PdfDocument(src_path)
+    dst = pdfium.PdfDocument.new()
+    for _ in range(copies):
+        dst.import_pages(src)
+    dst.save(out_path)
+    n = len(dst)
+    dst.close()
+    src.close()
+    return n
+
+def ingest_list(pdf_path, out_path):
+    # Pre-streaming behaviour: materialize every page (keeping pdfplumber's
+    # per-page caches alive), then sanitize + write
+    with pdfplumber.open(pdf_path) as pdf:
+        pages = [{"page": i, "text": page.extract_text() or ""}
+                 for i, page in enumerate(pdf.pages, start=1)]
+    with open(out_path, "w", encoding="utf-8") as f:
+        for p in pages:
+            p["text"] = clean_page(p["text"])
+            f.write(json.dumps(p, ensure_ascii=False) + "\n")
+    return len(pages)
+
+RUNS = {"stream": ingest_pdf, "list": ingest_list}
+
+def peak_mb(run, pdf_path, out_path):
+    # getrusage(RUSAGE_CHILDREN) is the largest of all children so far;
+    # wait4 gives the ru_maxrss (KiB on Linux) of this one alone
+    proc = subprocess.Popen([sys.executable, "-m", "scripts.check_ingest_memory",
+                             "--run", run, pdf_path, out_path])
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, proc.args)
+    return usage.ru_maxrss / 1024
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pdf", default=PDF_PATH)
+    ap.add_argument("--copies", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--tolerance", type=float, default=1.5,
+                    help="max allowed ratio of largest to smallest streaming peak")
+    ap.add_argument("--run", choices=RUNS, help=argparse.SUPPRESS)
+    ap.add_argument("paths", nargs="*", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.run:
+        # Child process: one ingestion of paths[0] into paths[1]
+        RUNS[args.run](*args.paths)
+        return
+
+    print(f"{'pages':>6} {'stream MiB':>11} {'list MiB':>9}   (peak RSS)")
+    stream_peaks = []
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "pages.jsonl")
+        for c in args.copies:
+            vol = os.path.join(tmp, f"vol_{c}.pdf")
+            n = make_volume(args.pdf, c, vol)
+            s = peak_mb("stream", vol, out)
+            l = peak_mb("list", vol, out)
+            stream_peaks.append(s)
+            print(f"{n:>6} {s:>11.1f} {l:>9.1f}")
+
+    ratio = max(stream_peaks) / min(stream_peaks)
+    print(f"[INFO] streaming peak ratio (largest/smallest volume) = {ratio:.2f}")
+    if ratio > args.tolerance:
+        print("[FAIL] streaming peak memory grows with document size")
+        sys.exit(1)
+    print("[OK] streaming peak memory is flat in document size")
+
+if __name__ == "__main__":
+    main()
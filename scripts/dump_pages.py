@@ -0,0 +1,34 @@
+# scripts/dump_pages.py
+# Print or export a page range from an Arrow page store without reading the rest.
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import argparse
+from src.storage.page_store import PageStore
+
+STORE_FILE = "data/interim/2015_pages.arrow"
+
+def parse_range(spec: str):
+    # "12" → (12, 13); "10-14" → (10, 15)
+    lo, _, hi = spec.partition("-")
+    return int(lo), int(hi or lo) + 1
+
+def main():
+    ap = argparse.ArgumentParser(description="Inspect pages of a page store")
+    ap.add_argument("--store", default=STORE_FILE)
+    ap.add_argument("--pages", help="page or range, e.g. 12 or 10-14 (default: all)")
+    ap.add_argument("--jsonl", help="export the range as JSONL instead of printing it")
+    args = ap.parse_args()
+
+    with PageStore(args.store) as store:
+        start, stop = parse_range(args.pages) if args.pages else (None, None)
+        if args.jsonl:
+            n = store.to_jsonl(args.jsonl, start, stop)
+            print(f"[OK] Exported {n} pages → {args.jsonl}")
+            return
+        for p in store.iter_pages(start, stop):
+            print(f"===== page {p['page']} =====")
+            print(p["text"])
+
+if __name__ == "__main__":
+    main()
@@ -13,8 +13,10 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from datetime import datetime, timedelta
-import pdfplumber, re
+import dgms_parser
+from cause_rules import classify_causes
 import io
+from pdf_text import extract_text
 
 # ======================================================
 # PAGE CONFIGURATION
@@ -63,86 +65,16 @@ st.markdown("""
 # PDF PARSER (for 2015 report and uploads)
 # ======================================================
 def extract_text_from_pdf(uploaded_file):
-    text = ""
-    with pdfplumber.open(uploaded_file) as pdf:
-        for page in pdf.pages:
-            txt = page.extract_text()
-            if txt:
-                text += txt + "\n"
-    return text
+    return extract_text(uploaded_file)
 
 def parse_accidents(text, default_year=2015):
-    entries = re.split(r"\bCode\s*[:\-]", text)
-    data = []
-    for entry in entries[1:]:
-        code_match = re.search(r"([0-9]{3,4}\s*[A-Za-z].*?)(?:\n|$)", entry)
-        code_text = code_match.group(1).strip().replace("\n", " ") if code_match else None
-
-        date_match = re.search(r"Date\s*[:\-]\s*(\d{1,2}[./-]\d{1,2}[./-]\d{2,4})", entry)
-        date_obj = None
-        if date_match:
-            for fmt in ("%d.%m.%y", "%d-%m-%y", "%d/%m/%y", "%d.%m.%Y", "%d-%m-%Y", "%d/%m/%Y"):
-                try:
-                    date_obj = datetime.strptime(date_match.group(1), fmt)
-                    break
-                except:
-                    continue
-
-        mine = re.search(r"Mine\s*[:\-]\s*(.*)", entry)
-        owner = re.search(r"Owner\s*[:\-]\s*(.*)", entry)
-        district = re.search(r"District\s*[:\-]\s*(.*)", entry)
-        state = re.search(r"State\s*[:\-]\s*(.*)", entry)
-        persons = re.search(r"Persons\s*Killed\s*[:\-]\s*(.*)", entry)
-        desc = re.search(r"Description\s*[:\-]\s*(.*)", entry)
-
-        fatalities = len(re.findall(r"\b(killed|died)\b", entry, re.IGNORECASE))
-        injuries = len(re.findall(r"\b(injured)\b", entry, re.IGNORECASE))
-        severity = "Fatal" if fatalities > 0 else "Serious" if injuries > 0 else "Minor"
-
-        if not code_text and not mine and not date_obj:
-            continue
-
-        data.append({
-            "accident_code": code_text,
-            "date": date_obj.strftime("%Y-%m-%d") if date_obj else None,
-            "year": date_obj.year if date_obj else default_year,
-            "state": state.group(1).strip() if state else None,
-            "district": district.group(1).strip() if district else None,
-            "mine_name": mine.group(1).strip() if mine else None,
-            "mine_type": "Opencast" if "Opencast" in entry else "Underground",
-            "owner": owner.group(1).strip() if owner else None,
-            "severity": severity,
-            "fatalities": fatalities,
-            "injuries": injuries,
-            "persons_killed": persons.group(1).strip() if persons else None,
-            "description": desc.group(1).strip() if desc else None,
-        })
-    return pd.DataFrame(data)
+    return dgms_parser.parse_accidents(text, default_year=default_year)
 
 def enrich_accident_data(df):
     df[["code_number", "accident_type"]] = df["accident_code"].str.extract(r"(\d+)\s*(.*)")
     df["code_number"] = df["code_number"].astype(str).str.zfill(4)
 
-    def map_cause(acc_type):
-        if pd.isna(acc_type): return "Other"
-        acc_type = acc_type.lower()
-        if "roof" in acc_type or "side" in acc_type:
-            return "Ground Control Failure"
-        if any(w in acc_type for w in ["wagon", "truck", "conveyor", "tanker", "transport", "movement", "dumper"]):
-            return "Transportation Accident"
-        if any(w in acc_type for w in ["electric", "power", "cable"]):
-            return "Electrical Hazard"
-        if any(w in acc_type for w in ["explosion", "fire", "blowout"]):
-            return "Explosion / Fire"
-        if "fall of person" in acc_type or "height" in acc_type:
-            return "Fall from Height"
-        if "drown" in acc_type or "water" in acc_type:
-            return "Drowning / Flooding"
-        if "machine" in acc_type or "machinery" in acc_type:
-            return "Machinery Failure"
-        return "Other"
-
-    df["cause"] = df["accident_type"].apply(map_cause)
+    df["cause"] = classify_causes(df["accident_type"])
     for col in ["state", "district", "mine_name", "owner", "accident_type", "cause"]:
         df[col] = df[col].astype(str).str.strip().str.title().replace("Nan", "")
     df["accident_id"] = range(1, len(df) + 1)
@@ -0,0 +1,84 @@
+"""
+Cause Classifier Benchmark
+--------------------------
+The row-wise map_cause that app.py / dgms_pdf_to_csv_pipeline.py used to
+apply, against cause_rules.classify_causes, on the accident types found in
+extracted_data/ repeated to a few million rows (with some missing values).
+
+    python bench_causes.py [--rows 2000000]
+"""
+
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import cause_rules
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "extracted_data")
+
+
+def legacy_map_cause(acc_type):
+    # app.py before cause_rules
+    if pd.isna(acc_type): return "Other"
+    acc_type = acc_type.lower()
+    if "roof" in acc_type or "side" in acc_type:
+        return "Ground Control Failure"
+    if any(w in acc_type for w in ["wagon", "truck", "conveyor", "tanker", "transport", "movement", "dumper"]):
+        return "Transportation Accident"
+    if any(w in acc_type for w in ["electric", "power", "cable"]):
+        return "Electrical Hazard"
+    if any(w in acc_type for w in ["explosion", "fire", "blowout"]):
+        return "Explosion / Fire"
+    if "fall of person" in acc_type or "height" in acc_type:
+        return "Fall from Height"
+    if "drown" in acc_type or "water" in acc_type:
+        return "Drowning / Flooding"
+    if "machine" in acc_type or "machinery" in acc_type:
+        return "Machinery Failure"
+    return "Other"
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=2_000_000)
+    args = ap.parse_args()
+
+    types = set()
+    for path in glob.glob(os.path.join(DATA_DIR, "*.csv")):
+        df = pd.read_csv(path)
+        if "accident_type" in df:
+            types.update(df["accident_type"].dropna())
+    # The table gained "mechanical" (from extract_2025_data.py), which the
+    # legacy rules lack; leave such types out of the comparison
+    types = sorted(t for t in types if "mechanical" not in t.lower()) + [None]
+    rng = np.random.default_rng(0)
+    series = pd.Series(np.array(types, dtype=object)[rng.integers(0, len(types), args.rows)])
+    print(f"{len(series):,} rows, {len(types)} distinct accident types")
+
+    old, t_old = timed(lambda: series.apply(legacy_map_cause))
+    cause_rules.get_classifier.cache_clear()
+    new, t_new = timed(lambda: cause_rules.classify_causes(series))
+    assert (new.astype(object) == old).all()
+    cat = series.astype("category")
+    new_cat, t_cat = timed(lambda: cause_rules.classify_causes(cat))
+    assert (new_cat.astype(object) == old).all()
+
+    print(f"{'classifier':>22} {'sec':>8} {'speedup':>8}")
+    print(f"{'legacy apply':>22} {t_old:>8.3f} {1:>8.1f}")
+    print(f"{'rules (object)':>22} {t_new:>8.3f} {t_old / t_new:>8.1f}")
+    print(f"{'rules (categorical)':>22} {t_cat:>8.3f} {t_old / t_cat:>8.1f}")
+    print(new.value_counts().to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Parser Benchmark
+----------------
+The per-field regex loop that app.py / dgms_pdf_to_csv_pipeline.py /
+extract_2025_data.py used to copy, against the shared single-pass engine in
+dgms_parser.py, on the 2015 volume replicated to a few thousand pages. It
+also times building the text with `text += page + "\\n"` against one join.
+
+    python bench_parser.py [--pdf data/VOLUME_II_NON_COAL_2015.pdf] [--pages 5000]
+"""
+
+import argparse
+import os
+import re
+import time
+from datetime import datetime
+
+import pandas as pd
+
+import dgms_parser
+import pdf_text
+
+PDF_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "raw", "VOLUME_II_NON_COAL_2015.pdf")
+
+
+def legacy_parse_accidents(text, default_year=2015):
+    # The loop each script had before dgms_parser, with extract_2025_data.py's
+    # code pattern (which also accepts "0111 - Fall of Roof")
+    entries = re.split(r"\bCode\s*[:\-]", text)
+    data = []
+    for entry in entries[1:]:
+        code_match = re.search(r"([0-9]{3,4}\s*[-–]?\s*[A-Za-z].*?)(?:\n|$)", entry)
+        code_text = code_match.group(1).strip().replace("\n", " ") if code_match else None
+        date_match = re.search(r"Date\s*[:\-]\s*(\d{1,2}[./-]\d{1,2}[./-]\d{2,4})", entry)
+        date_obj = None
+        if date_match:
+            for fmt in ("%d.%m.%y", "%d-%m-%y", "%d/%m/%y", "%d.%m.%Y", "%d-%m-%Y", "%d/%m/%Y"):
+                try:
+                    date_obj = datetime.strptime(date_match.group(1), fmt)
+                    break
+                except:
+                    continue
+        mine = re.search(r"Mine\s*[:\-]\s*(.*)", entry)
+        owner = re.search(r"Owner\s*[:\-]\s*(.*)", entry)
+        district = re.search(r"District\s*[:\-]\s*(.*)", entry)
+        state = re.search(r"State\s*[:\-]\s*(.*)", entry)
+        persons = re.search(r"Persons\s*Killed\s*[:\-]\s*(.*)", entry)
+        desc = re.search(r"Description\s*[:\-]\s*(.*)", entry)
+        fatalities = len(re.findall(r"\b(killed|died)\b", entry, re.IGNORECASE))
+        injuries = len(re.findall(r"\b(injured)\b", entry, re.IGNORECASE))
+        severity = "Fatal" if fatalities > 0 else "Serious" if injuries > 0 else "Minor"
+        if not code_text and not mine and not date_obj:
+            continue
+        data.append({
+            "accident_code": code_text,
+            "date": date_obj.strftime("%Y-%m-%d") if date_obj else None,
+            "year": date_obj.year if date_obj else default_year,
+            "state": state.group(1).strip() if state else None,
+            "district": district.group(1).strip() if district else None,
+            "mine_name": mine.group(1).strip() if mine else None,
+            "mine_type": "Opencast" if "Opencast" in entry else "Underground",
+            "owner": owner.group(1).strip() if owner else None,
+            "severity": severity,
+            "fatalities": fatalities,
+            "injuries": injuries,
+            "persons_killed": persons.group(1).strip() if persons else None,
+            "description": desc.group(1).strip() if desc else None,
+        })
+    return pd.DataFrame(data)
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pdf", default=PDF_PATH)
+    ap.add_argument("--pages", type=int, default=5000)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = ap.parse_args()
+
+    pages = [t for t in pdf_text.BACKENDS["pypdfium2"](args.pdf) if t]
+    pages = (pages * (args.pages // len(pages) + 1))[:args.pages]
+    print(f"{len(pages)} pages")
+
+    def concat():
+        text = ""
+        for t in pages:
+            text += t + "\n"
+        return text
+
+    text_old, t_concat = timed(concat)
+    text, t_join = timed(lambda: "".join(t + "\n" for t in pages))
+    assert text == text_old
+    print(f"build text: += {t_concat:.3f}s, join {t_join:.3f}s")
+
+    old, t_old = timed(lambda: legacy_parse_accidents(text))
+    print(f"{'parser':>16} {'entries':>8} {'sec':>7} {'speedup':>8}")
+    print(f"{'legacy':>16} {len(old):>8} {t_old:>7.2f} {1:>8.2f}")
+    for w in args.workers:
+        dgms_parser.parse_date.cache_clear()
+        new, t_new = timed(lambda: dgms_parser.parse_accidents(text, workers=w))
+        pd.testing.assert_frame_equal(new, old)
+        print(f"{f'engine x{w}':>16} {len(new):>8} {t_new:>7.2f} {t_old / t_new:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Accident Cause Classifier
+-------------------------
+Maps an accident_type ("Fall of Roof", "Dumper") to a broad cause using the
+keyword rules in cause_rules.csv. Rows are tried top to bottom and the first
+rule with a keyword anywhere in the lower-cased type wins; anything else is
+DEFAULT_CAUSE. Edit the CSV to change the rules.
+
+All keywords are compiled into one pattern, and each distinct accident_type
+is matched once. The result is broadcast back to the rows through
+categorical codes, so the row count barely matters.
+"""
+
+import csv
+import os
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cause_rules.csv")
+
+DEFAULT_CAUSE = "Other"
+
+
+def load_rules(path=RULES_PATH):
+    """[(cause, [keyword, ...]), ...] in priority order; keywords are lower-cased."""
+    with open(path, newline="", encoding="utf-8") as f:
+        return [
+            (row["cause"].strip(), [k.strip().lower() for k in row["keywords"].split("|") if k.strip()])
+            for row in csv.DictReader(f)
+        ]
+
+
+class CauseClassifier:
+    """Compiled form of a rules table (see load_rules)."""
+
+    def __init__(self, rules, default=DEFAULT_CAUSE):
+        self.causes = list(dict.fromkeys([cause for cause, _ in rules] + [default]))
+        self.default_code = self.causes.index(default)
+        # Zero-width, so keywords that overlap are all seen. At each position
+        # the alternatives are tried in rule order, so the one that matches is
+        # the highest-priority keyword starting there.
+        alternatives = []
+        self._group_code = {}
+        for i, (cause, keywords) in enumerate(rules):
+            if keywords:
+                alternatives.append(f"(?P<r{i}>{'|'.join(map(re.escape, keywords))})")
+                self._group_code[f"r{i}"] = self.causes.index(cause)
+        self.pattern = re.compile(f"(?=(?:{'|'.join(alternatives)}))") if alternatives else None
+
+    def code(self, acc_type):
+        """Index into self.causes for one accident_type (NaN/None → default)."""
+        if self.pattern is None or not isinstance(acc_type, str):
+            return self.default_code
+        return min((self._group_code[m.lastgroup] for m in self.pattern.finditer(acc_type.lower())),
+                   default=self.default_code)
+
+    def classify_one(self, acc_type):
+        return self.causes[self.code(acc_type)]
+
+    def classify(self, acc_types):
+        """Categorical Series of causes aligned with acc_types (any array-like or Series)."""
+        index = acc_types.index if isinstance(acc_types, pd.Series) else None
+        cat = pd.Categorical(acc_types)
+        per_type = np.array([self.code(t) for t in cat.categories] + [self.default_code], dtype=np.int32)
+        # Missing values have code -1, which picks the trailing default
+        codes = per_type[cat.codes]
+        return pd.Series(pd.Categorical.from_codes(codes, categories=self.causes), index=index)
+
+
+@lru_cache(maxsize=8)
+def get_classifier(path=RULES_PATH):
+    """CauseClassifier for a rules file, built once per process."""
+    return CauseClassifier(load_rules(path))
+
+
+def classify_causes(acc_types, path=RULES_PATH):
+    return get_classifier(path).classify(acc_types)
@@ -0,0 +1,132 @@
+"""
+DGMS "Code:" Statement Parser
+-----------------------------
+Shared by app.py, dgms_pdf_to_csv_pipeline.py and extract_2025_data.py.
+
+Text is split into entries at "Code:" / "Code -". Field patterns are compiled
+once and searched one by one; each begins with a keyword (or, for the code,
+a digit) that the engine skips to quickly. The killed/died/injured mentions, which need a scan of the whole
+entry, are counted in one pass over the lower-cased entry. Entries can be
+parsed in a process pool.
+"""
+
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+
+import pandas as pd
+
+ENTRY_SPLIT = re.compile(r"\bCode\s*[:\-]")
+
+FIELD_PATS = {
+    "code": re.compile(r"([0-9]{3,4}\s*[-–]?\s*[A-Za-z].*?)(?:\n|$)"),
+    "date": re.compile(r"Date\s*[:\-]\s*(\d{1,2}[./-]\d{1,2}[./-]\d{2,4})"),
+    "mine": re.compile(r"Mine\s*[:\-]\s*(.*)"),
+    "owner": re.compile(r"Owner\s*[:\-]\s*(.*)"),
+    "district": re.compile(r"District\s*[:\-]\s*(.*)"),
+    "state": re.compile(r"State\s*[:\-]\s*(.*)"),
+    "persons": re.compile(r"Persons\s*Killed\s*[:\-]\s*(.*)"),
+    "description": re.compile(r"Description\s*[:\-]\s*(.*)"),
+}
+
+# Same words as \b(killed|died)\b and \b(injured)\b with re.I. A leading \b
+# or re.I would make the engine try every position of the entry, so the
+# entry is lower-cased once and the left boundary is checked by hand.
+MENTION_SCAN = re.compile(r"(?:(?P<fatal>killed|died)|injured)\b")
+
+DATE_FORMATS = ("%d.%m.%y", "%d-%m-%y", "%d/%m/%y", "%d.%m.%Y", "%d-%m-%Y", "%d/%m/%Y")
+
+# Entries per task sent to a worker process
+CHUNK_SIZE = 256
+
+
+@lru_cache(maxsize=1 << 16)
+def parse_date(date_str):
+    """First of DATE_FORMATS that fits, or None (each distinct string is tried once)."""
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def parse_entry(entry, default_year=2015, mine_types=("Opencast",), mine_type_default="Underground"):
+    """One accident dict from the text after a "Code:" marker, or None if it has no code, mine or date.
+
+    mine_type is the first word of mine_types present in the entry, else
+    mine_type_default.
+    """
+    vals = {}
+    for key, pat in FIELD_PATS.items():
+        m = pat.search(entry)
+        vals[key] = m.group(1) if m else None
+
+    fatalities = injuries = 0
+    lowered = entry.lower()
+    for m in MENTION_SCAN.finditer(lowered):
+        i = m.start()
+        if i and (lowered[i - 1].isalnum() or lowered[i - 1] == "_"):
+            continue
+        if m.group("fatal"):
+            fatalities += 1
+        else:
+            injuries += 1
+
+    code = vals["code"].strip().replace("\n", " ") if vals["code"] else None
+    date_obj = parse_date(vals["date"]) if vals["date"] else None
+    if not code and vals["mine"] is None and not date_obj:
+        return None
+
+    strip = lambda key: vals[key].strip() if vals[key] is not None else None
+    return {
+        "accident_code": code,
+        "date": date_obj.strftime("%Y-%m-%d") if date_obj else None,
+        "year": date_obj.year if date_obj else default_year,
+        "state": strip("state"),
+        "district": strip("district"),
+        "mine_name": strip("mine"),
+        "mine_type": next((t for t in mine_types if t in entry), mine_type_default),
+        "owner": strip("owner"),
+        "severity": "Fatal" if fatalities > 0 else "Serious" if injuries > 0 else "Minor",
+        "fatalities": fatalities,
+        "injuries": injuries,
+        "persons_killed": strip("persons"),
+        "description": strip("description"),
+    }
+
+
+def _parse_chunk(entries, kwargs):
+    return [r for r in (parse_entry(e, **kwargs) for e in entries) if r is not None]
+
+
+def iter_accidents(text, workers=1, chunk_size=CHUNK_SIZE, **kwargs):
+    """Accident dicts in document order; workers > 1 parses chunks of entries in processes.
+
+    workers=None uses every core. kwargs go to parse_entry.
+    """
+    entries = iter(ENTRY_SPLIT.split(text)[1:])
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        yield from _parse_chunk(entries, kwargs)
+        return
+
+    chunks = iter(lambda: list(islice(entries, chunk_size)), [])
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_parse_chunk, chunk, kwargs))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def parse_accidents(text, default_year=2015, workers=1, **kwargs):
+    """DataFrame of every accident entry in text (see parse_entry for the columns)."""
+    return pd.DataFrame(list(iter_accidents(text, workers=workers, default_year=default_year, **kwargs)))
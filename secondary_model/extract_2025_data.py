@@ -8,24 +8,18 @@ compatible with your Streamlit Mining Safety Dashboard.
 Author: Sukrat | IIT Dhanbad | AI Hackathon 2025
 """
 
-import pdfplumber
-import re
-import pandas as pd
-from datetime import datetime
+import dgms_parser
+from cause_rules import classify_causes
+import pdf_text
 
 
 # ======================================================
 # 1️⃣  EXTRACT TEXT FROM PDF
 # ======================================================
-def extract_text(pdf_path):
-    """Extract text from all pages"""
+def extract_text(pdf_path, backend=None):
+    """Extract text from all pages (see pdf_text.py for backends)"""
     print("🔍 Extracting text from PDF...")
-    text = ""
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            txt = page.extract_text()
-            if txt:
-                text += txt + "\n"
+    text = pdf_text.extract_text(pdf_path, backend=backend)
     print("✅ Text extracted successfully.")
     return text
 
@@ -33,70 +27,13 @@ def extract_text(pdf_path):
 # ======================================================
 # 2️⃣  PARSE ACCIDENT BLOCKS
 # ======================================================
-def parse_accidents(text):
-    """Parse individual accident entries using regex"""
+def parse_accidents(text, workers=1):
+    """Parse individual accident entries (see dgms_parser.py)"""
     print("🧩 Parsing accident records...")
-    # Split using "Code" keyword (each record starts with it)
-    entries = re.split(r'\bCode\s*[:\-]', text)
-    data = []
-
-    for entry in entries[1:]:
-        # Accident code (e.g., 0111 Fall of Roof)
-        code = re.search(r'([0-9]{3,4}\s*[-–]?\s*[A-Za-z].*?)(?:\n|$)', entry)
-        code = code.group(1).strip().replace("\n", " ") if code else None
-
-        # Date
-        date_match = re.search(r'Date\s*[:\-]\s*(\d{1,2}[./-]\d{1,2}[./-]\d{2,4})', entry)
-        date_str = date_match.group(1) if date_match else None
-        date_obj = None
-        if date_str:
-            for fmt in ("%d.%m.%y", "%d-%m-%y", "%d/%m/%y", "%d.%m.%Y", "%d-%m-%Y", "%d/%m/%Y"):
-                try:
-                    date_obj = datetime.strptime(date_str, fmt)
-                    break
-                except:
-                    continue
-
-        # Fields
-        mine = re.search(r'Mine\s*[:\-]\s*(.*)', entry)
-        owner = re.search(r'Owner\s*[:\-]\s*(.*)', entry)
-        district = re.search(r'District\s*[:\-]\s*(.*)', entry)
-        state = re.search(r'State\s*[:\-]\s*(.*)', entry)
-        description = re.search(r'Description\s*[:\-]\s*(.*)', entry)
-        persons = re.search(r'Persons\s*Killed\s*[:\-]\s*(.*)', entry)
-
-        # Fatalities / Injuries
-        fatalities = len(re.findall(r'\b(killed|died)\b', entry, re.IGNORECASE))
-        injuries = len(re.findall(r'\b(injured)\b', entry, re.IGNORECASE))
-
-        severity = "Minor"
-        if fatalities > 0:
-            severity = "Fatal"
-        elif injuries > 0:
-            severity = "Serious"
-
-        # Skip completely empty entries
-        if not (date_obj or mine or code):
-            continue
-
-        data.append({
-            "accident_code": code,
-            "date": date_obj.strftime("%Y-%m-%d") if date_obj else None,
-            "year": date_obj.year if date_obj else 2015,
-            "state": state.group(1).strip() if state else None,
-            "district": district.group(1).strip() if district else None,
-            "mine_name": mine.group(1).strip() if mine else None,
-            "mine_type": "Underground" if "Underground" in entry else "Opencast" if "Opencast" in entry else "Unknown",
-            "owner": owner.group(1).strip() if owner else None,
-            "severity": severity,
-            "fatalities": fatalities,
-            "injuries": injuries,
-            "persons_killed": persons.group(1).strip() if persons else None,
-            "description": description.group(1).strip() if description else None,
-        })
-
-    print(f"✅ Parsed {len(data)} accident entries.")
-    return pd.DataFrame(data)
+    df = dgms_parser.parse_accidents(text, default_year=2015, workers=workers,
+                                     mine_types=("Underground", "Opencast"), mine_type_default="Unknown")
+    print(f"✅ Parsed {len(df)} accident entries.")
+    return df
 
 
 # ======================================================
@@ -110,29 +47,8 @@ def clean_and_enrich(df):
     df[["code_number", "accident_type"]] = df["accident_code"].str.extract(r"(\d+)\s*(.*)")
     df["code_number"] = df["code_number"].astype(str).str.zfill(4)
 
-    # Categorize cause based on accident_type
-    def categorize_cause(acc_type):
-        if pd.isna(acc_type):
-            return "Other"
-        acc_type = acc_type.lower()
-        if "roof" in acc_type or "side" in acc_type:
-            return "Ground Control Failure"
-        elif any(word in acc_type for word in ["wagon", "truck", "conveyor", "tanker", "movement", "transport"]):
-            return "Transportation Accident"
-        elif "electric" in acc_type or "power" in acc_type:
-            return "Electrical Hazard"
-        elif "explosion" in acc_type or "fire" in acc_type or "blowout" in acc_type:
-            return "Explosion / Fire"
-        elif "fall of person" in acc_type or "height" in acc_type:
-            return "Fall from Height"
-        elif "drowning" in acc_type or "water" in acc_type:
-            return "Drowning / Flooding"
-        elif "machine" in acc_type or "mechanical" in acc_type:
-            return "Machinery Failure"
-        else:
-            return "Other"
-
-    df["cause"] = df["accident_type"].apply(categorize_cause)
+    # Categorize cause based on accident_type (rules in cause_rules.csv)
+    df["cause"] = classify_causes(df["accident_type"])
 
     # Clean text
     cols = ["state", "district", "mine_name", "owner", "accident_type", "cause"]
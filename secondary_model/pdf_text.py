@@ -0,0 +1,61 @@
+"""
+PDF Text Extraction Backends
+----------------------------
+Shared by app.py, dgms_pdf_to_csv_pipeline.py and extract_2025_data.py.
+
+- "pdfplumber": layout-faithful (default)
+- "pypdfium2":  PDFium text layer, several times faster on plain-text DGMS
+                statements
+
+Pick the backend per call, or for every script via the DGMS_PDF_BACKEND
+environment variable.
+"""
+
+import os
+import re
+
+DEFAULT_BACKEND = os.environ.get("DGMS_PDF_BACKEND", "pdfplumber")
+
+# PDFium marks a hyphen it joined across a line break with U+FFFE, and emits
+# other control characters ("\x02", "\r") that pdfplumber doesn't
+_PDFIUM_CONTROLS = re.compile(r"[\x00-\x08\x0b-\x1f\x7f]")
+
+
+def _pdfplumber_pages(pdf_file):
+    import pdfplumber
+    with pdfplumber.open(pdf_file) as pdf:
+        for page in pdf.pages:
+            txt = page.extract_text()
+            page.close()
+            yield txt
+
+
+def _pdfium_pages(pdf_file):
+    import pypdfium2 as pdfium
+    if hasattr(pdf_file, "read"):
+        pdf_file = pdf_file.read()  # Streamlit uploads are file-like
+    pdf = pdfium.PdfDocument(pdf_file)
+    try:
+        for i in range(len(pdf)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            raw = textpage.get_text_range()
+            textpage.close()
+            page.close()
+            # Match pdfplumber's shape: "-" and a break for U+FFFE, "\n" breaks,
+            # trimmed, no blank lines
+            raw = _PDFIUM_CONTROLS.sub("", raw.replace("\r\n", "\n").replace("\r", "\n").replace("\ufffe", "-\n"))
+            yield "\n".join(s for s in (line.strip() for line in raw.split("\n")) if s)
+    finally:
+        pdf.close()
+
+
+BACKENDS = {"pdfplumber": _pdfplumber_pages, "pypdfium2": _pdfium_pages}
+
+
+def extract_text(pdf_file, backend=None):
+    """Text of every non-empty page, each followed by a newline."""
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend {backend!r}; choose from {sorted(BACKENDS)}")
+    return "".join(txt + "\n" for txt in BACKENDS[backend](pdf_file) if txt)
@@ -0,0 +1,238 @@
+# src/extraction/canonical.py
+import math
+import re
+import sqlite3
+from collections import Counter, defaultdict
+from itertools import combinations
+from pathlib import Path
+import pyarrow as pa
+
+NAMES_PATH = "data/cache/names.sqlite3"
+
+# PRAGMA user_version of the layout and key normalization below; bump when
+# either changes (older files are rebuilt, which renumbers entities)
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    kind TEXT NOT NULL,
+    id   INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    key  TEXT NOT NULL,
+    PRIMARY KEY (kind, id)
+);
+CREATE TABLE IF NOT EXISTS aliases (
+    kind      TEXT NOT NULL,
+    raw       TEXT NOT NULL,
+    entity_id INTEGER NOT NULL,
+    PRIMARY KEY (kind, raw)
+);
+"""
+
+# Dice similarity of padded character trigrams needed to merge two keys
+MATCH_THRESHOLD = 0.8
+
+# Trigram pairs held by more entities than this are too common to block on:
+# their posting lists stop growing and are no longer read (this bounds the
+# entities scored per lookup)
+MAX_POSTINGS = 16
+
+# Words that say what kind of site it is rather than which one
+MINE_NOISE = {"mine", "mines", "quarry", "quarries", "project", "complex", "open", "cast",
+              "opencast", "underground", "ug", "oc", "min"}
+OWNER_NOISE = {"m", "s", "ms", "messrs", "shri", "smt", "the"}
+OWNER_ABBREV = {"limited": "ltd", "private": "pvt", "company": "co", "corporation": "corp",
+                "corpn": "corp", "and": "&"}
+
+LEASE_NO = re.compile(r"\(.*?(?:\)|$)|\bm\s*[./]?\s*l\s*[./]?\s*no\b.*$")
+NON_ALNUM = re.compile(r"[^a-z0-9&]+")
+
+def mine_key(raw: str) -> str:
+    """'CHECHAT LIMESTONE MINE(M.L.NO.95/2008' → 'chechat limestone'.
+
+    Lease numbers and parenthesized notes (often truncated mid-way) and
+    generic site words are dropped.
+    """
+    text = LEASE_NO.sub(" ", raw.lower()).replace("&", " and ")
+    return " ".join(w for w in NON_ALNUM.split(text) if w and w not in MINE_NOISE)
+
+def owner_key(raw: str) -> str:
+    """'M/S SAIL REFRACTORY CO.LTD.' → 'sail refractory co ltd'."""
+    words = (OWNER_ABBREV.get(w, w) for w in NON_ALNUM.split(raw.lower().replace("&", " & ")))
+    return " ".join(w for w in words if w and w not in OWNER_NOISE)
+
+KEYS = {"mine": mine_key, "owner": owner_key}
+
+def trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def min_overlap(n: int, threshold: float) -> int:
+    """Fewest trigrams a set of n must share with any set within threshold Dice of it."""
+    return max(math.ceil(threshold * n / (2 - threshold) - 1e-9), 1)
+
+class NameIndex:
+    """Persistent canonical IDs for mine and owner names.
+
+    resolve() first checks the alias cache (every raw string seen before),
+    then the exact normalized key, and only then scores the entities that
+    share two trigrams of its prefix with it; a name matching none becomes
+    a new entity. Everything is written back on close, so later runs and new
+    volumes only pay for strings they haven't seen.
+    """
+
+    def __init__(self, path: str = NAMES_PATH, threshold: float = MATCH_THRESHOLD):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.threshold = threshold
+        self.conn = sqlite3.connect(path, timeout=60)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.executescript("DROP TABLE IF EXISTS entities; DROP TABLE IF EXISTS aliases;")
+            self.conn.executescript(SCHEMA)
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        self.names = defaultdict(dict)     # kind → id → canonical name
+        self.by_key = defaultdict(dict)    # kind → key → id
+        self.grams = defaultdict(dict)     # kind → id → trigram set
+        self.rank = defaultdict(dict)      # kind → trigram → rank, rarest highest
+        self.postings = {}                 # kind → trigram pair → ids, built on first match
+        self._indexed = {}                 # kind → entities when postings were last rebuilt
+        self.aliases = defaultdict(dict)   # kind → raw → id
+        self._new_entities, self._new_aliases = [], []
+        for kind, id_, name, key in self.conn.execute("SELECT kind, id, name, key FROM entities"):
+            self._add(kind, id_, name, key)
+        for kind, raw, id_ in self.conn.execute("SELECT kind, raw, entity_id FROM aliases"):
+            self.aliases[kind][raw] = id_
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def flush(self):
+        self.conn.executemany("INSERT OR REPLACE INTO entities VALUES (?, ?, ?, ?)", self._new_entities)
+        self.conn.executemany("INSERT OR REPLACE INTO aliases VALUES (?, ?, ?)", self._new_aliases)
+        self.conn.commit()
+        self._new_entities, self._new_aliases = [], []
+
+    def _signatures(self, kind, grams):
+        # Pairs (or, below two required trigrams, single trigrams) of the
+        # prefix of grams, rarest trigram first; unseen trigrams count as rarest
+        rank = self.rank[kind]
+        need = min_overlap(len(grams), self.threshold)
+        size = min(need, 2)
+        order = sorted(grams, key=lambda g: -rank.get(g, math.inf))
+        return combinations(order[:len(grams) - need + size], size)
+
+    def _add(self, kind, id_, name, key):
+        grams = trigrams(key)
+        self.names[kind][id_] = name
+        self.by_key[kind].setdefault(key, id_)
+        self.grams[kind][id_] = grams
+        if kind in self.postings:
+            rank = self.rank[kind]
+            for g in sorted(grams - rank.keys()):
+                rank[g] = len(rank)
+            self._index(kind, id_, grams)
+
+    def _index(self, kind, id_, grams):
+        postings = self.postings[kind]
+        for sig in self._signatures(kind, grams):
+            ids = postings[sig]
+            if len(ids) <= MAX_POSTINGS:
+                ids.append(id_)
+
+    def _reindex(self, kind):
+        # Ranks follow trigram frequency at the time of the rebuild and stay
+        # fixed until the next one (new trigrams rank as rarest); rebuilding
+        # whenever the entity count doubles keeps the total work linear
+        grams = self.grams[kind]
+        df = Counter(g for entity in grams.values() for g in entity)
+        self.rank[kind] = {g: i for i, g in enumerate(sorted(df, key=lambda g: (-df[g], g)))}
+        self.postings[kind] = defaultdict(list)
+        for id_, entity in grams.items():
+            self._index(kind, id_, entity)
+        self._indexed[kind] = len(grams)
+
+    def candidates(self, kind: str, key: str):
+        """Entities within threshold Dice of key, found via shared trigram pairs.
+
+        Dice >= t needs at least c = t * n / (2 - t) of the key's n trigrams in
+        common. With trigrams in one fixed order (rarest first, so the
+        mineral and suffix words many names carry come last), the first
+        two common trigrams of a match lie in the key's first n - c + 2 and
+        in the entity's own first m - c' + 2. Each entity is indexed under
+        the pairs of its prefix, so only the pairs of the key's prefix are
+        looked up, and only the entities found are scored. Pairs are far
+        rarer than single trigrams, and a pair shared by more than
+        MAX_POSTINGS entities is skipped, so lookups stay short as the index
+        grows; a match is then only missed if every pair it shares is that
+        common.
+        """
+        if len(self.grams[kind]) >= 2 * self._indexed.get(kind, 0):
+            self._reindex(kind)
+        grams = trigrams(key)
+        postings, entity_grams = self.postings[kind], self.grams[kind]
+        n, t = len(grams), self.threshold
+        seen = set()
+        for sig in self._signatures(kind, grams):
+            ids = postings.get(sig, ())
+            if len(ids) <= MAX_POSTINGS:
+                seen.update(ids)
+        lo, hi = n * t / (2 - t), n * (2 - t) / t
+        for id_ in seen:
+            other = entity_grams[id_]
+            if lo <= len(other) <= hi:
+                score = 2 * len(grams & other) / (n + len(other))
+                if score >= t:
+                    yield id_, score
+
+    def match(self, kind: str, key: str):
+        best = max(self.candidates(kind, key), key=lambda c: (c[1], -c[0]), default=None)
+        return best[0] if best else None
+
+    def resolve(self, kind: str, raw):
+        """Canonical entity ID for a raw mine/owner string; None for empty values."""
+        if raw is None or not raw.strip():
+            return None
+        cached = self.aliases[kind].get(raw)
+        if cached is not None:
+            return cached
+        key = KEYS[kind](raw) or raw.strip().lower()
+        id_ = self.by_key[kind].get(key)
+        if id_ is None:
+            id_ = self.match(kind, key)
+        if id_ is None:
+            id_ = len(self.names[kind]) + 1
+            name = " ".join(raw.split())
+            self._add(kind, id_, name, key)
+            self._new_entities.append((kind, id_, name, key))
+        self.aliases[kind][raw] = id_
+        self._new_aliases.append((kind, raw, id_))
+        return id_
+
+    def canonical(self, kind: str, id_):
+        return self.names[kind].get(id_)
+
+def canonicalize_table(table: pa.Table, index: NameIndex, columns=("mine", "owner")) -> pa.Table:
+    """Add <column>_id (int32) and <column>_canonical next to each name column.
+
+    Each distinct raw string is resolved once per call, in order of first
+    appearance so new entity IDs don't depend on hashing.
+    """
+    for kind in columns:
+        if kind not in table.column_names:
+            continue
+        raw = table.column(kind).to_pylist()
+        ids = {v: index.resolve(kind, v) for v in dict.fromkeys(raw)}
+        col_ids = pa.array([ids[v] for v in raw], pa.int32())
+        names = pa.array([index.canonical(kind, ids[v]) for v in raw], pa.string())
+        i = table.column_names.index(kind)
+        table = table.add_column(i + 1, f"{kind}_id", col_ids)
+        table = table.add_column(i + 2, f"{kind}_canonical", names.dictionary_encode())
+    return table
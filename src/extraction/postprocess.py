@@ -0,0 +1,373 @@
+# src/extraction/postprocess.py
+import datetime as dt
+import os
+import re
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from pandas.util import hash_array
+from src.storage.dataset import DATASET_DIR, open_dataset, read_volume, write_volume
+
+# Day-first formats seen in DGMS volumes (same set secondary_model tries)
+DATE_FORMATS = ("%d.%m.%y", "%d-%m-%y", "%d/%m/%y", "%d.%m.%Y", "%d-%m-%Y", "%d/%m/%Y")
+
+# One regex covers all of DATE_FORMATS: same separator twice, 2- or 4-digit year
+DATE_SHAPE = re.compile(r"(\d{1,2})([./-])(\d{1,2})\2(\d{4}|\d{2})")
+TIME_SHAPE = re.compile(r"(\d{1,2})\s*[.:]\s*(\d{2})")
+INT_SHAPE = re.compile(r"\d+")
+
+# Distinct raw strings remembered per field; a volume has a few thousand at most
+MEMO_SIZE = 1 << 16
+
+@lru_cache(maxsize=MEMO_SIZE)
+def parse_date(raw: str):
+    """'16/05/15' → date(2015, 5, 16); None unless the whole string is a valid date in DATE_FORMATS."""
+    m = DATE_SHAPE.fullmatch(raw.strip())
+    if not m:
+        return None
+    day, month, year = int(m.group(1)), int(m.group(3)), int(m.group(4))
+    if len(m.group(4)) == 2:
+        year += 2000 if year < 69 else 1900    # strptime's %y pivot
+    try:
+        return dt.date(year, month, day)
+    except ValueError:
+        return None
+
+@lru_cache(maxsize=MEMO_SIZE)
+def parse_time(raw: str):
+    """'20.15' / '9:00 hrs' → time(20, 15); None if no valid HH.MM is found."""
+    m = TIME_SHAPE.match(raw.strip())
+    if not m:
+        return None
+    hour, minute = int(m.group(1)), int(m.group(2))
+    if hour > 23 or minute > 59:
+        return None
+    return dt.time(hour, minute)
+
+@lru_cache(maxsize=MEMO_SIZE)
+def parse_int(raw: str):
+    """First run of digits ('32 Years' → 32); None if there is none."""
+    m = INT_SHAPE.search(raw)
+    return int(m.group()) if m else None
+
+def map_unique(values, parse, out_type: pa.DataType) -> pa.Array:
+    """Apply parse to each distinct string in values and broadcast the results.
+
+    The cost is one parse per unique value plus a vectorized take, so a column
+    with a million rows and a thousand distinct dates parses a thousand strings.
+    """
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    values = pa.array(values, pa.string()) if not isinstance(values, pa.Array) else values
+    encoded = values.dictionary_encode()
+    parsed = pa.array([parse(v) for v in encoded.dictionary.to_pylist()], out_type)
+    return parsed.take(encoded.indices)
+
+def normalize_dates(values) -> pa.Array:
+    return map_unique(values, parse_date, pa.date32())
+
+def normalize_times(values) -> pa.Array:
+    return map_unique(values, parse_time, pa.time32("ms"))
+
+def normalize_ints(values, out_type: pa.DataType = pa.int16()) -> pa.Array:
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    if pa.types.is_integer(values.type):
+        return values.cast(out_type)
+    return map_unique(values, parse_int, out_type)
+
+# column → normalizer; columns missing from a table are skipped
+NORMALIZERS = {
+    "date": normalize_dates,
+    "time": normalize_times,
+    "persons_killed": normalize_ints,
+    "age": normalize_ints,
+}
+
+def normalize_table(table: pa.Table, keep_raw: bool = True) -> pa.Table:
+    """Typed copy of an accidents/victims table: date32 dates, time32[ms] times, int16 counts and ages.
+
+    With keep_raw, the original strings are kept next to them as <column>_raw
+    so unparseable values can be audited. Use .to_pandas() for a DataFrame.
+    """
+    for name, normalize in NORMALIZERS.items():
+        if name not in table.column_names:
+            continue
+        i = table.column_names.index(name)
+        raw = table.column(i)
+        table = table.set_column(i, name, normalize(raw))
+        if keep_raw and pa.types.is_string(raw.type):
+            table = table.add_column(i + 1, f"{name}_raw", raw)
+    return table
+
+def parse_failures(table: pa.Table) -> dict:
+    """Count of non-empty raw values that didn't parse, per normalized column."""
+    out = {}
+    for name in NORMALIZERS:
+        if f"{name}_raw" in table.column_names:
+            raw = table.column(f"{name}_raw")
+            present = pc.and_(pc.is_valid(raw), pc.not_equal(pc.utf8_trim_whitespace(raw), ""))
+            failed = pc.and_(present, pc.is_null(table.column(name)))
+            out[name] = pc.sum(failed.cast(pa.int64())).as_py() or 0
+    return out
+
+# --- Near-duplicate detection (MinHash over narrative shingles + LSH banding) ---
+
+# Word shingle length (at most len(_SHINGLE_MIX)); narratives are a few hundred words
+SHINGLE_SIZE = 3
+
+# 128 hash functions in 16 bands of 8 rows: pairs around Jaccard 0.7 and up
+# land in a shared bucket with high probability, pairs below ~0.5 rarely do
+NUM_PERM = 128
+BANDS = 16
+
+# Estimated Jaccard needed to confirm an LSH candidate, and the lower bar for
+# records that already agree on the exact key (date, mine, persons killed)
+DUP_THRESHOLD = 0.8
+KEY_THRESHOLD = 0.5
+
+# Rows of an LSH or exact-key bucket compared pairwise; the rest of a larger
+# bucket is compared with its first row only. Copies of one accident number a
+# handful, so only degenerate buckets (boilerplate text) get that big
+BUCKET_CAP = 32
+
+MINHASH_SEED = 1
+_EMPTY = np.uint32(0xFFFFFFFF)    # signature value for records without text
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Odd 64-bit multipliers that mix a word hash into its shingle position
+_SHINGLE_MIX = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9,
+                         0xD6E8FEB86659FD93, 0xFF51AFD7ED558CCD], np.uint64)
+
+def shingle_hashes(texts, k: int = SHINGLE_SIZE):
+    """32-bit hashes of the k-word shingles of each text, concatenated, plus per-text counts.
+
+    Tokens are lowercased alphanumeric runs. All words of all texts are
+    hashed in one call and combined position-wise, so no shingle strings are
+    built. A text shorter than k words yields one shingle of what it has.
+    Repeated shingles are left in: they don't change a minimum.
+    """
+    words = [_WORD.findall(t.lower()) if t else [] for t in texts]
+    lens = np.array([len(w) for w in words], np.int64)
+    total = int(lens.sum())
+    sizes = np.where(lens > 0, np.maximum(lens - k + 1, 1), 0)
+    if not total:
+        return np.empty(0, np.uint64), sizes
+    h = hash_array(np.array([w for ws in words for w in ws], dtype=object), categorize=False)
+
+    pos = np.arange(total)
+    ends = np.repeat(np.cumsum(lens), lens)
+    mixed = h * _SHINGLE_MIX[0]
+    for i in range(1, k):
+        nxt = h[np.minimum(pos + i, total - 1)] * _SHINGLE_MIX[i]
+        mixed ^= np.where(pos + i < ends, nxt, np.uint64(0))
+    first = pos - (ends - np.repeat(lens, lens)) < np.repeat(sizes, lens)
+    return mixed[first] >> np.uint64(32), sizes
+
+def shingles(text: str, k: int = SHINGLE_SIZE) -> np.ndarray:
+    return shingle_hashes([text], k)[0]
+
+def minhash_signatures(texts, num_perm: int = NUM_PERM, seed: int = MINHASH_SEED,
+                       chunk: int = 64) -> np.ndarray:
+    """(len(texts), num_perm) uint32 MinHash signatures; empty texts get all-_EMPTY rows.
+
+    Each permutation is a multiply-shift hash, (a * x + b) >> 32 in wrapping
+    64-bit arithmetic. A chunk of records is hashed in one array op and
+    reduced per record with minimum.reduceat. Small chunks keep the working
+    array cache-sized.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)[:, None] * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)[:, None]
+    texts = list(texts)
+    sigs = np.full((len(texts), num_perm), _EMPTY, np.uint32)
+    for lo in range(0, len(texts), chunk):
+        sh, sizes = shingle_hashes(texts[lo:lo + chunk])
+        if not len(sh):
+            continue
+        hashed = a * sh
+        hashed += b
+        hashed >>= np.uint64(32)
+        nonempty = np.flatnonzero(sizes)
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))[nonempty]
+        sigs[lo + nonempty] = np.minimum.reduceat(hashed, starts, axis=1).T
+    return sigs
+
+def _bucket_pairs(keys: np.ndarray, cap: int = BUCKET_CAP):
+    # Row pairs (i < j) sharing a key; keys is any 1-D array with a usable sort
+    # order. In a bucket of more than cap rows, rows past the first cap are
+    # paired with its first row only, so a huge bucket costs size + cap ** 2
+    # pairs rather than size ** 2
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    sizes = np.diff(np.r_[starts, len(keys)])
+    for start, size in zip(starts[sizes > 1].tolist(), sizes[sizes > 1].tolist()):
+        group = order[start:start + size].tolist()
+        head = min(size, cap)
+        for i in range(head):
+            for j in range(i + 1, head):
+                yield group[i], group[j]
+        for j in range(head, size):
+            yield group[0], group[j]
+
+def lsh_candidates(sigs: np.ndarray, bands: int = BANDS):
+    """Pairs (i < j) whose signatures agree on every row of at least one band."""
+    rows = sigs.shape[1] // bands
+    pairs = set()
+    for band in range(bands):
+        part = np.ascontiguousarray(sigs[:, band * rows:(band + 1) * rows])
+        pairs.update(_bucket_pairs(part.view(f"V{part.itemsize * rows}").ravel()))
+    return pairs
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+def duplicate_groups(texts, keys=None, threshold: float = DUP_THRESHOLD,
+                     key_threshold: float = KEY_THRESHOLD, num_perm: int = NUM_PERM,
+                     bands: int = BANDS) -> np.ndarray:
+    """Group id per record: the index of the earliest record it duplicates (itself if none).
+
+    Candidates come from LSH buckets and from equal exact keys (None keys never
+    match); both are confirmed by estimated Jaccard, exact-key pairs at the
+    lower key_threshold, or outright when either record has no text.
+    """
+    sigs = minhash_signatures(texts, num_perm)
+    has_text = (sigs != _EMPTY).any(axis=1)
+    n = len(sigs)
+
+    # Records without text would all share one bucket per band; skip them here
+    with_text = np.flatnonzero(has_text)
+    candidates = {(int(with_text[i]), int(with_text[j]), threshold)
+                  for i, j in lsh_candidates(sigs[with_text], bands)}
+    if keys is not None:
+        # Rows without a key never match; left in, they would all share one bucket
+        keys = list(keys)
+        keyed = np.array([i for i, k in enumerate(keys) if k is not None], np.int64)
+        ids = np.array([hash(keys[i]) for i in keyed], np.int64)
+        for a, b in _bucket_pairs(ids):
+            i, j = int(keyed[a]), int(keyed[b])
+            if keys[i] == keys[j]:
+                candidates.add((i, j, key_threshold if has_text[i] and has_text[j] else 0.0))
+
+    parent = list(range(n))
+    for i, j, bar in candidates:
+        ri, rj = _find(parent, i), _find(parent, j)
+        if ri == rj or (bar and np.mean(sigs[i] == sigs[j]) < bar):
+            continue
+        parent[max(ri, rj)] = min(ri, rj)
+    return np.array([_find(parent, i) for i in range(n)], np.int64)
+
+def exact_keys(table: pa.Table, columns=("date", "mine", "persons_killed")):
+    """(date, mine, persons killed) per row, mine lowercased to alphanumerics; None if any part is missing."""
+    cols = [table.column(c).to_pylist() for c in columns]
+    keys = []
+    for parts in zip(*cols):
+        if any(p is None or p == "" for p in parts):
+            keys.append(None)
+        else:
+            keys.append(tuple(" ".join(_WORD.findall(p.lower())) if isinstance(p, str) else p
+                              for p in parts))
+    return keys
+
+def mark_duplicates(table: pa.Table, text_column: str = "narrative", id_column: str = "accident_id",
+                    key_columns=("date", "mine", "persons_killed"), **kwargs) -> pa.Table:
+    """Add duplicate_of: the id of the earliest record each row duplicates, null for originals.
+
+    Rows are kept, so victims keyed by id stay attached; filter on
+    duplicate_of IS NULL for counts and indexing.
+    """
+    texts = table.column(text_column).to_pylist()
+    keys = exact_keys(table, key_columns) if key_columns else None
+    groups = duplicate_groups(texts, keys, **kwargs)
+    ids = table.column(id_column).to_numpy() if id_column else np.arange(table.num_rows)
+    dup = pa.array(ids[groups], mask=groups == np.arange(table.num_rows))
+    if "duplicate_of" in table.column_names:
+        table = table.drop_columns(["duplicate_of"])
+    return table.append_column("duplicate_of", dup)
+
+# Columns compared across the partitioned dataset and other sources
+DEDUP_COLUMNS = ("record_id", "date", "mine", "persons_killed", "narrative")
+
+# secondary_model/extracted_data CSV column → DEDUP_COLUMNS name
+SECONDARY_COLUMNS = {"date": "date", "mine_name": "mine", "fatalities": "persons_killed",
+                     "description": "narrative"}
+
+def read_secondary_csvs(paths) -> pa.Table:
+    """Records of secondary_model CSVs in DEDUP_COLUMNS form; record_id is '<file>/<row>'."""
+    tables = []
+    for path in paths:
+        df = pd.read_csv(path)
+        name = os.path.basename(path)
+        cols = {"record_id": pa.array([f"{name}/{i}" for i in range(len(df))], pa.string())}
+        for src, dst in SECONDARY_COLUMNS.items():
+            values = df[src] if src in df.columns else pd.Series([None] * len(df), dtype=object)
+            if dst == "date":
+                # ISO dates, unlike the day-first strings of the PDFs
+                values = pd.to_datetime(values, format="%Y-%m-%d", errors="coerce")
+                cols[dst] = pa.array(values, from_pandas=True).cast(pa.date32())
+            elif dst == "persons_killed":
+                cols[dst] = pa.array(pd.to_numeric(values, errors="coerce"), from_pandas=True).cast(pa.int64())
+            else:
+                cols[dst] = pa.array(values.astype(object), pa.string(), from_pandas=True)
+        tables.append(pa.table(cols))
+    return pa.concat_tables(tables) if tables else None
+
+def mark_dataset_duplicates(root: str = DATASET_DIR, reference: pa.Table = None,
+                            key_columns=("date", "mine", "persons_killed"), **kwargs):
+    """Set duplicate_of across every volume of the partitioned dataset; returns (marked, reference verdicts).
+
+    duplicate_of is the record_id of the earliest copy (by year, volume, then
+    order within the volume), null for originals. reference rows (e.g.
+    read_secondary_csvs) are compared after the dataset's own, so a dataset
+    record is never marked as a copy of one; their verdicts come back as a
+    record_id / duplicate_of table. Only volumes whose verdicts changed are
+    rewritten.
+    """
+    # Volumes written before record_id existed get one first
+    dataset = open_dataset(root)
+    stale = ds.field("record_id").is_null() if "record_id" in dataset.schema.names else None
+    old = dataset.to_table(columns=["year", "volume"], filter=stale)
+    for year, volume in set(zip(old.column("year").to_pylist(), old.column("volume").to_pylist())):
+        part = read_volume(root, year, volume)
+        write_volume(part.drop_columns([c for c in ("record_id", "duplicate_of") if c in part.column_names]),
+                     root, year=year, volume=volume)
+
+    table = open_dataset(root).to_table(columns=["year", "volume", "duplicate_of", *DEDUP_COLUMNS])
+    ids = table.column("record_id").to_pylist()
+    years, volumes = table.column("year").to_pylist(), table.column("volume").to_pylist()
+    order = sorted(range(table.num_rows), key=lambda i: (years[i], volumes[i], int(ids[i].rsplit("/", 1)[1])))
+    table = table.take(pa.array(order, pa.int64()))
+
+    records = table.select(list(DEDUP_COLUMNS))
+    records = records.set_column(records.column_names.index("date"), "date", normalize_dates(records.column("date")))
+    records = records.set_column(records.column_names.index("persons_killed"), "persons_killed",
+                                 records.column("persons_killed").cast(pa.int64()))
+    n = records.num_rows
+    if reference is not None:
+        records = pa.concat_tables([records, reference.select(list(DEDUP_COLUMNS)).cast(records.schema)])
+
+    keys = exact_keys(records, key_columns)
+    groups = duplicate_groups(records.column("narrative").to_pylist(), keys, **kwargs)
+    all_ids = np.array(records.column("record_id").to_pylist(), dtype=object)
+    dup = np.where(groups == np.arange(len(groups)), None, all_ids[groups])
+
+    verdict = dict(zip(all_ids[:n].tolist(), dup[:n].tolist()))
+    before = table.column("duplicate_of").to_pylist()
+    ids, years, volumes = (table.column(c).to_pylist() for c in ("record_id", "year", "volume"))
+    changed = {(years[i], volumes[i]) for i in range(n) if before[i] != verdict[ids[i]]}
+    for year, volume in sorted(changed):
+        part = read_volume(root, year, volume)
+        col = pa.array([verdict[r] for r in part.column("record_id").to_pylist()], pa.string())
+        write_volume(part.set_column(part.column_names.index("duplicate_of"), "duplicate_of", col),
+                     root, year=year, volume=volume)
+
+    marked = sum(d is not None for d in dup[:n])
+    return marked, pa.table({"record_id": pa.array(all_ids[n:].tolist(), pa.string()),
+                             "duplicate_of": pa.array(dup[n:].tolist(), pa.string())})
@@ -1,9 +1,13 @@
 # src/extraction/regex_bootstrap.py
+import os
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from src.storage.schema import AccidentRecord, Victim
 
-# Pattern to split record blocks
-REC_SPLIT = re.compile(r"\n\s*\d+\.\s*Date\s*-\s*", re.I)
+# Pattern to split record blocks ("Date - ..." stays at the head of the block)
+REC_SPLIT = re.compile(r"\n\s*\d+\.\s*(?=Date\s*-)", re.I)
 
 FIELD_PATS = {
     "date": re.compile(r"Date\s*-\s*([0-9/.-]+)", re.I),
@@ -15,50 +19,243 @@ FIELD_PATS = {
     "persons": re.compile(r"Person\(s\)\s*Killed\s*:(.+?)(?:\n\n|\Z)", re.I | re.S)
 }
 
+def _named(key, pat):
+    # FIELD_PATS[key] with its capture group renamed to key, and its own
+    # DOTALL flag scoped to it, so all fields can share one alternation
+    src = re.sub(r"(?<!\\)\((?!\?)", f"(?P<{key}>", pat.pattern, count=1)
+    return f"(?s:{src})" if pat.flags & re.S else src
+
+# Every field in one alternation: a block is scanned once, left to right,
+# instead of once (twice, really) per field
+FIELD_SCAN = re.compile("|".join(_named(k, p) for k, p in FIELD_PATS.items()), re.I)
+
+# "Code : 0111 Fall of Roof" heads a cause section; it applies to every
+# record until the next one (sanitizer v2 keeps these lines)
+SECTION_CODE = re.compile(r"^Code\s*:\s*(\d{3,4})\s*(.*?)\s*$", re.I | re.M)
+
+# Lines that belong to the page/section layout, not to a record's text
+LAYOUT_LINE = re.compile(
+    r"^[^\S\n]*(?:\d{1,4}|-{5,}|\(\s*\d+\s*Deaths?\s*\)|Summary of Findings of Enquiries.*)[^\S\n]*(?:\n|$)",
+    re.I | re.M)
+
+# "Had ... this accident could have been averted." closes every statement;
+# anything after it (e.g. the appendix tables after the last record) is not
+# part of the record
+PREVENTION_START = re.compile(r"^Had\b", re.M)
+PREVENTION_END = re.compile(r"\baverted\b\.?", re.I)
+
 VICTIM_PAT = re.compile(
     r"\d+\.\s*([^,]+),\s*([^,]+),\s*(Male|Female),\s*(\d+)\s*Years",
     re.I
 )
 
+# Blocks per task sent to a worker; large enough to amortize pickling
+CHUNK_SIZE = 256
+
+# How far back into already-scanned text to look for a record header that
+# was cut off by a page break. Headers ("12. Date - ") are far shorter.
+SCAN_OVERLAP = 256
+
 def split_records(text: str):
-    parts = REC_SPLIT.split("\n" + text)
-    blocks = [parts[i+1] for i in range(0, len(parts)-1, 2)]
-    return blocks
+    return REC_SPLIT.split("\n" + text)[1:]
+
+def _page_span(page_starts, start, end, text):
+    # Trim surrounding whitespace so a block isn't credited to a page it only
+    # touches with the joining newline
+    start += len(text) - len(text.lstrip())
+    end -= len(text) - len(text.rstrip())
+    span = []
+    for i, (offset, page) in enumerate(page_starts):
+        page_end = page_starts[i + 1][0] - 1 if i + 1 < len(page_starts) else float("inf")
+        if offset < end and page_end > start:
+            span.append(page)
+    return span
+
+def _last_section(text, current):
+    # The last section heading in text, or current if there is none
+    for m in SECTION_CODE.finditer(text):
+        current = (m.group(1), m.group(2) or None)
+    return current
+
+def iter_blocks(pages, sections: bool = False):
+    """Stream (block, page_span) from {"page", "text"} dicts in page order.
+
+    Equivalent to split_records("\\n".join(texts)), but holds only the current
+    block plus one page in memory, handles records that straddle a page break,
+    and reports which pages each block came from. With sections=True, yields
+    (block, page_span, (code, cause)) using the latest "Code :" heading seen
+    before the block, or None before the first one.
+    """
+    buf = ""            # unconsumed text: current block (or preamble) + newest page
+    base = 0            # offset of buf[0] in the virtual "\n".join(...) stream
+    block_start = None  # stream offset where the current block begins
+    scan_from = 0       # stream offset to resume looking for headers
+    page_starts = []    # (stream offset, page number) of pages still in buf
+    section = None      # (code, cause) heading the current block
+
+    def emit(text, span):
+        return (text, span, section) if sections else (text, span)
+
+    for p in pages:
+        page_starts.append((base + len(buf) + 1, p["page"]))
+        buf += "\n" + p["text"]
+
+        for m in REC_SPLIT.finditer(buf, max(scan_from - base, 0)):
+            if block_start is not None:
+                text = buf[block_start - base:m.start()]
+                yield emit(text, _page_span(page_starts, block_start, base + m.start(), text))
+            else:
+                text = buf[:m.start()]    # preamble
+            section = _last_section(text, section)
+            block_start = scan_from = base + m.end()
+
+        # A header may start in this page's tail and finish on the next one
+        scan_from = max(scan_from, base + len(buf) - SCAN_OVERLAP)
+        cut = (scan_from if block_start is None else min(block_start, scan_from)) - base
+        if block_start is None:
+            # Dropping preamble: cut on a line boundary so no heading is split
+            cut = max(buf.rfind("\n", 0, cut), 0)
+            section = _last_section(buf[:cut], section)
+        buf, base = buf[cut:], base + cut
+        while len(page_starts) > 1 and page_starts[1][0] <= base:
+            page_starts.pop(0)
+
+    if block_start is not None:
+        text = buf[block_start - base:]
+        yield emit(text, _page_span(page_starts, block_start, base + len(buf), text))
+
+def victim_values(persons: str):
+    """Victims in the persons section as plain dicts (Victim field order)."""
+    return [
+        {"name": name.strip(), "role": role.strip(), "gender": gender.strip(), "age": int(age)}
+        for name, role, gender, age in VICTIM_PAT.findall(persons)
+    ]
 
-def parse_victims(block: str):
-    victims = []
-    m = FIELD_PATS["persons"].search(block)
+def parse_victims(block: str, persons: str = None):
+    if persons is None:
+        m = FIELD_PATS["persons"].search(block)
+        if not m:
+            return []
+        persons = m.group(1)
+    return [Victim(**v) for v in victim_values(persons)]
+
+def scan_matches(block: str) -> dict:
+    """First match object of every FIELD_PATS entry found, in one pass over block."""
+    found = {}
+    for m in FIELD_SCAN.finditer(block):
+        if m.lastgroup not in found:
+            found[m.lastgroup] = m
+            if len(found) == len(FIELD_PATS):
+                break
+    return found
+
+def scan_fields(block: str) -> dict:
+    """First match of every FIELD_PATS entry (unstripped), in one pass over block."""
+    vals = dict.fromkeys(FIELD_PATS)
+    for key, m in scan_matches(block).items():
+        vals[key] = m.group(key)
+    return vals
+
+def _paragraph(text: str):
+    # PDF line wraps → one line of text; None if nothing is left
+    return " ".join(text.split()) or None
+
+def split_sections(body: str):
+    """(narrative, prevention) from the text after the victims list.
+
+    Layout lines (page numbers, rules, "( n Deaths)") and the heading of the
+    next cause section are dropped; prevention runs from the "Had ..." line
+    to "... averted.".
+    """
+    m = SECTION_CODE.search(body)
+    if m:
+        body = body[:m.start()]
+    body = LAYOUT_LINE.sub("", body)
+    m = PREVENTION_START.search(body)
     if not m:
-        return victims
-    for name, role, gender, age in VICTIM_PAT.findall(m.group(1)):
-        victims.append(
-            Victim(name=name.strip(), role=role.strip(), gender=gender.strip(), age=int(age))
-        )
-    return victims
-
-def parse_block(block: str, source_file: str) -> AccidentRecord:
-    vals = {
-        key: (FIELD_PATS[key].search(block).group(1).strip()
-              if FIELD_PATS[key].search(block) else None)
-        for key in FIELD_PATS
-    }
+        return _paragraph(body), None
+    end = PREVENTION_END.search(body, m.start())
+    return _paragraph(body[:m.start()]), _paragraph(body[m.start():end.end() if end else None])
+
+def block_values(block: str, source_file: str, page_span=None, section=None) -> dict:
+    """Parsed fields of one block as a plain dict shaped like AccidentRecord.model_dump().
 
-    victims = parse_victims(block)
+    This is the hot path for bulk extraction: no pydantic objects are built.
+    section is the (code, cause) heading from iter_blocks(..., sections=True).
+    """
+    found = scan_matches(block)
+    vals = dict.fromkeys(FIELD_PATS)
+    for key, m in found.items():
+        vals[key] = m.group(key).strip()
+
+    # The statement text starts after the last victim (or the header fields)
+    persons = found.get("persons")
+    if persons:
+        vm = list(VICTIM_PAT.finditer(block, persons.start("persons"), persons.end("persons")))
+        victims = [{"name": name.strip(), "role": role.strip(), "gender": gender.strip(), "age": int(age)}
+                   for name, role, gender, age in (v.groups() for v in vm)]
+        body_start = vm[-1].end() if vm else persons.start("persons")
+    else:
+        victims = []
+        body_start = max((m.end() for m in found.values()), default=0)
     persons_killed = max(len(victims), 1 if vals["persons"] else 0)
 
-    return AccidentRecord(
-        date=vals["date"] or "",
-        time=vals["time"],
-        mine=vals["mine"],
-        owner=vals["owner"],
-        district=vals["district"],
-        state=vals["state"],
-        code=None,
-        cause=None,
-        narrative=block.strip(),
-        prevention=None,
-        persons_killed=persons_killed,
-        victims=victims,
-        source_doc=source_file,
-        page_span=[]
-    )
+    narrative, prevention = split_sections(block[body_start:])
+    code, cause = section or (None, None)
+
+    return {
+        "date": vals["date"] or "",
+        "time": vals["time"],
+        "mine": vals["mine"],
+        "owner": vals["owner"],
+        "district": vals["district"],
+        "state": vals["state"],
+        "code": code,
+        "cause": cause,
+        "narrative": narrative if narrative or prevention else block.strip(),
+        "prevention": prevention,
+        "persons_killed": persons_killed,
+        "victims": victims,
+        "source_doc": source_file,
+        "page_span": list(page_span or []),
+    }
+
+def parse_block(block: str, source_file: str, page_span=None, section=None) -> AccidentRecord:
+    return AccidentRecord(**block_values(block, source_file, page_span, section))
+
+def iter_records(pages, source_file: str):
+    """Stream AccidentRecords (with page_span and cause section) straight from page dicts."""
+    for block, span, section in iter_blocks(pages, sections=True):
+        yield parse_block(block, source_file, page_span=span, section=section)
+
+def _parse_chunk(chunk, source_file: str):
+    # Runs in a worker; only plain dicts cross the process boundary
+    return [block_values(b, source_file, page_span=s, section=sec) for b, s, sec in chunk]
+
+def iter_record_dicts(pages, source_file: str, workers: int = 1, chunk_size: int = CHUNK_SIZE):
+    """Stream record dicts (shaped like AccidentRecord.model_dump()) from page dicts.
+
+    No pydantic objects are built; validate downstream if needed (see
+    src.storage.arrow_builder.ParquetRecordWriter). workers > 1 parses chunks
+    of blocks in a process pool; workers=None uses every core. Output order
+    always matches the input, and at most a few chunks per worker are in
+    flight, so memory stays bounded.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    blocks = iter_blocks(pages, sections=True)
+
+    if workers <= 1:
+        for block, span, section in blocks:
+            yield block_values(block, source_file, page_span=span, section=section)
+        return
+
+    chunks = iter(lambda: list(islice(blocks, chunk_size)), [])
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_parse_chunk, chunk, source_file))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
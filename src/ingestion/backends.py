@@ -0,0 +1,95 @@
+# src/ingestion/backends.py
+import re
+import pdfplumber
+import pypdfium2 as pdfium
+
+DEFAULT_BACKEND = "pdfplumber"
+
+# PDFium joins a line ending in a hyphen onto the next and marks the spot with
+# U+FFFE; pdfplumber prints the hyphen and the break
+PDFIUM_HYPHEN = "\ufffe"
+
+# Other PDFium control markers ("\x02", "\r" of its "\r\n" breaks, ...)
+PDFIUM_CONTROLS = re.compile(r"[\x00-\x08\x0b-\x1f\x7f]")
+
+class PdfplumberBackend:
+    """Layout-faithful text (pdfminer character clustering). The default."""
+
+    name = "pdfplumber"
+    # Bump when page_text output changes; part of the page-cache key
+    version = "1"
+
+    def __init__(self, pdf_path: str):
+        self.pdf = pdfplumber.open(pdf_path)
+
+    def __len__(self):
+        return len(self.pdf.pages)
+
+    def page_text(self, n: int) -> str:
+        page = self.pdf.pages[n - 1]
+        text = page.extract_text() or ""
+        # pdfplumber caches the parsed layout/objects on the Page for the life of the
+        # document; drop them once we have the text so memory doesn't grow per page
+        page.close()
+        return text
+
+    def close(self):
+        self.pdf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class PdfiumBackend:
+    """PDFium text layer via pypdfium2; several times faster.
+
+    Output is normalized to pdfplumber's shape — "\\n" line breaks, no
+    surrounding whitespace, no blank lines — so the sanitizer and regexes
+    downstream see the same structure.
+    """
+
+    name = "pypdfium2"
+    version = "2"
+
+    def __init__(self, pdf_path: str):
+        self.pdf = pdfium.PdfDocument(pdf_path)
+
+    def __len__(self):
+        return len(self.pdf)
+
+    def page_text(self, n: int) -> str:
+        page = self.pdf[n - 1]
+        textpage = page.get_textpage()
+        try:
+            raw = textpage.get_text_range()
+        finally:
+            textpage.close()
+            page.close()
+        return normalize_pdfium(raw)
+
+    def close(self):
+        self.pdf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def normalize_pdfium(raw: str) -> str:
+    """PDFium page text in pdfplumber's shape: "\n" breaks, trimmed lines, no blank lines."""
+    raw = PDFIUM_CONTROLS.sub("", raw.replace("\r\n", "\n").replace("\r", "\n").replace(PDFIUM_HYPHEN, "-\n"))
+    return "\n".join(s for s in (line.strip() for line in raw.split("\n")) if s)
+
+BACKENDS = {b.name: b for b in (PdfplumberBackend, PdfiumBackend)}
+
+def backend_key(backend: str) -> str:
+    """Backend name and output version, as the page cache keys raw text."""
+    return f"{backend}-{BACKENDS[backend].version}"
+
+def open_pdf(pdf_path: str, backend: str = DEFAULT_BACKEND):
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown PDF backend {backend!r}; choose from {sorted(BACKENDS)}")
+    return BACKENDS[backend](pdf_path)
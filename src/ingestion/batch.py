@@ -0,0 +1,114 @@
+# src/ingestion/batch.py
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from src.ingestion.backends import DEFAULT_BACKEND
+from src.ingestion.cache import PageCache
+from src.ingestion.pipeline import ingest_pdf, manifest_path
+
+RAW_DIR = "data/raw"
+OUT_DIR = "data/interim"
+SUMMARY_NAME = "batch_summary.json"
+
+def discover_pdfs(raw_dir: str = RAW_DIR):
+    """Every *.pdf under raw_dir (recursive), largest first.
+
+    Longest-job-first keeps the tail short: the big volumes start
+    immediately and the small ones fill in the gaps at the end.
+    """
+    pdfs = [p for p in Path(raw_dir).rglob("*") if p.is_file() and p.suffix.lower() == ".pdf"]
+    return sorted(pdfs, key=lambda p: (-p.stat().st_size, str(p)))
+
+def output_path(pdf: Path, raw_dir: str, out_dir: str, ext: str = ".jsonl") -> str:
+    # Keep volumes from different sub-folders apart: coal/2016/X.pdf → coal__2016__X_pages.jsonl
+    rel = pdf.relative_to(raw_dir).with_suffix("")
+    return os.path.join(out_dir, "__".join(rel.parts) + "_pages" + ext)
+
+def _ingest_one(pdf_path: str, out_path: str, store_path: str, cache_path: str, backend: str):
+    # Runs in a worker; never raises so one bad volume can't take down the batch
+    t0 = time.perf_counter()
+    try:
+        if cache_path:
+            with PageCache(cache_path) as cache:
+                m = ingest_pdf(pdf_path, out_path, cache=cache, backend=backend,
+                               store_path=store_path)
+        else:
+            m = ingest_pdf(pdf_path, out_path, backend=backend, store_path=store_path)
+        return {"status": "ok", **m}
+    except Exception as e:
+        for p in (out_path, store_path, manifest_path(store_path or out_path)):
+            if p and os.path.exists(p):
+                os.remove(p)
+        return {
+            "status": "failed",
+            "pdf": pdf_path,
+            "output": None,
+            "error": f"{type(e).__name__}: {e}",
+            "traceback": traceback.format_exc(),
+            "seconds": round(time.perf_counter() - t0, 3),
+        }
+
+def ingest_batch(raw_dir: str = RAW_DIR, out_dir: str = OUT_DIR, workers: int = None,
+                 cache_path: str = None, backend: str = DEFAULT_BACKEND, jsonl: bool = True,
+                 log=print) -> dict:
+    """Ingest every PDF under raw_dir, one volume per worker process.
+
+    Writes a per-volume Arrow page store (+ JSONL export unless jsonl=False,
+    + manifest) into out_dir and a run summary to out_dir/batch_summary.json,
+    which is also returned.
+    """
+    workers = workers or os.cpu_count() or 1
+    pdfs = discover_pdfs(raw_dir)
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    sizes = {str(p): p.stat().st_size for p in pdfs}
+
+    t0 = time.perf_counter()
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_ingest_one, str(p),
+                        output_path(p, raw_dir, out_dir) if jsonl else None,
+                        output_path(p, raw_dir, out_dir, ".arrow"),
+                        cache_path, backend): str(p)
+            for p in pdfs
+        }
+        for fut in as_completed(futures):
+            pdf = futures[fut]
+            try:
+                r = fut.result()
+            except Exception as e:
+                # Worker process died outright (e.g. segfault in a native lib)
+                r = {"status": "failed", "pdf": pdf, "output": None,
+                     "error": f"{type(e).__name__}: {e}", "seconds": None}
+            r["bytes"] = sizes[pdf]
+            if r["status"] == "ok":
+                r["pages_per_sec"] = round(r["pages"] / r["seconds"], 2) if r["seconds"] else None
+                log(f"[OK] {pdf} → {r['store']} | {r['pages']} pages | {r['seconds']:.2f}s")
+            else:
+                log(f"[FAIL] {pdf}: {r['error']}")
+            results[pdf] = r
+
+    files = [results[str(p)] for p in pdfs]
+    ok = [r for r in files if r["status"] == "ok"]
+    wall = time.perf_counter() - t0
+    summary = {
+        "raw_dir": raw_dir,
+        "out_dir": out_dir,
+        "workers": workers,
+        "backend": backend,
+        "volumes": len(files),
+        "succeeded": len(ok),
+        "failed": len(files) - len(ok),
+        "pages": sum(r["pages"] for r in ok),
+        "seconds": round(wall, 3),
+        "pages_per_sec": round(sum(r["pages"] for r in ok) / wall, 2) if wall else None,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "files": files,
+    }
+    with open(os.path.join(out_dir, SUMMARY_NAME), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return summary
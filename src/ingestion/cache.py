@@ -0,0 +1,189 @@
+# src/ingestion/cache.py
+import hashlib
+import sqlite3
+from itertools import tee
+from pathlib import Path
+from src.ingestion import sanitizer
+from src.ingestion.backends import DEFAULT_BACKEND, backend_key
+from src.ingestion.pdf_reader import iter_pdf_text, page_count
+
+CACHE_PATH = "data/cache/pages.sqlite3"
+
+# Pages per write transaction (and per read when streaming pages back). Pages
+# are extracted and cleaned outside any transaction, so the write lock is only
+# held for the INSERT itself, and a crash mid-volume keeps finished pages
+COMMIT_EVERY = 32
+
+# PRAGMA user_version of the layout below; older cache files are rebuilt
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    pdf_sha256 TEXT PRIMARY KEY,
+    n_pages    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS raw_pages (
+    pdf_sha256 TEXT NOT NULL,
+    backend    TEXT NOT NULL,
+    page       INTEGER NOT NULL,
+    text       TEXT NOT NULL,
+    PRIMARY KEY (pdf_sha256, backend, page)
+);
+CREATE TABLE IF NOT EXISTS clean_pages (
+    pdf_sha256 TEXT NOT NULL,
+    backend    TEXT NOT NULL,
+    page       INTEGER NOT NULL,
+    sanitizer  TEXT NOT NULL,
+    text       TEXT NOT NULL,
+    PRIMARY KEY (pdf_sha256, backend, sanitizer, page)
+);
+"""
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def sanitizer_fingerprint() -> str:
+    """SANITIZER_VERSION + hash of the sanitizer source: any edit invalidates."""
+    with open(sanitizer.__file__, "rb") as f:
+        src_hash = hashlib.sha256(f.read()).hexdigest()[:16]
+    return f"{sanitizer.SANITIZER_VERSION}-{src_hash}"
+
+class PageCache:
+    """Content-addressed cache of extracted and sanitized page text.
+
+    Raw text is keyed by (PDF sha256, backend and its version, page) and cleaned text
+    additionally by the sanitizer fingerprint, so a sanitizer change only re-runs clean_page
+    over cached raw text — pdfplumber is invoked just for pages never seen.
+    """
+
+    def __init__(self, path: str = CACHE_PATH):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        # Batch ingestion shares one cache across worker processes. In WAL mode
+        # readers never block the (short) write transactions of other workers
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # Checked under the write lock, so two workers can't both rebuild
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                # It's only a cache: drop anything from an older layout and start over
+                for table in ("documents", "raw_pages", "clean_pages"):
+                    self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+                for stmt in SCHEMA.split(";"):
+                    if stmt.strip():
+                        self.conn.execute(stmt)
+                self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write(self, sql: str, rows: list):
+        # One short transaction; the connection is in autocommit mode otherwise
+        if not rows:
+            return
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany(sql, rows)
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def _n_pages(self, pdf_path: str, sha: str, backend: str) -> int:
+        row = self.conn.execute(
+            "SELECT n_pages FROM documents WHERE pdf_sha256 = ?", (sha,)).fetchone()
+        if row:
+            return row[0]
+        n = page_count(pdf_path, backend)
+        self._write("INSERT OR REPLACE INTO documents VALUES (?, ?)", [(sha, n)])
+        return n
+
+    def _read_pages(self, table: str, sha: str, backend: str, pages: list, version: str = None):
+        # (page, text) for pages in order, COMMIT_EVERY per query, so no read
+        # statement stays open while the caller works on the pages
+        extra, args = ("", ()) if version is None else (" AND sanitizer = ?", (version,))
+        for i in range(0, len(pages), COMMIT_EVERY):
+            chunk = pages[i:i + COMMIT_EVERY]
+            yield from self.conn.execute(
+                f"SELECT page, text FROM {table} WHERE pdf_sha256 = ? AND backend = ?{extra} "
+                f"AND page IN ({','.join('?' * len(chunk))}) ORDER BY page",
+                (sha, backend, *args, *chunk)).fetchall()
+
+    def _pages_present(self, table: str, sha: str, backend: str, version: str = None):
+        if version is None:
+            rows = self.conn.execute(
+                f"SELECT page FROM {table} WHERE pdf_sha256 = ? AND backend = ?",
+                (sha, backend))
+        else:
+            rows = self.conn.execute(
+                f"SELECT page FROM {table} "
+                "WHERE pdf_sha256 = ? AND backend = ? AND sanitizer = ?",
+                (sha, backend, version))
+        return {r[0] for r in rows}
+
+    def iter_clean_pages(self, pdf_path: str, workers: int = 1, stats: dict = None,
+                         backend: str = DEFAULT_BACKEND):
+        """Yield cleaned {"page", "text"} dicts for pdf_path in page order.
+
+        stats, if given, is filled with pdf_sha256 / backend / sanitizer /
+        pages / extracted / recleaned / cached counts for the manifest.
+        """
+        sha = file_sha256(pdf_path)
+        version = sanitizer_fingerprint()
+        key = backend_key(backend)
+        n_pages = self._n_pages(pdf_path, sha, backend)
+
+        have_clean = self._pages_present("clean_pages", sha, key, version)
+        need_clean = [n for n in range(1, n_pages + 1) if n not in have_clean]
+        have_raw = self._pages_present("raw_pages", sha, key) if need_clean else set()
+        need_raw = [n for n in need_clean if n not in have_raw]
+
+        # Only pages never extracted from this exact PDF go through the backend
+        if need_raw:
+            chunk = []
+            for p in iter_pdf_text(pdf_path, workers=workers, pages=need_raw, backend=backend):
+                chunk.append((sha, key, p["page"], p["text"]))
+                if len(chunk) >= COMMIT_EVERY:
+                    self._write("INSERT OR REPLACE INTO raw_pages VALUES (?, ?, ?, ?)", chunk)
+                    chunk = []
+            self._write("INSERT OR REPLACE INTO raw_pages VALUES (?, ?, ?, ?)", chunk)
+
+        # Re-clean stale pages a chunk at a time
+        if need_clean:
+            chunk = []
+            rows, raw = tee(self._read_pages("raw_pages", sha, key, need_clean))
+            for (n, _), text in zip(rows, sanitizer.clean_pages(text for _, text in raw)):
+                chunk.append((sha, key, n, version, text))
+                if len(chunk) >= COMMIT_EVERY:
+                    self._write("INSERT OR REPLACE INTO clean_pages VALUES (?, ?, ?, ?, ?)", chunk)
+                    chunk = []
+            self._write("INSERT OR REPLACE INTO clean_pages VALUES (?, ?, ?, ?, ?)", chunk)
+
+        for n, text in self._read_pages("clean_pages", sha, key, list(range(1, n_pages + 1)), version):
+            yield {"page": n, "text": text}
+
+        if stats is not None:
+            stats.update({
+                "pdf_sha256": sha,
+                "backend": backend,
+                "sanitizer": version,
+                "pages": n_pages,
+                "extracted": len(need_raw),
+                "recleaned": len(need_clean),
+                "cached": n_pages - len(need_clean),
+            })
@@ -1,10 +1,61 @@
 # src/ingestion/pdf_reader.py
-import pdfplumber
-
-def read_pdf_text(pdf_path: str):
-    pages = []
-    with pdfplumber.open(pdf_path) as pdf:
-        for i, page in enumerate(pdf.pages, start=1):
-            text = page.extract_text() or ""
-            pages.append({"page": i, "text": text})
-    return pages
+import os
+from concurrent.futures import ProcessPoolExecutor
+from src.ingestion.backends import DEFAULT_BACKEND, open_pdf
+
+# Shards per worker; >1 keeps the pool busy when some pages are much slower than others
+SHARDS_PER_WORKER = 4
+
+def _extract_pages(pdf_path: str, page_numbers, backend: str):
+    # Runs inside a worker: every process opens its own handle on the PDF
+    with open_pdf(pdf_path, backend) as pdf:
+        return [{"page": n, "text": pdf.page_text(n)} for n in page_numbers]
+
+def page_count(pdf_path: str, backend: str = DEFAULT_BACKEND) -> int:
+    with open_pdf(pdf_path, backend) as pdf:
+        return len(pdf)
+
+def shard_pages(page_numbers, n_shards: int):
+    """Split page_numbers into at most n_shards contiguous, order-preserving lists."""
+    page_numbers = list(page_numbers)
+    n_shards = max(1, min(n_shards, len(page_numbers)))
+    size, extra = divmod(len(page_numbers), n_shards)
+    shards, start = [], 0
+    for s in range(n_shards):
+        stop = start + size + (1 if s < extra else 0)
+        shards.append(page_numbers[start:stop])
+        start = stop
+    return shards
+
+def iter_pdf_text(pdf_path: str, workers: int = 1, pages=None, backend: str = DEFAULT_BACKEND):
+    """Yield {"page": n, "text": ...} one page at a time, in page order.
+
+    Per-page caches are released as soon as a page's text is extracted, so
+    memory stays flat regardless of document length. workers > 1 shards the
+    page ranges across a process pool; workers=None uses every core.
+    pages restricts extraction to those 1-based page numbers. backend is a
+    name from src.ingestion.backends.BACKENDS.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1:
+        with open_pdf(pdf_path, backend) as pdf:
+            numbers = range(1, len(pdf) + 1) if pages is None else sorted(pages)
+            for n in numbers:
+                yield {"page": n, "text": pdf.page_text(n)}
+        return
+
+    numbers = range(1, page_count(pdf_path, backend) + 1) if pages is None else sorted(pages)
+    if not numbers:
+        return
+    shards = shard_pages(numbers, workers * SHARDS_PER_WORKER)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() yields in submission order, so shards come back in page order
+        for chunk in pool.map(_extract_pages, [pdf_path] * len(shards), shards,
+                              [backend] * len(shards)):
+            yield from chunk
+
+def read_pdf_text(pdf_path: str, workers: int = 1, backend: str = DEFAULT_BACKEND):
+    """Return [{"page": n, "text": ...}] for every page, in page order."""
+    return list(iter_pdf_text(pdf_path, workers=workers, backend=backend))
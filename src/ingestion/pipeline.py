@@ -0,0 +1,77 @@
+# src/ingestion/pipeline.py
+import json
+import os
+import time
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from itertools import tee
+from pathlib import Path
+from src.ingestion.backends import DEFAULT_BACKEND
+from src.ingestion.cache import file_sha256, sanitizer_fingerprint
+from src.ingestion.pdf_reader import iter_pdf_text
+from src.ingestion.sanitizer import clean_pages
+from src.storage.page_store import PageStoreWriter
+
+def iter_clean_pages(pdf_path: str, workers: int = 1, backend: str = DEFAULT_BACKEND):
+    """Yield sanitized page dicts straight off the reader, one at a time."""
+    pages, raw = tee(iter_pdf_text(pdf_path, workers=workers, backend=backend))
+    for p, text in zip(pages, clean_pages(p["text"] for p in raw)):
+        p["text"] = text
+        yield p
+
+def manifest_path(out_path: str) -> str:
+    return os.path.splitext(out_path)[0] + ".manifest.json"
+
+def ingest_pdf(pdf_path: str, out_path: str = None, workers: int = 1, cache=None,
+               backend: str = DEFAULT_BACKEND, store_path: str = None) -> dict:
+    """Stream pdf_path → cleaned pages and return the run's manifest.
+
+    Pages go to a JSONL file at out_path and/or an Arrow page store at
+    store_path (src.storage.page_store). Only one page is held in memory at a
+    time (per worker), so peak memory does not depend on the size of the
+    volume. With a PageCache, pages whose (PDF hash, backend, page, sanitizer)
+    key is already cached are not re-extracted. The manifest is also written
+    next to the outputs as *.manifest.json.
+    """
+    if out_path is None and store_path is None:
+        raise ValueError("ingest_pdf needs out_path and/or store_path")
+    for path in (out_path, store_path):
+        if path:
+            Path(os.path.dirname(path) or ".").mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+
+    stats = {}
+    if cache is not None:
+        pages = cache.iter_clean_pages(pdf_path, workers=workers, stats=stats, backend=backend)
+    else:
+        pages = iter_clean_pages(pdf_path, workers=workers, backend=backend)
+
+    n = 0
+    with ExitStack() as outputs:
+        f = outputs.enter_context(open(out_path, "w", encoding="utf-8")) if out_path else None
+        store = outputs.enter_context(PageStoreWriter(store_path)) if store_path else None
+        for p in pages:
+            if f:
+                f.write(json.dumps(p, ensure_ascii=False) + "\n")
+            if store:
+                store.write(p)
+            n += 1
+
+    if cache is None:
+        stats = {"pdf_sha256": file_sha256(pdf_path), "backend": backend,
+                 "sanitizer": sanitizer_fingerprint(),
+                 "pages": n, "extracted": n, "recleaned": n, "cached": 0}
+
+    manifest = {
+        "pdf": pdf_path,
+        "output": out_path,
+        "output_sha256": file_sha256(out_path) if out_path else None,
+        "store": store_path,
+        "store_sha256": file_sha256(store_path) if store_path else None,
+        **stats,
+        "seconds": round(time.perf_counter() - t0, 3),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    with open(manifest_path(store_path or out_path), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
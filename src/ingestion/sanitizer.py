@@ -1,18 +1,38 @@
 # src/ingestion/sanitizer.py
 import re
 
-HEADER = re.compile(r"^\s*STATEMENT NO", re.IGNORECASE)
-CODE_LINE = re.compile(r"^Code\s*:", re.IGNORECASE)
+# Bump when clean_page output changes in a way the source hash can't see
+# (e.g. a regex moved to another module). Part of the page-cache key.
+SANITIZER_VERSION = "2"
+
+# Line breaks str.splitlines() honours besides "\n"; pages containing any of
+# them are normalized to "\n" first so the line semantics stay identical
+OTHER_BREAKS = re.compile("[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+# "STATEMENT NO..." page headers: each whole line (and its newline) is deleted
+# in a single sweep over the page. [^\S\n] is "whitespace on this line",
+# matching what line.strip() used to remove. "Code : 0111 Fall of Roof"
+# lines are kept: they head each cause section (regex_bootstrap.SECTION_CODE).
+SKIP_LINES = re.compile(r"^[^\S\n]*STATEMENT NO.*\n?", re.IGNORECASE | re.MULTILINE)
+
+# Same result as [ \t]+ → " ", but leaves lone spaces alone instead of
+# rewriting every word gap
+SPACE_RUNS = re.compile(r"\t[ \t]*| [ \t]+")
 
 def clean_page(text: str):
-    lines = []
-    for line in text.splitlines():
-        if HEADER.match(line.strip()): 
-            continue
-        if CODE_LINE.match(line.strip()):
-            continue
-        lines.append(line)
+    if OTHER_BREAKS.search(text):
+        text = "\n".join(text.splitlines())
+    text = SKIP_LINES.sub("", text)
+    return SPACE_RUNS.sub(" ", text).strip()
+
+def clean_pages(texts):
+    """Batch form of clean_page: lazily yields one cleaned text per input text.
 
-    cleaned = "\n".join(lines)
-    cleaned = re.sub(r"[ \t]+", " ", cleaned)  # normalize spaces
-    return cleaned.strip()
+    Ingestion and the page cache clean through this; its output must stay
+    identical to clean_page's (tests/test_sanitizer.py).
+    """
+    breaks, skip, spaces = OTHER_BREAKS.search, SKIP_LINES.sub, SPACE_RUNS.sub
+    for text in texts:
+        if breaks(text):
+            text = "\n".join(text.splitlines())
+        yield spaces(" ", skip("", text)).strip()
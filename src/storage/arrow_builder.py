@@ -0,0 +1,113 @@
+# src/storage/arrow_builder.py
+import os
+import typing
+from pathlib import Path
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pydantic import BaseModel
+from src.storage.schema import AccidentRecord
+
+# Rows per Parquet row group (and per Arrow batch built in memory)
+ROW_GROUP_SIZE = 8192
+
+# Validate every Nth record against the pydantic model when validate="sample"
+SAMPLE_EVERY = 100
+
+_SCALARS = {str: pa.string(), int: pa.int64(), float: pa.float64(), bool: pa.bool_()}
+
+def _arrow_type(annotation):
+    origin, args = typing.get_origin(annotation), typing.get_args(annotation)
+    if origin is typing.Union:
+        # Optional[X]: nullability lives on the field, not the type
+        (inner,) = [a for a in args if a is not type(None)]
+        return _arrow_type(inner)
+    if origin in (list, typing.List):
+        return pa.list_(_arrow_type(args[0]))
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return pa.struct(arrow_schema(annotation))
+    return _SCALARS[annotation]
+
+def arrow_schema(model=AccidentRecord) -> pa.Schema:
+    """Arrow schema mirroring a pydantic model; nested models become structs."""
+    fields = []
+    for name, info in model.model_fields.items():
+        nullable = type(None) in typing.get_args(info.annotation)
+        fields.append(pa.field(name, _arrow_type(info.annotation), nullable=nullable))
+    return pa.schema(fields)
+
+RECORD_SCHEMA = arrow_schema(AccidentRecord)
+
+class ArrowRecordBuilder:
+    """Accumulates record dicts column by column and emits Arrow record batches.
+
+    Records are plain dicts shaped like AccidentRecord.model_dump() (victims as
+    a list of dicts); no per-record model objects are created.
+    """
+
+    def __init__(self, schema: pa.Schema = RECORD_SCHEMA):
+        self.schema = schema
+        self.names = schema.names
+        self.columns = [[] for _ in self.names]
+
+    def __len__(self):
+        return len(self.columns[0])
+
+    def append(self, rec: dict):
+        for col, name in zip(self.columns, self.names):
+            col.append(rec[name])
+
+    def to_batch(self) -> pa.RecordBatch:
+        """Build a batch from everything appended so far and reset the builder."""
+        arrays = [pa.array(col, type=f.type) for col, f in zip(self.columns, self.schema)]
+        self.columns = [[] for _ in self.names]
+        return pa.record_batch(arrays, schema=self.schema)
+
+class ParquetRecordWriter:
+    """Streams record dicts into a Parquet file, one row group per ROW_GROUP_SIZE rows.
+
+    validate: "all" checks every record with the pydantic model, "sample"
+    every SAMPLE_EVERY-th one, "none" skips validation entirely.
+    """
+
+    def __init__(self, path: str, schema: pa.Schema = RECORD_SCHEMA,
+                 row_group_size: int = ROW_GROUP_SIZE, validate: str = "sample",
+                 model=AccidentRecord, compression: str = "snappy"):
+        if validate not in ("all", "sample", "none"):
+            raise ValueError(f"validate must be 'all', 'sample' or 'none', not {validate!r}")
+        Path(os.path.dirname(path) or ".").mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.row_group_size = row_group_size
+        self.validate = validate
+        self.model = model
+        self.builder = ArrowRecordBuilder(schema)
+        self.writer = pq.ParquetWriter(path, schema, compression=compression)
+        self.rows = 0
+
+    def write(self, rec: dict):
+        if self.validate == "all" or (self.validate == "sample" and self.rows % SAMPLE_EVERY == 0):
+            self.model.model_validate(rec)
+        self.builder.append(rec)
+        self.rows += 1
+        if len(self.builder) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if len(self.builder):
+            self.writer.write_batch(self.builder.to_batch(), row_group_size=self.row_group_size)
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def write_records_parquet(records, path: str, **kwargs) -> int:
+    """Write an iterable of record dicts to path; returns the row count."""
+    with ParquetRecordWriter(path, **kwargs) as w:
+        for rec in records:
+            w.write(rec)
+    return w.rows
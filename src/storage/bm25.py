@@ -0,0 +1,195 @@
+# src/storage/bm25.py
+import os
+import re
+from collections import Counter
+import numpy as np
+
+# Written next to the vector index (build_state.json's directory)
+BM25_FILE = "bm25.npz"
+
+# Metadata searched in addition to the document text: record_to_text leaves
+# these out, but users look records up by them
+LEXICAL_FIELDS = ("owner", "code")
+
+K1, B = 1.2, 0.75
+
+# Multi-term queries score the documents of their rarest terms first and stop
+# once the other terms can't lift anything else into the top k; past this
+# share of the corpus in candidates, one dense pass is cheaper
+CANDIDATE_SHARE = 0.25
+
+TOKEN = re.compile(r"\w+")
+
+def tokenize(text: str) -> list:
+    """Lower-cased word tokens; codes like "0111" and dates stay whole."""
+    return TOKEN.findall(text.lower())
+
+def lexical_text(doc) -> str:
+    extra = [str(doc.metadata[f]) for f in LEXICAL_FIELDS if doc.metadata.get(f) not in (None, "")]
+    return "\n".join([doc.page_content] + extra)
+
+def _blob(strings) -> np.ndarray:
+    # Newline-joined UTF-8; ids and \w+ terms never contain a newline
+    return np.frombuffer("\n".join(strings).encode("utf-8"), dtype=np.uint8)
+
+def _unblob(blob: np.ndarray) -> list:
+    return blob.tobytes().decode("utf-8").split("\n") if len(blob) else []
+
+class BM25Index:
+    """Okapi BM25 over an inverted index held in flat NumPy arrays.
+
+    Postings are stored term by term (CSR): the postings of term t are
+    post_doc / post_tf[term_ptr[t]:term_ptr[t + 1]], sorted by document.
+    The BM25 weight of every posting is computed once on load, so a query
+    only adds up the postings of its terms. Queries mixing rare tokens
+    (mine and owner names, codes) with common ones ("mine", "ltd") only
+    score the documents holding the rare ones, unless the common terms'
+    largest weights could still change the top k (max-score pruning).
+    """
+
+    def __init__(self, ids, terms, term_ptr, post_doc, post_tf, doc_len, k1: float = K1, b: float = B):
+        self.ids = list(ids)
+        self.terms = list(terms)
+        self.vocab = {t: i for i, t in enumerate(self.terms)}
+        self.term_ptr = np.asarray(term_ptr, dtype=np.int64)
+        self.post_doc = np.asarray(post_doc, dtype=np.int32)
+        self.post_tf = np.asarray(post_tf, dtype=np.uint16)
+        self.doc_len = np.asarray(doc_len, dtype=np.int32)
+
+        n = len(self.ids)
+        df = np.diff(self.term_ptr)
+        idf = np.log1p((n - df + 0.5) / (df + 0.5))
+        tf = self.post_tf.astype(np.float32)
+        avg = self.doc_len.mean() if n else 1.0
+        norm = k1 * (1 - b + b * self.doc_len[self.post_doc] / avg)
+        self._weights = (np.repeat(idf, df) * tf * (k1 + 1) / (tf + norm)).astype(np.float32)
+        self._max_weight = (np.maximum.reduceat(self._weights, self.term_ptr[:-1])
+                            if len(self._weights) else np.zeros(len(self.terms), np.float32))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _postings(self, t):
+        span = slice(self.term_ptr[t], self.term_ptr[t + 1])
+        return self.post_doc[span], self._weights[span]
+
+    def _score(self, docs, terms):
+        # BM25 of the given (sorted) documents over terms, in float32 and in
+        # the order of terms, as the dense pass adds them up
+        scores = np.zeros(len(docs), dtype=np.float32)
+        for t in terms:
+            post, weights = self._postings(t)
+            pos = np.minimum(np.searchsorted(post, docs), len(post) - 1)
+            scores += np.where(post[pos] == docs, weights[pos], np.float32(0))
+        return scores
+
+    def search(self, query: str, k: int = 5) -> list:
+        """(id, BM25 score) of the k best documents containing any query term, best first."""
+        terms = [t for t in (self.vocab.get(tok) for tok in set(tokenize(query))) if t is not None]
+        if not terms or k <= 0:
+            return []
+        terms.sort(key=lambda t: (self.term_ptr[t + 1] - self.term_ptr[t], t))
+        if len(terms) == 1:
+            docs, scores = self._postings(terms[0])
+        else:
+            docs = scores = None
+            # Best score a document outside the postings of terms[:p] can reach
+            rest = np.cumsum(self._max_weight[terms][::-1])[::-1]
+            cand = self._postings(terms[0])[0]
+            for p in range(1, len(terms)):
+                if p > 1:
+                    # Posting lists are sorted and distinct: merge, then drop repeats
+                    cand = np.concatenate([cand, self._postings(terms[p - 1])[0]])
+                    cand.sort()
+                    cand = cand[np.r_[True, cand[1:] != cand[:-1]]]
+                if len(cand) > CANDIDATE_SHARE * len(self.ids):
+                    break
+                if len(cand) < k:
+                    continue
+                cand_scores = self._score(cand, terms)
+                if np.partition(cand_scores, len(cand) - k)[len(cand) - k] > rest[p]:
+                    docs, scores = cand, cand_scores
+                    break
+            if docs is None:
+                # A document appears once per posting list, so += on fancy indexes is exact
+                acc = np.zeros(len(self.ids), dtype=np.float32)
+                for t in terms:
+                    post, weights = self._postings(t)
+                    acc[post] += weights
+                docs = np.flatnonzero(acc)
+                scores = acc[docs]
+        # Ties go to the earlier document
+        if k < len(scores):
+            top = np.flatnonzero(scores >= np.partition(scores, len(scores) - k)[len(scores) - k])
+        else:
+            top = np.arange(len(scores))
+        top = top[np.lexsort((docs[top], -scores[top]))][:k]
+        return [(self.ids[docs[i]], float(scores[i])) for i in top]
+
+    def save(self, index_dir: str):
+        """Write index_dir/bm25.npz (write-then-rename)."""
+        path = os.path.join(index_dir, BM25_FILE)
+        with open(path + ".tmp", "wb") as f:
+            np.savez(f, ids=_blob(self.ids), terms=_blob(self.terms), term_ptr=self.term_ptr,
+                     post_doc=self.post_doc, post_tf=self.post_tf, doc_len=self.doc_len)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, index_dir: str) -> "BM25Index":
+        """The index saved in index_dir; FileNotFoundError if there is none."""
+        path = os.path.join(index_dir, BM25_FILE)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"no BM25 index at {path}; rebuild the index with scripts/03_build_index.py")
+        with np.load(path) as z:
+            return cls(_unblob(z["ids"]), _unblob(z["terms"]), z["term_ptr"], z["post_doc"],
+                       z["post_tf"], z["doc_len"])
+
+class BM25Builder:
+    """Collects documents for a BM25Index, optionally on top of an existing one.
+
+    Documents added with the ID of a document in base replace it; build()
+    keeps the rest of base unless told not to (a full rebuild).
+    """
+
+    def __init__(self, base: BM25Index = None):
+        self.base = base
+        self.vocab = dict(base.vocab) if base is not None else {}
+        self.ids = []
+        self._doc, self._term, self._tf, self._len = [], [], [], []
+
+    def add(self, ids, texts):
+        for id_, text in zip(ids, texts):
+            counts = Counter(tokenize(text))
+            self._doc.extend([len(self.ids)] * len(counts))
+            self._term.extend(self.vocab.setdefault(t, len(self.vocab)) for t in counts)
+            self._tf.extend(counts.values())
+            self._len.append(sum(counts.values()))
+            self.ids.append(id_)
+
+    def build(self, keep_base: bool = True) -> BM25Index:
+        ids = list(self.ids)
+        doc = np.array(self._doc, dtype=np.int64)
+        term = np.array(self._term, dtype=np.int64)
+        tf = np.minimum(np.array(self._tf, dtype=np.int64), np.iinfo(np.uint16).max)
+        lens = np.array(self._len, dtype=np.int32)
+
+        base = self.base
+        if base is not None and keep_base and len(base):
+            added = set(ids)
+            keep = np.array([i not in added for i in base.ids], dtype=bool)
+            renumber = np.cumsum(keep) - 1 + len(ids)
+            sel = keep[base.post_doc]
+            # Base term numbers are the first entries of self.vocab
+            base_term = np.repeat(np.arange(len(base.terms)), np.diff(base.term_ptr))
+            doc = np.concatenate([doc, renumber[base.post_doc[sel]]])
+            term = np.concatenate([term, base_term[sel]])
+            tf = np.concatenate([tf, base.post_tf[sel]])
+            lens = np.concatenate([lens, base.doc_len[keep]])
+            ids += [i for i, k in zip(base.ids, keep) if k]
+
+        # Drop terms left without postings, then order postings by (term, doc)
+        used, term = np.unique(term, return_inverse=True)
+        order = np.lexsort((doc, term))
+        term_ptr = np.concatenate([[0], np.cumsum(np.bincount(term, minlength=len(used)))])
+        words = list(self.vocab)
+        return BM25Index(ids, [words[u] for u in used], term_ptr, doc[order], tf[order], lens)
@@ -0,0 +1,106 @@
+# src/storage/dataset.py
+import shutil
+from pathlib import Path
+from urllib.parse import quote
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Records of every volume, hive-partitioned: year=2015/volume=.../state=.../
+DATASET_DIR = "data/processed/accidents"
+
+PARTITION_SCHEMA = pa.schema([
+    ("year", pa.int16()),
+    ("volume", pa.string()),
+    ("state", pa.string()),     # missing states land in __HIVE_DEFAULT_PARTITION__
+])
+PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+
+# Rows per row group inside each partition file. Small, so that min/max
+# statistics on persons_killed can rule out part of a file.
+ROW_GROUP_SIZE = 4096
+
+def volume_name(source_doc: str) -> str:
+    """'VOLUME_II_NON_COAL_2015.pdf' → 'VOLUME_II_NON_COAL_2015'."""
+    return Path(source_doc).stem
+
+def _volume_dir(root: str, year: int, volume: str) -> Path:
+    return Path(root) / f"year={year}" / f"volume={quote(volume, safe='')}"
+
+def write_volume(records, root: str = DATASET_DIR, year: int = None, volume: str = None,
+                 row_group_size: int = ROW_GROUP_SIZE) -> int:
+    """Add one volume's records (table or Parquet path) to the dataset; returns rows written.
+
+    Partitions of other volumes and years are left untouched, so adding a year
+    only adds directories. Re-writing a volume replaces all of its partitions.
+    Rows are sorted by persons_killed within each partition, which keeps that
+    column's row-group statistics tight.
+    """
+    table = pq.read_table(records) if isinstance(records, (str, Path)) else records
+    table = table.replace_schema_metadata(None)     # stale pandas metadata
+    if volume is None:
+        docs = pc.unique(table.column("source_doc")).to_pylist() if table.num_rows else []
+        if len(docs) != 1:
+            raise ValueError(f"records come from {len(docs)} source documents; pass volume=")
+        volume = volume_name(docs[0])
+    if year is None:
+        raise ValueError("year is required")
+
+    # Stable identity of each row (volume + position in the records given), and
+    # the duplicate verdict, null until postprocess.mark_dataset_duplicates runs
+    if "record_id" not in table.column_names:
+        table = table.append_column("record_id", pa.array(
+            [f"{volume}/{i}" for i in range(table.num_rows)], pa.string()))
+    if "duplicate_of" not in table.column_names:
+        table = table.append_column("duplicate_of", pa.nulls(table.num_rows, pa.string()))
+
+    table = table.append_column("year", pa.array([year] * table.num_rows, pa.int16()))
+    table = table.append_column("volume", pa.array([volume] * table.num_rows, pa.string()))
+    if "persons_killed" in table.column_names:
+        table = table.sort_by("persons_killed")
+
+    shutil.rmtree(_volume_dir(root, year, volume), ignore_errors=True)
+    ds.write_dataset(
+        table, root, format="parquet", partitioning=PARTITIONING,
+        basename_template="part-{i}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        max_rows_per_group=row_group_size, min_rows_per_group=min(row_group_size, 1024),
+    )
+    return table.num_rows
+
+def open_dataset(root: str = DATASET_DIR) -> ds.Dataset:
+    """The whole dataset, lazily; scan with .to_table(filter=...) or .to_batches(...).
+
+    Volumes written before a column existed (e.g. record_id) read it as null.
+    """
+    dataset = ds.dataset(root, format="parquet", partitioning=PARTITIONING)
+    schema = pa.unify_schemas([dataset.schema] + [f.physical_schema for f in dataset.get_fragments()])
+    if schema == dataset.schema:
+        return dataset
+    return ds.dataset(root, schema=schema, format="parquet", partitioning=PARTITIONING)
+
+def read_volume(root: str, year: int, volume: str) -> pa.Table:
+    """One volume's records as write_volume takes them (without the year/volume columns)."""
+    table = open_dataset(root).to_table(filter=(ds.field("year") == year) & (ds.field("volume") == volume))
+    return table.drop_columns(["year", "volume"])
+
+def read_dataset(root: str = DATASET_DIR, columns=None, filters=None) -> pa.Table:
+    """Only the slices matching filters, e.g. [("year", "=", 2015), ("persons_killed", ">=", 3)].
+
+    Filters on year/volume/state skip whole directories; filters on other
+    columns skip row groups whose min/max statistics rule them out. filters
+    is in pyarrow.parquet form (list of tuples, or list of lists for OR) or a
+    pyarrow.compute expression.
+    """
+    expr = filters if filters is None or isinstance(filters, pc.Expression) else pq.filters_to_expression(filters)
+    return open_dataset(root).to_table(columns=columns, filter=expr)
+
+def partitions(root: str = DATASET_DIR) -> list:
+    """(year, volume, state) of every partition file, for listing what is stored."""
+    dataset = open_dataset(root)
+    out = []
+    for fragment in dataset.get_fragments():
+        keys = ds.get_partition_keys(fragment.partition_expression)
+        out.append((keys.get("year"), keys.get("volume"), keys.get("state")))
+    return sorted(set(out), key=lambda k: tuple((v is None, v) for v in k))
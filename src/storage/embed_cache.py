@@ -0,0 +1,163 @@
+# src/storage/embed_cache.py
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+import numpy as np
+
+CACHE_DIR = "data/cache/embeddings"
+
+# Bump when the key derivation or file layout changes (older caches are dropped)
+CACHE_VERSION = 1
+
+KEY_SIZE = 16                   # bytes of blake2b per key
+VECTORS_FILE = "vectors.f32"    # row-major float32, one row per key
+KEYS_FILE = "keys.bin"          # KEY_SIZE bytes per row, same order
+META_FILE = "meta.json"
+
+def normalize_text(text: str) -> str:
+    # Whitespace differences (PDF line wraps) don't change what is embedded
+    return " ".join(text.split())
+
+def text_key(model_name: str, text: str) -> bytes:
+    return hashlib.blake2b(f"{model_name}\0{normalize_text(text)}".encode("utf-8"),
+                           digest_size=KEY_SIZE).digest()
+
+class EmbeddingCache:
+    """On-disk vectors of every text embedded before, keyed by (model, normalized text).
+
+    Each model has its own directory with an append-only float32 matrix
+    (memory-mapped for reads) and a parallel file of 16-byte keys; the
+    key → row map is rebuilt from the keys file on open. Rows looked up, kept
+    or added since opening count as used, and compact() drops every other row,
+    so after a full build the cache holds only vectors of current records.
+    """
+
+    def __init__(self, model_name: str, cache_dir: str = CACHE_DIR):
+        self.model_name = model_name
+        self.dir = Path(cache_dir) / re.sub(r"[^A-Za-z0-9._-]+", "__", model_name)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.dim = None
+        meta = self._read_meta()
+        if meta.get("version") == CACHE_VERSION and meta.get("model") == model_name:
+            self.dim = meta.get("dim")
+        else:
+            self._reset()
+
+        keys = (self.dir / KEYS_FILE).read_bytes() if (self.dir / KEYS_FILE).exists() else b""
+        rows = len(keys) // KEY_SIZE
+        if self.dim:
+            # A crash between the two appends leaves one file longer; trust the shorter
+            rows = min(rows, os.path.getsize(self.dir / VECTORS_FILE) // (4 * self.dim))
+        self.rows = {keys[i * KEY_SIZE:(i + 1) * KEY_SIZE]: i for i in range(rows)}
+        self._truncate(rows)
+        self.used = set()
+        self._matrix = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._matrix = None
+
+    def _read_meta(self) -> dict:
+        try:
+            return json.loads((self.dir / META_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self):
+        meta = {"version": CACHE_VERSION, "model": self.model_name, "dim": self.dim}
+        (self.dir / META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+
+    def _reset(self):
+        for name in (VECTORS_FILE, KEYS_FILE, META_FILE):
+            (self.dir / name).unlink(missing_ok=True)
+        self.dim = None
+
+    def _truncate(self, rows: int):
+        if self.dim is None:
+            return
+        for name, size in ((KEYS_FILE, KEY_SIZE), (VECTORS_FILE, 4 * self.dim)):
+            with open(self.dir / name, "ab") as f:
+                f.truncate(rows * size)
+
+    def matrix(self) -> np.ndarray:
+        """All cached vectors as a read-only memory map (rows in key-file order)."""
+        if self._matrix is None or len(self._matrix) != len(self.rows):
+            if not self.rows:
+                return np.empty((0, self.dim or 0), np.float32)
+            self._matrix = np.memmap(self.dir / VECTORS_FILE, dtype=np.float32, mode="r",
+                                     shape=(len(self.rows), self.dim))
+        return self._matrix
+
+    def lookup(self, texts):
+        """(vectors, missing): cached rows for texts, and the positions that have none.
+
+        vectors has a row per text; rows at missing positions are zeros.
+        """
+        keys = [text_key(self.model_name, t) for t in texts]
+        rows = [self.rows.get(k, -1) for k in keys]
+        self.used.update(r for r in rows if r >= 0)
+        missing = [i for i, r in enumerate(rows) if r < 0]
+        out = np.zeros((len(keys), self.dim or 0), np.float32)
+        hit = np.array([i for i, r in enumerate(rows) if r >= 0], dtype=np.int64)
+        if len(hit):
+            out[hit] = self.matrix()[np.array([rows[i] for i in hit])]
+        return out, missing
+
+    def keep(self, texts):
+        """Mark texts as used without reading their vectors (they survive compact())."""
+        for t in texts:
+            row = self.rows.get(text_key(self.model_name, t))
+            if row is not None:
+                self.used.add(row)
+
+    def add(self, texts, vectors: np.ndarray):
+        """Append vectors for texts that aren't cached yet."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            self._write_meta()
+        new_keys, new_rows = [], []
+        for i, t in enumerate(texts):
+            k = text_key(self.model_name, t)
+            if k in self.rows:
+                self.used.add(self.rows[k])
+                continue
+            self.rows[k] = len(self.rows)
+            self.used.add(self.rows[k])
+            new_keys.append(k)
+            new_rows.append(i)
+        if not new_keys:
+            return
+        # Vectors first: a key is only valid once its vector is on disk
+        with open(self.dir / VECTORS_FILE, "ab") as f:
+            f.write(vectors[new_rows].tobytes())
+        with open(self.dir / KEYS_FILE, "ab") as f:
+            f.write(b"".join(new_keys))
+
+    def compact(self) -> int:
+        """Drop every row not looked up or added since opening; returns rows evicted."""
+        keep = sorted(self.used)
+        evicted = len(self.rows) - len(keep)
+        if not evicted:
+            return 0
+        by_row = {r: k for k, r in self.rows.items()}
+        vectors = np.array(self.matrix()[keep]) if keep else np.empty((0, self.dim or 0), np.float32)
+        keys = [by_row[r] for r in keep]
+        self._matrix = None
+        for name, data in ((VECTORS_FILE, vectors.tobytes()), (KEYS_FILE, b"".join(keys))):
+            tmp = self.dir / (name + ".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, self.dir / name)
+        self.rows = {k: i for i, k in enumerate(keys)}
+        self.used = set(range(len(keys)))
+        return evicted
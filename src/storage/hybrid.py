@@ -0,0 +1,69 @@
+# src/storage/hybrid.py
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from src.storage.bm25 import BM25Index
+
+# Reciprocal-rank fusion constant: a document at rank r of a list scores 1 / (RRF_K + r)
+RRF_K = 60
+
+def rrf(rankings, k: int = RRF_K) -> list:
+    """Keys of several best-first rankings, ordered by fused score (ties: first seen)."""
+    scores = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=scores.get, reverse=True)
+
+def _chroma_documents(ids, texts, metadatas) -> list:
+    return [Document(id=id_, page_content=text or "", metadata=meta or {})
+            for id_, text, meta in zip(ids, texts, metadatas)]
+
+def chroma_search(db, query: str, k: int) -> list:
+    """Top-k Documents of a langchain Chroma store, with their collection IDs set.
+
+    langchain_community's Chroma.similarity_search leaves Document.id empty, so
+    the collection is queried directly.
+    """
+    res = db._collection.query(query_embeddings=[db.embeddings.embed_query(query)], n_results=k,
+                               include=["documents", "metadatas"])
+    return _chroma_documents(res["ids"][0], res["documents"][0], res["metadatas"][0])
+
+def chroma_get(db, ids) -> list:
+    """Documents of a langchain Chroma store by ID (it has no get_by_ids)."""
+    res = db._collection.get(ids=list(ids), include=["documents", "metadatas"])
+    return _chroma_documents(res["ids"], res["documents"], res["metadatas"])
+
+class HybridRetriever(BaseRetriever):
+    """Dense similarity search and BM25 over the same documents, merged by reciprocal-rank fusion.
+
+    Each side returns fetch_k candidates. Fused hits that the dense search
+    didn't return as Documents are fetched from the vector store by ID
+    (get_by_ids; for Chroma, from its collection).
+    """
+
+    vectorstore: object
+    lexical: BM25Index
+    k: int = 5
+    fetch_k: int = 20
+    rrf_k: int = RRF_K
+
+    def _get_relevant_documents(self, query: str, *, run_manager=None) -> list:
+        store = self.vectorstore
+        chroma = hasattr(store, "_collection")
+        if hasattr(store, "search_ids"):
+            # NumpyVectorStore: only the fused top k are turned into Documents
+            dense, by_id = store.search_ids(query, self.fetch_k), {}
+        else:
+            if chroma:
+                docs = chroma_search(store, query, self.fetch_k)
+            else:
+                docs = store.similarity_search(query, k=self.fetch_k)
+            dense, by_id = [d.id for d in docs], {d.id: d for d in docs}
+        lexical = [id_ for id_, _ in self.lexical.search(query, self.fetch_k)]
+        fused = rrf([dense, lexical], self.rrf_k)[:self.k]
+
+        missing = [id_ for id_ in fused if id_ not in by_id]
+        if missing:
+            docs = chroma_get(store, missing) if chroma else store.get_by_ids(missing)
+            by_id.update((d.id, d) for d in docs)
+        return [by_id[id_] for id_ in fused if id_ in by_id]
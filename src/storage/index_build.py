@@ -0,0 +1,356 @@
+# src/storage/index_build.py
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import pyarrow.dataset as ds
+from langchain_core.documents import Document
+from src.storage.bm25 import BM25_FILE, BM25Builder, BM25Index, lexical_text
+from src.storage.dataset import DATASET_DIR, open_dataset
+from src.storage.table import documents_from_frame
+
+EMBED_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+INDEX_DIR = "indexes/accidents"
+
+# LangChain's default Chroma collection, which 04_chat_cli opens
+COLLECTION = "langchain"
+
+# Documents per encode task sent to a worker
+DOC_BATCH_SIZE = 256
+
+# sentence-transformers batch size inside one task
+ENCODE_BATCH_SIZE = 64
+
+# Vectors per Chroma upsert; progress is checkpointed after each one
+INSERT_CHUNK = 2048
+
+# Progress of the last build, next to the index
+STATE_FILE = "build_state.json"
+
+# Metadata that identifies a record within the corpus (with an occurrence
+# number for records that agree on all of them). year/volume come from the
+# dataset partitioning, so numbering never runs across volumes.
+ID_FIELDS = ("year", "volume", "source_doc", "page_span", "date", "time", "mine", "state")
+
+# Metadata key holding the hash of a document's text and other metadata
+CONTENT_HASH = "content_hash"
+
+_model = None   # per-process SentenceTransformer
+
+def _load_model(model_name: str, threads: int = None):
+    global _model
+    if _model is None:
+        import torch
+        from sentence_transformers import SentenceTransformer
+        if threads:
+            torch.set_num_threads(threads)
+        _model = SentenceTransformer(model_name, device="cpu")
+    return _model
+
+def encode_texts(texts, batch_size: int = ENCODE_BATCH_SIZE) -> np.ndarray:
+    """float32 (n, dim) vectors from this process's model; same vectors as HuggingFaceEmbeddings."""
+    return np.asarray(_model.encode(list(texts), batch_size=batch_size, show_progress_bar=False),
+                      dtype=np.float32)
+
+def _init_worker(model_name: str, threads: int):
+    _load_model(model_name, threads)
+
+def _digest(*parts) -> str:
+    return hashlib.blake2b(json.dumps(parts, sort_keys=True, default=str).encode("utf-8"),
+                           digest_size=16).hexdigest()
+
+def content_hash(text: str, metadata: dict) -> str:
+    """Hash of what is stored for a document; None values don't count (Chroma drops them)."""
+    return _digest(text, {k: v for k, v in metadata.items() if v is not None and k != CONTENT_HASH})
+
+def assign_ids(docs, counts: Counter):
+    """Deterministic IDs from ID_FIELDS, set on each Document's .id and returned.
+
+    counts carries occurrence numbers across calls, so pass the same Counter
+    for every batch of one stream.
+    """
+    ids = []
+    for d in docs:
+        key = _digest(*(d.metadata.get(f) for f in ID_FIELDS))
+        n = counts[key]
+        counts[key] += 1
+        d.id = f"{key}-{n}" if n else key
+        ids.append(d.id)
+    return ids
+
+class ChromaSink:
+    """Writes precomputed vectors into a persisted Chroma collection."""
+
+    def __init__(self, index_dir: str = INDEX_DIR, collection: str = COLLECTION, reset: bool = False):
+        import chromadb
+        Path(index_dir).mkdir(parents=True, exist_ok=True)
+        self.index_dir = index_dir
+        self.name = collection
+        self.client = chromadb.PersistentClient(path=index_dir)
+        names = self._names()
+        if reset and collection in names:
+            self.client.delete_collection(collection)
+        elif collection not in names and self._tmp_name() in names:
+            # compact() stopped between dropping the old collection and renaming the new one
+            self.client.get_collection(self._tmp_name()).modify(name=collection)
+        self.collection = self.client.get_or_create_collection(collection)
+
+    def _names(self):
+        return [getattr(c, "name", c) for c in self.client.list_collections()]
+
+    def _tmp_name(self):
+        return self.name + "__compact"
+
+    def existing(self) -> dict:
+        """ID → content hash (None if unknown) of everything in the collection."""
+        out = {}
+        for offset in range(0, self.collection.count(), INSERT_CHUNK):
+            got = self.collection.get(include=["metadatas"], limit=INSERT_CHUNK, offset=offset)
+            for id_, meta in zip(got["ids"], got["metadatas"]):
+                out[id_] = (meta or {}).get(CONTENT_HASH)
+        return out
+
+    def upsert(self, ids, vectors, texts, metadatas):
+        # Chroma rejects None metadata values; absent means the same to a filter
+        metadatas = [{k: v for k, v in m.items() if v is not None} for m in metadatas]
+        self.collection.upsert(ids=list(ids), embeddings=np.asarray(vectors).tolist(),
+                               documents=list(texts), metadatas=metadatas)
+
+    def delete(self, ids):
+        ids = list(ids)
+        for i in range(0, len(ids), INSERT_CHUNK):
+            self.collection.delete(ids=ids[i:i + INSERT_CHUNK])
+
+    def flush(self):
+        pass    # Chroma persists every write
+
+    def compact(self, log=print) -> dict:
+        """Rewrite the collection without duplicates, then VACUUM the SQLite file.
+
+        Indexes built before deterministic IDs hold one copy of every record
+        per run. Records are re-keyed with assign_ids and identical copies
+        (same ID fields and content) are kept once; the copy goes into a new
+        collection that replaces the old one, which also drops the deleted
+        entries still sitting in the HNSW segment.
+        """
+        before = self.collection.count()
+        if self._tmp_name() in self._names():
+            self.client.delete_collection(self._tmp_name())
+        tmp = self.client.create_collection(self._tmp_name(), metadata=self.collection.metadata)
+        counts, kept = Counter(), set()
+        for offset in range(0, before, INSERT_CHUNK):
+            got = self.collection.get(include=["embeddings", "documents", "metadatas"],
+                                      limit=INSERT_CHUNK, offset=offset)
+            docs, rows = [], []
+            for i, (text, meta) in enumerate(zip(got["documents"], got["metadatas"])):
+                doc = Document(page_content=text or "", metadata=dict(meta or {}))
+                h = content_hash(doc.page_content, doc.metadata)
+                key = (_digest(*(doc.metadata.get(f) for f in ID_FIELDS)), h)
+                if key in kept:
+                    continue
+                kept.add(key)
+                doc.metadata[CONTENT_HASH] = h
+                docs.append(doc)
+                rows.append(i)
+            if docs:
+                ids = assign_ids(docs, counts)
+                tmp.upsert(ids=ids, embeddings=np.asarray(got["embeddings"])[rows].tolist(),
+                           documents=[d.page_content for d in docs], metadatas=[d.metadata for d in docs])
+            log(f"[INFO] Compacting: {min(offset + INSERT_CHUNK, before)}/{before} read, {len(kept)} kept")
+
+        self.client.delete_collection(self.name)
+        tmp.modify(name=self.name)
+        self.collection = self.client.get_collection(self.name)
+
+        db = os.path.join(self.index_dir, "chroma.sqlite3")
+        size = os.path.getsize(db) if os.path.exists(db) else None
+        if size is not None:
+            with sqlite3.connect(db) as conn:
+                conn.execute("VACUUM")
+        return {"before": before, "after": self.collection.count(), "sqlite_bytes_before": size,
+                "sqlite_bytes_after": os.path.getsize(db) if size is not None else None}
+
+def dataset_documents(root: str = DATASET_DIR, filter=None, batch_size: int = DOC_BATCH_SIZE):
+    """(row count, generator of Document lists) streamed from the partitioned dataset.
+
+    Records marked as near-duplicates (duplicate_of set) are left out.
+    """
+    dataset = open_dataset(root)
+    if "duplicate_of" in dataset.schema.names:
+        originals = ds.field("duplicate_of").is_null()
+        filter = originals if filter is None else filter & originals
+    total = dataset.count_rows(filter=filter)
+    batches = (documents_from_frame(b.to_pandas())
+               for b in dataset.to_batches(filter=filter, batch_size=batch_size) if b.num_rows)
+    return total, batches
+
+def _read_state(index_dir: str) -> dict:
+    try:
+        with open(os.path.join(index_dir, STATE_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_state(index_dir: str, state: dict):
+    # Write-then-rename, so a crash never leaves a half-written state file
+    path = os.path.join(index_dir, STATE_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+def _encoded(batches, model_name: str, workers: int, cache=None):
+    # (docs, vectors, number encoded) per batch, in input order. Only texts
+    # missing from cache are encoded; the model (or pool) is only started on
+    # the first miss, and at most 2 tasks per worker are in flight.
+    pool = None
+    pending = deque()
+
+    def submit(texts):
+        nonlocal pool
+        if workers <= 1:
+            _load_model(model_name)
+            return encode_texts(texts)
+        if pool is None:
+            threads = max(1, (os.cpu_count() or 1) // workers)
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(model_name, threads))
+        return pool.submit(encode_texts, texts)
+
+    def finish(docs, texts, cached, missing, result):
+        if not missing:
+            return docs, cached, 0
+        encoded = result.result() if isinstance(result, Future) else result
+        if cache is not None:
+            cache.add([texts[i] for i in missing], encoded)
+        if len(missing) == len(texts):
+            return docs, encoded, len(missing)
+        cached[missing] = encoded
+        return docs, cached, len(missing)
+
+    try:
+        for docs in batches:
+            texts = [d.page_content for d in docs]
+            if cache is not None:
+                cached, missing = cache.lookup(texts)
+            else:
+                cached, missing = None, list(range(len(texts)))
+            result = submit([texts[i] for i in missing]) if missing else None
+            pending.append((docs, texts, cached, missing, result))
+            while len(pending) >= 2 * workers:
+                yield finish(*pending.popleft())
+        while pending:
+            yield finish(*pending.popleft())
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+def build_index(batches, total: int, index_dir: str = INDEX_DIR, model_name: str = EMBED_MODEL,
+                workers: int = 1, insert_chunk: int = INSERT_CHUNK, full: bool = True,
+                sink=None, cache=None, lexical: bool = True, log=print) -> dict:
+    """Bring the index in line with a stream of Document lists, in bounded chunks.
+
+    Documents get deterministic IDs (assign_ids) and a content hash in their
+    metadata. Documents whose ID already holds the same hash are skipped
+    without encoding; new and changed ones are embedded and upserted. An
+    interrupted build therefore resumes by simply running again. With
+    full=True the stream is taken to be every current record: IDs in the
+    index that it didn't produce are deleted, and cache entries it didn't
+    use are evicted. Pass full=False for filtered (e.g. one year) builds.
+
+    workers > 1 encodes batches in a process pool (None = every core), each
+    worker loading the model once. cache (an EmbeddingCache for model_name)
+    supplies vectors of texts embedded before. sink is a ChromaSink (the
+    default) or anything with the same existing/upsert/delete/flush methods,
+    e.g. src.storage.vectorstore.NumpyVectorStore. Progress is logged with
+    docs/s after every upsert and kept in index_dir/build_state.json.
+    Returns the final state.
+
+    With lexical=True every document streamed, changed or not, also goes into
+    a BM25 index saved as index_dir/bm25.npz when the build completes; a
+    filtered build replaces only the documents it saw.
+    """
+    workers = workers or os.cpu_count() or 1
+    sink = ChromaSink(index_dir) if sink is None else sink
+    Path(index_dir).mkdir(parents=True, exist_ok=True)
+
+    existing = sink.existing()
+    state = {"model": model_name, "total": total, "indexed": len(existing), "checked": 0,
+             "unchanged": 0, "upserted": 0, "encoded": 0, "deleted": 0, "complete": False}
+    _write_state(index_dir, state)
+    t0 = time.perf_counter()
+    seen, counts = set(), Counter()
+    bm25 = None
+    if lexical:
+        # The first build (or one over an index from before bm25.npz) starts from nothing
+        has_base = not full and os.path.exists(os.path.join(index_dir, BM25_FILE))
+        bm25 = BM25Builder(BM25Index.load(index_dir) if has_base else None)
+
+    def changed(batches):
+        # Only documents that are new or differ from what the index holds
+        for docs in batches:
+            state["checked"] += len(docs)
+            out, same = [], []
+            ids = assign_ids(docs, counts)
+            if bm25 is not None:
+                bm25.add(ids, [lexical_text(d) for d in docs])
+            for d, id_ in zip(docs, ids):
+                seen.add(id_)
+                h = content_hash(d.page_content, d.metadata)
+                if existing.get(id_) == h:
+                    same.append(d.page_content)
+                    continue
+                d.metadata[CONTENT_HASH] = h
+                out.append(d)
+            state["unchanged"] += len(same)
+            if cache is not None:
+                cache.keep(same)
+            if out:
+                yield out
+
+    buf_docs, buf_vecs = [], []
+
+    def flush():
+        vectors = np.concatenate(buf_vecs)
+        sink.upsert([d.id for d in buf_docs], vectors, [d.page_content for d in buf_docs],
+                    [d.metadata for d in buf_docs])
+        state["upserted"] += len(buf_docs)
+        _write_state(index_dir, state)
+        rate = state["checked"] / max(time.perf_counter() - t0, 1e-9)
+        log(f"[INFO] {state['checked']}/{total} documents checked, {state['upserted']} upserted "
+            f"({state['encoded']} encoded) | {rate:.1f} docs/s")
+        buf_docs.clear()
+        buf_vecs.clear()
+
+    for docs, vectors, n_encoded in _encoded(changed(batches), model_name, workers, cache):
+        state["encoded"] += n_encoded
+        buf_docs.extend(docs)
+        buf_vecs.append(vectors)
+        if len(buf_docs) >= insert_chunk:
+            flush()
+    if buf_docs:
+        flush()
+
+    if full:
+        vanished = sorted(set(existing) - seen)
+        sink.delete(vanished)
+        state["deleted"] = len(vanished)
+        if cache is not None:
+            state["evicted"] = cache.compact()
+        log(f"[INFO] Deleted {state['deleted']} vanished documents"
+            + (f", evicted {state['evicted']} unused cached embeddings" if cache is not None else ""))
+
+    sink.flush()
+    if bm25 is not None:
+        index = bm25.build(keep_base=not full)
+        index.save(index_dir)
+        state["lexical_terms"] = len(index.terms)
+    elapsed = time.perf_counter() - t0
+    state.update(complete=True, seconds=round(elapsed, 3),
+                 docs_per_sec=round(state["checked"] / elapsed, 2) if elapsed else None)
+    _write_state(index_dir, state)
+    return state
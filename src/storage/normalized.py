@@ -0,0 +1,112 @@
+# src/storage/normalized.py
+import os
+from pathlib import Path
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# Normalized layout: one row per accident, one row per victim keyed by
+# accident_id, so victim questions are column scans instead of walking
+# nested Python objects.
+ACCIDENTS_FILE = "accidents.parquet"
+VICTIMS_FILE = "victims.parquet"
+
+VICTIMS_SCHEMA = pa.schema([
+    ("accident_id", pa.int64()),
+    ("victim_no", pa.int16()),                       # 1-based order within the accident
+    ("name", pa.string()),
+    ("role", pa.dictionary(pa.int32(), pa.string())),
+    ("gender", pa.dictionary(pa.int8(), pa.string())),
+    ("age", pa.int16()),
+])
+
+def split_victims(batch, first_id: int = 0):
+    """Split a nested record batch/table into (accidents, victims) tables.
+
+    accident_id is the row's position in the nested dataset (first_id + row);
+    the victims column is dropped from accidents and flattened into victims.
+    """
+    table = batch if isinstance(batch, pa.Table) else pa.Table.from_batches([batch])
+    table = table.combine_chunks()
+    ids = pa.array(range(first_id, first_id + table.num_rows), pa.int64())
+
+    nested = table.column("victims").chunk(0) if table.num_rows else pa.array([], table.schema.field("victims").type)
+    flat = pc.list_flatten(nested)
+    parents = pc.list_parent_indices(nested)
+
+    # Ordinal within each accident: position in the flattened array minus the
+    # offset of its parent list (offsets of a sliced array don't start at 0)
+    starts = pc.subtract(pc.take(nested.offsets, parents), nested.offsets[0])
+    victim_no = pc.add(pc.subtract(pa.array(range(len(flat)), pa.int64()), starts), 1)
+
+    def field(name):
+        return flat.field(name) if len(flat) else pa.array([], flat.type.field(name).type)
+
+    victims = pa.table([
+        pc.take(ids, parents),
+        victim_no.cast(pa.int16()),
+        field("name"),
+        pc.utf8_trim_whitespace(field("role")).dictionary_encode(),
+        pc.utf8_capitalize(pc.utf8_trim_whitespace(field("gender"))).dictionary_encode()
+            .cast(VICTIMS_SCHEMA.field("gender").type),
+        field("age").cast(pa.int16()),
+    ], schema=VICTIMS_SCHEMA)
+
+    accidents = table.drop_columns(["victims"]).add_column(0, "accident_id", ids)
+    return accidents, victims
+
+def write_normalized(nested_path: str, out_dir: str, batch_size: int = 8192,
+                     transform=None) -> dict:
+    """Stream a nested records Parquet (02_extract output) into accidents/victims files.
+
+    Reads one row group batch at a time; returns row counts per table.
+    transform(table) -> table, if given, is applied to both tables of every
+    batch before writing (e.g. src.extraction.postprocess.normalize_table).
+    """
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    src = pq.ParquetFile(nested_path)
+    acc_writer = vic_writer = None
+    n_acc = n_vic = 0
+    try:
+        for batch in src.iter_batches(batch_size=batch_size):
+            accidents, victims = split_victims(batch, first_id=n_acc)
+            if transform is not None:
+                accidents, victims = transform(accidents), transform(victims)
+            if acc_writer is None:
+                acc_writer = pq.ParquetWriter(os.path.join(out_dir, ACCIDENTS_FILE), accidents.schema)
+                vic_writer = pq.ParquetWriter(os.path.join(out_dir, VICTIMS_FILE), victims.schema)
+            acc_writer.write_table(accidents)
+            vic_writer.write_table(victims)
+            n_acc += accidents.num_rows
+            n_vic += victims.num_rows
+    finally:
+        for w in (acc_writer, vic_writer):
+            if w is not None:
+                w.close()
+    return {"accidents": n_acc, "victims": n_vic}
+
+def read_accidents(out_dir: str, columns=None, filters=None) -> pa.Table:
+    return pq.read_table(os.path.join(out_dir, ACCIDENTS_FILE), columns=columns, filters=filters)
+
+def write_accidents(table: pa.Table, out_dir: str):
+    """Replace accidents.parquet, e.g. after adding table-wide columns such as duplicate_of."""
+    pq.write_table(table, os.path.join(out_dir, ACCIDENTS_FILE))
+
+def read_victims(out_dir: str, columns=None, filters=None) -> pa.Table:
+    """Victims table; e.g. filters=[("role", "=", "Driller")] prunes at read time."""
+    return pq.read_table(os.path.join(out_dir, VICTIMS_FILE), columns=columns, filters=filters)
+
+def join_victims(out_dir: str, accident_columns=("date", "mine", "state", "district"),
+                 victim_filters=None, victim_columns=None) -> pa.Table:
+    """One row per victim with the requested accident columns attached.
+
+    The join happens only when asked for; scans that need victim fields alone
+    (role, gender, age) should use read_victims directly.
+    """
+    victims = read_victims(out_dir, columns=victim_columns, filters=victim_filters)
+    if "accident_id" not in victims.column_names:
+        raise ValueError("victim_columns must include accident_id to join")
+    accidents = read_accidents(out_dir, columns=["accident_id", *accident_columns])
+    joined = victims.join(accidents, "accident_id", join_type="left outer")
+    order = [("accident_id", "ascending")] + ([("victim_no", "ascending")] if "victim_no" in joined.column_names else [])
+    return joined.sort_by(order)
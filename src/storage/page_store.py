@@ -0,0 +1,156 @@
+# src/storage/page_store.py
+import json
+import os
+from pathlib import Path
+import pyarrow as pa
+
+SCHEMA = pa.schema([("page", pa.int32()), ("text", pa.large_string())])
+
+# Pages per record batch: the unit of (de)compression and of random access
+BATCH_SIZE = 64
+
+# zstd keeps the store small; compression=None makes reads fully zero-copy
+# straight out of the memory map instead of decompressing one batch at a time
+DEFAULT_COMPRESSION = "zstd"
+
+class PageStoreWriter:
+    """Append {"page", "text"} dicts to an Arrow IPC page store, BATCH_SIZE at a time.
+
+    Pages must arrive in order and be consecutive (which every ingestion path
+    produces); that lets readers map a page number to its batch arithmetically.
+    """
+
+    def __init__(self, path: str, batch_size: int = BATCH_SIZE,
+                 compression: str = DEFAULT_COMPRESSION):
+        Path(os.path.dirname(path) or ".").mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self.schema = SCHEMA.with_metadata({"batch_size": str(batch_size)})
+        self.sink = pa.OSFile(path, "wb")
+        self.writer = pa.ipc.new_file(self.sink, self.schema,
+                                      options=pa.ipc.IpcWriteOptions(compression=compression))
+        self.first_page = None
+        self.next_page = None
+        self._pages, self._texts = [], []
+
+    def write(self, page: dict):
+        n = page["page"]
+        if self.next_page is not None and n != self.next_page:
+            raise ValueError(f"page store expects consecutive pages: got {n}, expected {self.next_page}")
+        if self.first_page is None:
+            self.first_page = n
+        self.next_page = n + 1
+        self._pages.append(n)
+        self._texts.append(page["text"])
+        if len(self._pages) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self._pages:
+            self.writer.write_batch(pa.record_batch(
+                [pa.array(self._pages, pa.int32()), pa.array(self._texts, pa.large_string())],
+                schema=self.schema))
+            self._pages, self._texts = [], []
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+        self.sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def write_page_store(pages, path: str, **kwargs) -> int:
+    """Write an iterable of {"page", "text"} dicts to path; returns the page count."""
+    n = 0
+    with PageStoreWriter(path, **kwargs) as w:
+        for p in pages:
+            w.write(p)
+            n += 1
+    return n
+
+class PageStore:
+    """Memory-mapped, read-only view of a page store written by PageStoreWriter.
+
+    page(n) touches only the batch holding page n; pages(a, b) returns an Arrow
+    table that slices the mapped batches without copying the text buffers.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.source = pa.memory_map(path, "r")
+        self.reader = pa.ipc.open_file(self.source)
+        self.batch_size = int(self.reader.schema.metadata[b"batch_size"])
+        self.n_batches = self.reader.num_record_batches
+        if self.n_batches:
+            self.first_page = self.reader.get_batch(0).column(0)[0].as_py()
+            last = self.reader.get_batch(self.n_batches - 1)
+            self.n_pages = (self.n_batches - 1) * self.batch_size + last.num_rows
+        else:
+            self.first_page, self.n_pages = 1, 0
+
+    def close(self):
+        self.source.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.n_pages
+
+    @property
+    def page_numbers(self):
+        return range(self.first_page, self.first_page + self.n_pages)
+
+    def _locate(self, n: int):
+        i = n - self.first_page
+        if not 0 <= i < self.n_pages:
+            raise IndexError(f"page {n} not in store (pages {self.first_page}..{self.first_page + self.n_pages - 1})")
+        return divmod(i, self.batch_size)
+
+    def page(self, n: int) -> str:
+        """Text of page n (1-based, as numbered by the PDF)."""
+        b, row = self._locate(n)
+        return self.reader.get_batch(b).column(1)[row].as_py()
+
+    def pages(self, start: int = None, stop: int = None) -> pa.Table:
+        """Pages start..stop-1 as an Arrow table (page, text), sliced without copying."""
+        start = self.first_page if start is None else max(start, self.first_page)
+        stop = self.first_page + self.n_pages if stop is None else min(stop, self.first_page + self.n_pages)
+        if stop <= start:
+            return SCHEMA.empty_table()
+        b0, r0 = self._locate(start)
+        b1, _ = self._locate(stop - 1)
+        batches = [self.reader.get_batch(b) for b in range(b0, b1 + 1)]
+        return pa.Table.from_batches(batches).slice(r0, stop - start)
+
+    def iter_pages(self, start: int = None, stop: int = None):
+        """Yield {"page", "text"} dicts (the JSONL row shape), one batch decoded at a time."""
+        start = self.first_page if start is None else start
+        stop = self.first_page + self.n_pages if stop is None else stop
+        for b in range(self.n_batches):
+            lo = self.first_page + b * self.batch_size
+            if lo + self.batch_size <= start or lo >= stop:
+                continue
+            batch = self.reader.get_batch(b)
+            for n, text in zip(batch.column(0).to_pylist(), batch.column(1).to_pylist()):
+                if start <= n < stop:
+                    yield {"page": n, "text": text}
+
+    def texts(self):
+        return [p["text"] for p in self.iter_pages()]
+
+    def to_jsonl(self, out_path: str, start: int = None, stop: int = None) -> int:
+        """Debug export in the data/interim/*_pages.jsonl format."""
+        n = 0
+        with open(out_path, "w", encoding="utf-8") as f:
+            for p in self.iter_pages(start, stop):
+                f.write(json.dumps(p, ensure_ascii=False) + "\n")
+                n += 1
+        return n
@@ -0,0 +1,56 @@
+# src/storage/quantize.py
+import numpy as np
+
+# Quantized forms of unit vectors that NumpyVectorStore can search
+QUANTIZATIONS = ("int8", "binary")
+
+# Rows converted back to float32 at a time when scoring int8 codes; small enough
+# that the converted block stays in cache for the matrix product
+SCORE_BLOCK = 512
+
+# Set bits per byte, for NumPy builds without np.bitwise_count (< 2.0)
+_POPCOUNT8 = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+def quantize_int8(vectors) -> tuple:
+    """(codes, scales): int8 rows with one float32 scale per row, x ≈ codes * scale.
+
+    A scale per vector (max |x| / 127) rather than per dimension, so rows can be
+    added without re-calibrating the others.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(vectors).max(axis=1, initial=0) / 127
+    scales[scales == 0] = 1
+    codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+def int8_scores(queries: np.ndarray, codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """Approximate dot products of float32 queries with int8 rows, (queries x rows)."""
+    out = np.empty((len(queries), len(codes)), np.float32)
+    for start in range(0, len(codes), SCORE_BLOCK):
+        block = slice(start, start + SCORE_BLOCK)
+        out[:, block] = (queries @ codes[block].astype(np.float32).T) * scales[block]
+    return out
+
+def pack_signs(vectors) -> np.ndarray:
+    """1 bit per dimension (x > 0), packed into uint8 rows of ceil(dim / 8) bytes."""
+    return np.packbits(np.asarray(vectors) > 0, axis=1)
+
+def _popcount_rows(x: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        if x.shape[1] % 8 == 0:
+            x = x.view(np.uint64)   # 8x fewer elements to count
+        return np.bitwise_count(x).sum(axis=1, dtype=np.int32)
+    return _POPCOUNT8[x].sum(axis=1, dtype=np.int32)
+
+def hamming_scores(queries: np.ndarray, bits: np.ndarray, dim: int) -> np.ndarray:
+    """1 - 2 * hamming / dim between the sign codes of queries and rows, (queries x rows).
+
+    This is the cosine of the two sign vectors, so it ranks like the float
+    cosine it approximates.
+    """
+    bits = np.ascontiguousarray(bits)
+    packed = pack_signs(queries)
+    out = np.empty((len(queries), len(bits)), np.float32)
+    for i, q in enumerate(packed):
+        out[i] = _popcount_rows(bits ^ q)
+    return 1 - 2 * out / dim
@@ -1,16 +1,35 @@
+import numpy as np
+import pandas as pd
 from langchain_core.documents import Document
 
-def record_to_text(record):
-    fields = [
-        f"Date: {record.get('date')}",
-        f"Mine: {record.get('mine')}",
-        f"Owner: {record.get('owner')}",
-        f"State: {record.get('state')}",
-        f"District: {record.get('district')}",
-        f"Persons Killed: {record.get('persons_killed')}",
-        f"Narrative: {record.get('narrative')}",
-    ]
-    return "\n".join([f for f in fields if f is not None])
+# (label, record key) pairs that make up the text embedded and put in prompts.
+# Prevention text is long boilerplate ("Had ... averted") so it is opt-in.
+TEXT_FIELDS = (
+    ("Date", "date"),
+    ("Mine", "mine"),
+    ("State", "state"),
+    ("District", "district"),
+    ("Cause", "cause"),
+    ("Persons Killed", "persons_killed"),
+    ("Narrative", "narrative"),
+)
+FULL_TEXT_FIELDS = TEXT_FIELDS + (("Owner", "owner"), ("Prevention", "prevention"))
+
+def record_to_text(record, fields=TEXT_FIELDS, max_chars=None):
+    """Compact "Label: value" projection of a record; empty fields are left out.
+
+    max_chars caps each value (e.g. long narratives) with a trailing "...".
+    """
+    lines = []
+    for label, key in fields:
+        value = record.get(key)
+        if value is None or value == "" or value != value:    # value != value: NaN
+            continue
+        value = str(value)
+        if max_chars and len(value) > max_chars:
+            value = value[:max_chars].rstrip() + "..."
+        lines.append(f"{label}: {value}")
+    return "\n".join(lines)
 
 def clean_metadata(meta: dict):
     simple_meta = {}
@@ -22,10 +41,57 @@ def clean_metadata(meta: dict):
             simple_meta[k] = str(v)  # fallback, convert complex to string
     return simple_meta
 
+# Rows per batch yielded by iter_documents
+DOC_BATCH_SIZE = 1024
+
+def texts_from_frame(df, fields=TEXT_FIELDS, max_chars=None):
+    """record_to_text for every row of df, built a column at a time."""
+    text = np.full(len(df), "", dtype=object)
+    for label, key in fields:
+        if key not in df.columns:
+            continue
+        values = df[key].to_numpy(dtype=object)
+        present = pd.notna(values) & (values != "")
+        if not present.any():
+            continue
+        strs = pd.Series(values[present], dtype=object).astype(str)
+        if max_chars:
+            long = (strs.str.len() > max_chars).to_numpy()
+            strs[long] = strs[long].str.slice(0, max_chars).str.rstrip() + "..."
+        text[present] += f"\n{label}: " + strs.to_numpy(dtype=object)
+    # Every piece starts with "\n"; drop the first one
+    return [t[1:] for t in text]
+
+def _metadata_column(col: pd.Series) -> list:
+    # clean_metadata for one column: numeric and boolean columns come out of
+    # tolist() as plain Python scalars already, only the rest is checked
+    values = col.tolist()
+    if col.dtype.kind in "biuf":
+        return values
+    return [v if isinstance(v, (str, int, float, bool)) or v is None else str(v) for v in values]
+
+def metadata_from_frame(df) -> list:
+    """clean_metadata(row.to_dict()) for every row of df, built a column at a time."""
+    names = list(df.columns)
+    columns = [_metadata_column(df[name]) for name in names]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+def documents_from_frame(df, fields=TEXT_FIELDS, max_chars=None) -> list:
+    texts = texts_from_frame(df, fields, max_chars)
+    return [Document(page_content=t, metadata=m) for t, m in zip(texts, metadata_from_frame(df))]
+
+def iter_documents(data, batch_size: int = DOC_BATCH_SIZE, fields=TEXT_FIELDS, max_chars=None):
+    """Yield lists of at most batch_size Documents from a DataFrame or Arrow table.
+
+    Arrow tables (e.g. src.storage.dataset.read_dataset) are converted to
+    pandas one batch at a time.
+    """
+    if hasattr(data, "to_batches"):
+        for batch in data.to_batches(max_chunksize=batch_size):
+            yield documents_from_frame(batch.to_pandas(), fields, max_chars)
+        return
+    for start in range(0, len(data), batch_size):
+        yield documents_from_frame(data.iloc[start:start + batch_size], fields, max_chars)
+
 def records_to_documents(df):
-    docs = []
-    for _, row in df.iterrows():
-        text = record_to_text(row)
-        meta = clean_metadata(row.to_dict())
-        docs.append(Document(page_content=text, metadata=meta))
-    return docs
+    return documents_from_frame(df)
@@ -0,0 +1,368 @@
+# src/storage/vectorstore.py
+import json
+import os
+from pathlib import Path
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+from src.storage.quantize import QUANTIZATIONS, hamming_scores, int8_scores, pack_signs, quantize_int8
+
+STORE_DIR = "indexes/accidents_np"
+
+VECTORS_FILE = "vectors.f32"    # row-major float32, unit length, one row per document
+ROWS_FILE = "rows.parquet"      # id, text and one column per metadata key, same order
+META_FILE = "store.json"
+
+# Quantized copies of vectors.f32, derived data written by flush() in a quantized store
+CODE_FILES = {
+    "int8": ("vectors.i8", "scales.f32"),   # int8 row codes, float32 scale per row
+    "binary": ("vectors.b1",),              # sign bits, ceil(dim / 8) bytes per row
+}
+
+# Queries scored per matrix product; bounds the (queries x documents) score block
+QUERY_BATCH = 64
+
+ID, TEXT = "id", "text"
+
+_OPS = {"$eq": pc.equal, "$ne": pc.not_equal, "$gt": pc.greater, "$gte": pc.greater_equal,
+        "$lt": pc.less, "$lte": pc.less_equal}
+
+def _unit(vectors) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+def _column(values) -> pa.Array:
+    # Metadata values are plain scalars; a key holding mixed types is stored as text
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array([None if v is None else str(v) for v in values], pa.string())
+
+def _top(scores: np.ndarray, k: int) -> np.ndarray:
+    # Positions of the k highest scores, best first (ties keep row order)
+    if k <= 0:
+        return np.empty(0, np.int64)
+    top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind="stable")]
+
+def _rows_table(ids, texts, metadatas) -> pa.Table:
+    keys = list(dict.fromkeys(k for m in metadatas for k in m if k not in (ID, TEXT)))
+    columns = {ID: pa.array(list(ids), pa.string()), TEXT: pa.array(list(texts), pa.string())}
+    for k in keys:
+        columns[k] = _column([m.get(k) for m in metadatas])
+    return pa.table(columns)
+
+class NumpyVectorStore(VectorStore):
+    """Exact cosine search over a memory-mapped float32 matrix, with columnar metadata.
+
+    A store is a directory: vectors.f32 (unit vectors, opened with np.memmap,
+    so start-up reads no vectors), rows.parquet (id, text and a column per
+    metadata key) and store.json. Search is one matrix product per batch of
+    up to QUERY_BATCH queries followed by argpartition; filters select rows
+    with Arrow compute on the metadata columns before scoring.
+
+    With quantization="int8" (4x smaller) or "binary" (32x smaller, scored
+    by Hamming distance) search runs on quantized codes held in RAM, and
+    vectors.f32 is only read for rescoring: with rescore=r the best k * r
+    rows by approximate score are re-ranked by exact cosine. Without
+    rescoring the returned scores are the approximate ones.
+
+    Writes (add_texts, upsert, delete) are staged in memory and written out
+    by flush(). The store also serves as a build_index sink, so
+    03_build_index can fill it in place of Chroma.
+    """
+
+    def __init__(self, path: str = STORE_DIR, embedding=None, quantization: str = None, rescore: int = 0):
+        if quantization is not None and quantization not in QUANTIZATIONS:
+            raise ValueError(f"quantization must be one of {QUANTIZATIONS}, not {quantization!r}")
+        self.path = path
+        self.quantization = quantization
+        self.rescore = rescore
+        self._embedding = embedding
+        self._segments = []     # [rows table, vectors, live mask]; the first may be memory-mapped
+        self._where = None      # id → (segment, row), built on first write or lookup
+        self._codes = None      # quantized vectors of the consolidated segment, built on first search
+        self._dirty = False
+        meta_path = os.path.join(path, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            rows = pq.read_table(os.path.join(path, ROWS_FILE))
+            vectors = (np.memmap(os.path.join(path, VECTORS_FILE), dtype=np.float32, mode="r",
+                                 shape=(meta["count"], meta["dim"]))
+                       if meta["count"] else np.empty((0, meta["dim"]), np.float32))
+            self._segments.append([rows, vectors, None])
+            if quantization:
+                self._codes = self._read_codes(meta["count"], meta["dim"])
+                self._dirty = self._codes is None   # so the next flush() writes them
+
+    @property
+    def embeddings(self):
+        return self._embedding
+
+    def __len__(self):
+        self._consolidate()
+        return self._segments[0][0].num_rows if self._segments else 0
+
+    # --- writes -----------------------------------------------------------
+
+    def _index(self) -> dict:
+        if self._where is None:
+            self._where = {}
+            for s, (rows, _, live) in enumerate(self._segments):
+                for r, id_ in enumerate(rows.column(ID).to_pylist()):
+                    if live is None or live[r]:
+                        self._where[id_] = (s, r)
+        return self._where
+
+    def _kill(self, id_):
+        s, r = self._where.pop(id_)
+        seg = self._segments[s]
+        if seg[2] is None:
+            seg[2] = np.ones(seg[0].num_rows, dtype=bool)
+        seg[2][r] = False
+
+    def upsert(self, ids, vectors, texts, metadatas):
+        """Insert documents, replacing any with the same IDs."""
+        ids, texts, metadatas = list(ids), list(texts), list(metadatas)
+        where = self._index()
+        for id_ in ids:
+            if id_ in where:
+                self._kill(id_)
+        # A repeated ID within one call keeps its last occurrence
+        last = {id_: i for i, id_ in enumerate(ids)}
+        keep = sorted(last.values())
+        rows = _rows_table([ids[i] for i in keep], [texts[i] for i in keep], [metadatas[i] for i in keep])
+        self._segments.append([rows, _unit(np.asarray(vectors)[keep]), None])
+        s = len(self._segments) - 1
+        for r, i in enumerate(keep):
+            where[ids[i]] = (s, r)
+        self._dirty = True
+
+    def add_texts(self, texts, metadatas=None, ids=None, **kwargs):
+        texts = list(texts)
+        if ids is None:
+            import uuid
+            ids = [str(uuid.uuid4()) for _ in texts]
+        metadatas = list(metadatas) if metadatas is not None else [{} for _ in texts]
+        self.upsert(ids, self._embedding.embed_documents(texts), texts, metadatas)
+        return list(ids)
+
+    def delete(self, ids=None, **kwargs):
+        where = self._index()
+        for id_ in ids or ():
+            if id_ in where:
+                self._kill(id_)
+                self._dirty = True
+        return True
+
+    def _consolidate(self):
+        # Merge segments into one, dropping dead rows; memory-mapped vectors
+        # are only copied when something changed
+        if len(self._segments) == 1 and self._segments[0][2] is None:
+            return
+        if not self._segments:
+            return
+        tables, vectors = [], []
+        for rows, vecs, live in self._segments:
+            if live is not None:
+                idx = np.flatnonzero(live)
+                rows, vecs = rows.take(pa.array(idx)), vecs[idx]
+            tables.append(rows)
+            vectors.append(np.asarray(vecs))
+        rows = pa.concat_tables(tables, promote_options="permissive")
+        self._segments = [[rows, np.concatenate(vectors) if vectors else vectors, None]]
+        self._where = None
+        self._codes = None
+
+    def _read_codes(self, count: int, dim: int):
+        # Codes flushed with the vectors, or None if missing (rebuilt on first search)
+        paths = [os.path.join(self.path, name) for name in CODE_FILES[self.quantization]]
+        if self.quantization == "int8":
+            sizes, dtypes, shapes = (count * dim, 4 * count), (np.int8, np.float32), ((count, dim), (count,))
+        else:
+            sizes, dtypes, shapes = ((dim + 7) // 8 * count,), (np.uint8,), ((count, (dim + 7) // 8),)
+        if not all(os.path.exists(p) and os.path.getsize(p) == n for p, n in zip(paths, sizes)):
+            return None
+        return tuple(np.fromfile(p, dtype=t).reshape(shape) for p, t, shape in zip(paths, dtypes, shapes))
+
+    def _quantized(self) -> tuple:
+        self._consolidate()
+        if self._codes is None:
+            vectors = self._segments[0][1]
+            self._codes = (quantize_int8(vectors) if self.quantization == "int8"
+                           else (pack_signs(vectors),))
+        return self._codes
+
+    def flush(self):
+        """Write staged changes to disk (whole files, replaced atomically)."""
+        self._consolidate()
+        if not self._segments or not self._dirty:
+            return
+        rows, vectors, _ = self._segments[0]
+        Path(self.path).mkdir(parents=True, exist_ok=True)
+        # Old codes are removed first and written last, so a crash can't leave stale ones
+        for names in CODE_FILES.values():
+            for name in names:
+                Path(self.path, name).unlink(missing_ok=True)
+        files = [(VECTORS_FILE, lambda p: np.ascontiguousarray(vectors, np.float32).tofile(p)),
+                 (ROWS_FILE, lambda p: pq.write_table(rows, p)),
+                 (META_FILE, lambda p: Path(p).write_text(json.dumps(
+                     {"count": rows.num_rows, "dim": int(vectors.shape[1])}), encoding="utf-8"))]
+        if self.quantization:
+            files += [(name, lambda p, c=c: np.ascontiguousarray(c).tofile(p))
+                      for name, c in zip(CODE_FILES[self.quantization], self._quantized())]
+        for name, write in files:
+            tmp = os.path.join(self.path, name + ".tmp")
+            write(tmp)
+            os.replace(tmp, os.path.join(self.path, name))
+        self._dirty = False
+
+    def existing(self) -> dict:
+        """ID → content hash of every document (for build_index)."""
+        self._consolidate()
+        if not self._segments:
+            return {}
+        rows = self._segments[0][0]
+        hashes = (rows.column("content_hash").to_pylist() if "content_hash" in rows.column_names
+                  else [None] * rows.num_rows)
+        return dict(zip(rows.column(ID).to_pylist(), hashes))
+
+    # --- reads ------------------------------------------------------------
+
+    def _mask(self, rows: pa.Table, where: dict):
+        """Boolean Arrow array for a Chroma-style filter: {"state": "Rajasthan"},
+        {"persons_killed": {"$gte": 2}}, {"year": {"$in": [2015, 2016]}}, $and / $or."""
+        masks = []
+        for key, cond in where.items():
+            if key in ("$and", "$or"):
+                parts = [self._mask(rows, c) for c in cond]
+                m = parts[0]
+                for p in parts[1:]:
+                    m = pc.and_kleene(m, p) if key == "$and" else pc.or_kleene(m, p)
+                masks.append(m)
+                continue
+            if key not in rows.column_names:
+                masks.append(pa.array(np.zeros(rows.num_rows, dtype=bool)))
+                continue
+            col = rows.column(key)
+            ops = cond if isinstance(cond, dict) else {"$eq": cond}
+            for op, value in ops.items():
+                if op == "$in":
+                    masks.append(pc.is_in(col, value_set=pa.array(value)))
+                elif op == "$nin":
+                    masks.append(pc.invert(pc.is_in(col, value_set=pa.array(value))))
+                else:
+                    masks.append(_OPS[op](col, value))
+        out = masks[0]
+        for m in masks[1:]:
+            out = pc.and_kleene(out, m)
+        return out
+
+    def _candidates(self, filter):
+        # (rows, vectors, row numbers or None for all)
+        self._consolidate()
+        rows, vectors, _ = self._segments[0]
+        if not filter:
+            return rows, vectors, None
+        mask = self._mask(rows, filter)
+        return rows, vectors, np.flatnonzero(pc.fill_null(mask, False).to_numpy(zero_copy_only=False))
+
+    def _docs(self, rows: pa.Table, idx) -> list:
+        # One take() for all rows; per-row slices cost ~0.1 ms each
+        if rows is None or not len(idx):
+            return []
+        out = []
+        for rec in rows.take(pa.array(np.asarray(idx, dtype=np.int64))).to_pylist():
+            meta = {k: v for k, v in rec.items() if k not in (ID, TEXT) and v is not None}
+            out.append(Document(id=rec[ID], page_content=rec[TEXT], metadata=meta))
+        return out
+
+    def _scorer(self, vectors, subset):
+        # queries → (queries x candidates) scores: exact, int8 or Hamming
+        if self.quantization is None:
+            matrix = vectors if subset is None else vectors[subset]
+            return lambda q: q @ matrix.T
+        codes = self._quantized()
+        if subset is not None:
+            codes = tuple(c[subset] for c in codes)
+        if self.quantization == "int8":
+            return lambda q: int8_scores(q, *codes)
+        return lambda q: hamming_scores(q, codes[0], vectors.shape[1])
+
+    def search_vectors(self, queries, k: int = 4, filter=None):
+        """[(row numbers, scores)] per query, best first.
+
+        Cosine scores, exact unless the store is quantized without rescoring.
+        """
+        queries = _unit(np.atleast_2d(queries))
+        if not self._segments:
+            return [(np.empty(0, np.int64), np.empty(0, np.float32)) for _ in queries]
+        rows, vectors, subset = self._candidates(filter)
+        n = len(vectors) if subset is None else len(subset)
+        k = min(k, n)
+        rescore = bool(self.quantization and self.rescore)
+        shortlist = min(n, k * self.rescore) if rescore else k
+        score = self._scorer(vectors, subset)
+        out = []
+        for start in range(0, len(queries), QUERY_BATCH):
+            batch = queries[start:start + QUERY_BATCH]
+            for q, s in zip(batch, score(batch)):
+                top = _top(s, shortlist)
+                idx, scores = (top if subset is None else subset[top]), s[top]
+                if rescore:
+                    # Ascending rows read the memory map sequentially
+                    idx = np.sort(idx)
+                    scores = np.asarray(vectors[idx]) @ q
+                    best = _top(scores, k)
+                    idx, scores = idx[best], scores[best]
+                out.append((idx, scores))
+        return out
+
+    def search_ids(self, query: str, k: int = 4, filter=None) -> list:
+        """IDs of the top-k documents for query, best first, without building Documents."""
+        idx, _ = self.search_vectors(self._embedding.embed_query(query), k, filter)[0]
+        return self._segments[0][0].column(ID).take(pa.array(idx)).to_pylist() if len(idx) else []
+
+    def similarity_search_by_vectors(self, embeddings, k: int = 4, filter=None):
+        """Batched form of similarity_search_with_score_by_vector."""
+        rows = self._segments[0][0] if self._segments else None
+        return [list(zip(self._docs(rows, idx), scores.tolist()))
+                for idx, scores in self.search_vectors(embeddings, k, filter)]
+
+    def similarity_search_with_score_by_vector(self, embedding, k: int = 4, filter=None, **kwargs):
+        return self.similarity_search_by_vectors([embedding], k, filter)[0]
+
+    def similarity_search_by_vector(self, embedding, k: int = 4, filter=None, **kwargs):
+        return [d for d, _ in self.similarity_search_with_score_by_vector(embedding, k, filter)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, filter=None, **kwargs):
+        """(Document, cosine similarity) pairs, highest first."""
+        return self.similarity_search_with_score_by_vector(self._embedding.embed_query(query), k, filter)
+
+    def similarity_search(self, query: str, k: int = 4, filter=None, **kwargs):
+        return [d for d, _ in self.similarity_search_with_score(query, k, filter)]
+
+    def batch_search(self, queries, k: int = 4, filter=None):
+        """Top-k (Document, score) lists for many query strings, embedded and scored together."""
+        return self.similarity_search_by_vectors(self._embedding.embed_documents(list(queries)), k, filter)
+
+    def _select_relevance_score_fn(self):
+        return lambda score: (score + 1) / 2     # cosine → [0, 1]
+
+    def get_by_ids(self, ids):
+        self._consolidate()
+        where = self._index()
+        rows = self._segments[0][0] if self._segments else None
+        return self._docs(rows, [where[i][1] for i in ids if i in where])
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, ids=None, path: str = STORE_DIR, **kwargs):
+        store = cls(path, embedding)
+        store.add_texts(texts, metadatas, ids)
+        store.flush()
+        return store
@@ -0,0 +1,82 @@
+import hashlib
+import os
+import sys
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import src.storage.index_build as index_build
+
+DIM = 16
+
+class StubModel:
+    """Stands in for the SentenceTransformer: a fixed vector per text, and a count of texts encoded."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts, batch_size=None, show_progress_bar=False):
+        self.calls += len(texts)
+        seeds = [int.from_bytes(hashlib.blake2b(t.encode(), digest_size=8).digest(), "little") for t in texts]
+        return np.stack([np.random.default_rng(s).standard_normal(DIM, dtype=np.float32) for s in seeds])
+
+class MemorySink:
+    """What build_index needs from ChromaSink, kept in a dict; upserts fail after fail_after calls."""
+
+    def __init__(self, fail_after=None):
+        self.rows = {}
+        self.fail_after = fail_after
+        self.upserts = 0
+
+    def existing(self):
+        return {id_: meta.get(index_build.CONTENT_HASH) for id_, (meta, _, _) in self.rows.items()}
+
+    def upsert(self, ids, vectors, texts, metadatas):
+        if self.fail_after is not None and self.upserts >= self.fail_after:
+            raise RuntimeError("simulated crash")
+        self.upserts += 1
+        for id_, v, meta, text in zip(ids, vectors, metadatas, texts):
+            self.rows[id_] = (dict(meta), text, np.array(v))
+
+    def delete(self, ids):
+        for id_ in ids:
+            del self.rows[id_]
+
+    def flush(self):
+        pass
+
+@pytest.fixture
+def stub_model(monkeypatch):
+    model = StubModel()
+
+    def load(model_name, threads=None):
+        index_build._model = model
+        return model
+
+    monkeypatch.setattr(index_build, "_load_model", load)
+    monkeypatch.setattr(index_build, "_model", None)
+    return model
+
+@pytest.fixture
+def memory_sink():
+    return MemorySink
+
+@pytest.fixture
+def accident_records():
+    def make(n, tag=""):
+        """n distinct accident records as an Arrow table; tag makes the narratives differ."""
+        return pa.table({
+            "date": [f"{1 + i % 28:02d}/{1 + i % 12:02d}/15" for i in range(n)],
+            "time": [f"{i % 24:02d}.{i % 60:02d}" for i in range(n)],
+            "mine": [f"MINE {i % 7}" for i in range(n)],
+            "owner": [f"OWNER {i % 5} LTD." for i in range(n)],
+            "state": ["Rajasthan", "Odisha", "Jharkhand"] * (n // 3) + ["Rajasthan", "Odisha"][:n % 3],
+            "cause": ["Fall of Roof", "Dumpers"] * (n // 2) + ["Fall of Roof"] * (n % 2),
+            "persons_killed": pa.array([1 + i % 3 for i in range(n)], pa.int64()),
+            "narrative": [f"Record {i}{tag}: a mass of stone fell from the roof of the working." for i in range(n)],
+            "source_doc": ["VOL.pdf"] * n,
+        })
+    return make
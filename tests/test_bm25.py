@@ -0,0 +1,104 @@
+import math
+import os
+import random
+import sys
+from collections import Counter
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import src.storage.bm25 as bm25
+from src.storage.bm25 import B, K1, BM25Builder, BM25Index, tokenize
+
+# Common words in nearly every document, a few mid-frequency ones and rare
+# names, like mine / owner / district lookups over the accident records
+COMMON = ["mine", "ltd", "fell", "roof", "the", "of"]
+MIDDLE = ["dumper", "blasting", "conveyor", "winding", "haulage"]
+RARE = [f"name{i}" for i in range(40)]
+
+def corpus(n=600, seed=7):
+    rng = random.Random(seed)
+    texts = {}
+    for i in range(n):
+        words = rng.choices(COMMON, k=rng.randint(3, 12)) + rng.choices(MIDDLE, k=rng.randint(0, 3))
+        if rng.random() < 0.3:
+            words += [rng.choice(RARE)] * rng.randint(1, 2)
+        rng.shuffle(words)
+        texts[f"doc{i}"] = " ".join(words)
+    return texts
+
+def reference_bm25(texts: dict, query: str) -> dict:
+    # Textbook BM25 over every document
+    docs = {id_: Counter(tokenize(t)) for id_, t in texts.items()}
+    n, avg = len(docs), sum(sum(c.values()) for c in docs.values()) / len(docs)
+    out = {}
+    for term in set(tokenize(query)):
+        df = sum(1 for c in docs.values() if term in c)
+        idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        for id_, c in docs.items():
+            if term in c:
+                tf, dl = c[term], sum(c.values())
+                out[id_] = out.get(id_, 0) + idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * dl / avg))
+    return out
+
+def build(texts):
+    builder = BM25Builder()
+    builder.add(list(texts), list(texts.values()))
+    return builder.build()
+
+QUERIES = ["name3", "name3 mine", "name5 ltd roof", "dumper name9 the", "blasting conveyor",
+           "mine ltd fell roof the of", "name1 name2 name3", "haulage winding mine", "nothing here"]
+
+@pytest.fixture(scope="module")
+def texts():
+    return corpus()
+
+@pytest.fixture(scope="module")
+def index(texts):
+    return build(texts)
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_scores_match_reference(texts, index, query):
+    ref = reference_bm25(texts, query)
+    got = dict(index.search(query, k=len(index)))
+    assert got.keys() == ref.keys()
+    assert all(abs(got[i] - ref[i]) < 1e-4 * ref[i] for i in ref)
+
+@pytest.mark.parametrize("k", [1, 5, 20, 100])
+def test_pruned_search_matches_dense_pass(index, monkeypatch, k):
+    pruned = {q: index.search(q, k) for q in QUERIES}
+    # With no candidate share allowed every multi-term query takes the dense pass
+    monkeypatch.setattr(bm25, "CANDIDATE_SHARE", 0)
+    assert {q: index.search(q, k) for q in QUERIES} == pruned
+
+def test_top_k_order_and_ties(index):
+    hits = index.search("mine ltd", k=50)
+    scores = [s for _, s in hits]
+    assert scores == sorted(scores, reverse=True)
+    for (a, sa), (b, sb) in zip(hits, hits[1:]):
+        if sa == sb:
+            assert index.ids.index(a) < index.ids.index(b)
+
+def test_merge_matches_full_rebuild(tmp_path, texts, index):
+    ids = list(texts)
+    first = build({i: texts[i] for i in ids[:400]})
+    first.save(str(tmp_path))
+    builder = BM25Builder(BM25Index.load(str(tmp_path)))
+    # Rows 300..399 again, unchanged, plus the ones the first build lacked
+    builder.add(ids[300:], [texts[i] for i in ids[300:]])
+    merged = builder.build()
+    assert sorted(merged.ids) == sorted(index.ids)
+    for q in QUERIES:
+        a, b = dict(index.search(q, len(index))), dict(merged.search(q, len(merged)))
+        assert a.keys() == b.keys() and all(abs(a[i] - b[i]) < 1e-5 * a[i] for i in a)
+
+def test_save_load_round_trip(tmp_path, index):
+    index.save(str(tmp_path))
+    loaded = BM25Index.load(str(tmp_path))
+    assert loaded.ids == index.ids and loaded.terms == index.terms
+    assert all(loaded.search(q, 10) == index.search(q, 10) for q in QUERIES)
+
+def test_load_without_index_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        BM25Index.load(str(tmp_path))
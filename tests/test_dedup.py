@@ -0,0 +1,81 @@
+import os
+import sys
+
+import pyarrow as pa
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.extraction.postprocess import (BUCKET_CAP, _bucket_pairs, duplicate_groups,
+                                        mark_dataset_duplicates)
+from src.storage.dataset import open_dataset, write_volume
+from src.storage.index_build import dataset_documents
+
+NARRATIVES = [
+    "While two drillers were connecting a hose to the jack hammer a mass of stone fell from the roof.",
+    "The tipper rolled over the unstable edge of the dump and the driver was crushed in the cabin.",
+    "A boulder slid down the bench face and struck the loader working at its toe.",
+]
+
+def records(narratives, dates, mines, killed):
+    return pa.table({
+        "date": pa.array(dates, pa.string()),
+        "mine": pa.array(mines, pa.string()),
+        "persons_killed": pa.array(killed, pa.int64()),
+        "state": pa.array(["Rajasthan"] * len(dates), pa.string()),
+        "narrative": pa.array(narratives, pa.string()),
+        "source_doc": pa.array(["x.pdf"] * len(dates), pa.string()),
+    })
+
+@pytest.fixture
+def dataset(tmp_path):
+    root = str(tmp_path / "accidents")
+    dates, mines = ["16/05/15", "05/01/15", "14/01/15"], ["KHETRI MINE", "CHECHAT MINE", "CHIKLA MINE"]
+    write_volume(records(NARRATIVES, dates, mines, [1, 1, 2]), root, year=2015, volume="A")
+    # A reprint a year later: one record reworded slightly, one new
+    reprint = [NARRATIVES[0] + " He died on the spot.", "Gas was released when the old working was holed through."]
+    write_volume(records(reprint, ["16/05/2015", "02/03/16"], ["Khetri Mine", "RAJPURA MINE"], [1, 3]),
+                 root, year=2016, volume="B")
+    return root
+
+def verdicts(root):
+    t = open_dataset(root).to_table(columns=["record_id", "duplicate_of"])
+    return dict(zip(t.column("record_id").to_pylist(), t.column("duplicate_of").to_pylist()))
+
+def test_duplicates_across_volumes(dataset):
+    marked, _ = mark_dataset_duplicates(dataset)
+    assert marked == 1
+    assert verdicts(dataset) == {"A/0": None, "A/1": None, "A/2": None, "B/0": "A/0", "B/1": None}
+
+def test_rerun_keeps_verdicts(dataset):
+    mark_dataset_duplicates(dataset)
+    before = verdicts(dataset)
+    assert mark_dataset_duplicates(dataset)[0] == 1
+    assert verdicts(dataset) == before
+
+def test_reference_rows_never_originals_of_dataset_rows(dataset):
+    reference = pa.table({
+        "record_id": ["x.csv/0", "x.csv/1"],
+        "date": pa.array([None, None], pa.date32()),
+        "mine": ["Chikla Mine", "Unknown"],
+        "persons_killed": pa.array([2, 1], pa.int64()),
+        "narrative": [NARRATIVES[2], "Nothing alike."],
+    })
+    marked, secondary = mark_dataset_duplicates(dataset, reference)
+    assert marked == 1
+    assert secondary.to_pylist() == [{"record_id": "x.csv/0", "duplicate_of": "A/2"},
+                                     {"record_id": "x.csv/1", "duplicate_of": None}]
+
+def test_index_documents_skip_duplicates(dataset):
+    mark_dataset_duplicates(dataset)
+    total, batches = dataset_documents(dataset)
+    ids = [d.metadata["record_id"] for batch in batches for d in batch]
+    assert total == 4 and sorted(ids) == ["A/0", "A/1", "A/2", "B/1"]
+
+def test_oversized_bucket_is_linear():
+    n = 10 * BUCKET_CAP
+    pairs = list(_bucket_pairs(pa.array([7] * n).to_numpy()))
+    assert len(pairs) == BUCKET_CAP * (BUCKET_CAP - 1) // 2 + n - BUCKET_CAP
+    assert all(i < j for i, j in pairs)
+    groups = duplicate_groups(["the same boilerplate sentence repeated in every record"] * n)
+    assert set(groups.tolist()) == {0}
@@ -0,0 +1,117 @@
+import os
+import shutil
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import src.storage.embed_cache as embed_cache
+import src.storage.index_build as index_build
+from src.storage.dataset import write_volume
+from src.storage.embed_cache import KEYS_FILE, VECTORS_FILE, EmbeddingCache
+
+MODEL = "test/model"
+TEXTS = [f"accident record {i}\nwith a wrapped line" for i in range(10)]
+
+def vectors(n, dim=4, seed=0):
+    return np.random.default_rng(seed).standard_normal((n, dim), dtype=np.float32)
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / "cache")
+
+def test_lookup_after_add(cache_dir):
+    vecs = vectors(len(TEXTS))
+    with EmbeddingCache(MODEL, cache_dir) as cache:
+        cache.add(TEXTS[:6], vecs[:6])
+        got, missing = cache.lookup(TEXTS)
+    assert missing == [6, 7, 8, 9]
+    assert np.array_equal(got[:6], vecs[:6]) and not got[6:].any()
+
+def test_keys_ignore_whitespace_and_depend_on_model(cache_dir):
+    with EmbeddingCache(MODEL, cache_dir) as cache:
+        cache.add(TEXTS[:1], vectors(1))
+        assert cache.lookup(["  accident record 0 with   a wrapped\nline "])[1] == []
+    with EmbeddingCache("other/model", cache_dir) as cache:
+        assert cache.lookup(TEXTS[:1])[1] == [0]
+
+def test_reopen_keeps_vectors(cache_dir):
+    vecs = vectors(len(TEXTS))
+    with EmbeddingCache(MODEL, cache_dir) as cache:
+        cache.add(TEXTS, vecs)
+        cache.add(TEXTS[:3], vectors(3, seed=1))    # already cached: ignored
+    with EmbeddingCache(MODEL, cache_dir) as cache:
+        assert len(cache) == len(TEXTS)
+        got, missing = cache.lookup(TEXTS)
+    assert missing == [] and np.array_equal(got, vecs)
+
+@pytest.mark.parametrize("name, extra", [(VECTORS_FILE, 4 * 4 + 6), (KEYS_FILE, 16 + 3)])
+def test_crash_between_appends_is_truncated(cache_dir, name, extra):
+    vecs = vectors(len(TEXTS))
+    with EmbeddingCache(MODEL, cache_dir) as cache:
+        cache.add(TEXTS[:5], vecs[:5])
+        model_dir = cache.dir
+    # One file got (part of) a row the other never did
+    with open(model_dir / name, "ab") as f:
+        f.write(os.urandom(extra))
+    with EmbeddingCache(MODEL, cache_dir) as cache:
+        assert len(cache) == 5
+        assert os.path.getsize(model_dir / VECTORS_FILE) == 5 * 4 * 4
+        assert os.path.getsize(model_dir / KEYS_FILE) == 5 * 16
+        cache.add(TEXTS[5:], vecs[5:])
+    with EmbeddingCache(MODEL, cache_dir) as cache:
+        got, missing = cache.lookup(TEXTS)
+    assert missing == [] and np.array_equal(got, vecs)
+
+def test_compact_keeps_only_used_rows(cache_dir):
+    vecs = vectors(len(TEXTS))
+    with EmbeddingCache(MODEL, cache_dir) as cache:
+        cache.add(TEXTS, vecs)
+    with EmbeddingCache(MODEL, cache_dir) as cache:
+        cache.lookup(TEXTS[2:4])
+        cache.keep(TEXTS[7:8])
+        cache.add(TEXTS[9:], vecs[9:])
+        assert cache.compact() == 6
+        assert cache.compact() == 0
+    with EmbeddingCache(MODEL, cache_dir) as cache:
+        got, missing = cache.lookup(TEXTS)
+    assert missing == [0, 1, 4, 5, 6, 8]
+    kept = [2, 3, 7, 9]
+    assert np.array_equal(got[kept], vecs[kept])
+
+def test_other_cache_version_is_dropped(cache_dir, monkeypatch):
+    with EmbeddingCache(MODEL, cache_dir) as cache:
+        cache.add(TEXTS, vectors(len(TEXTS)))
+    monkeypatch.setattr(embed_cache, "CACHE_VERSION", embed_cache.CACHE_VERSION + 1)
+    with EmbeddingCache(MODEL, cache_dir) as cache:
+        assert len(cache) == 0 and cache.lookup(TEXTS)[1] == list(range(len(TEXTS)))
+
+def test_rebuilds_only_encode_new_texts(tmp_path, stub_model, memory_sink, accident_records):
+    root, cache_dir = str(tmp_path / "dataset"), str(tmp_path / "cache")
+    write_volume(accident_records(50, " [2015]"), root, year=2015, volume="V2015")
+
+    def build(full=True):
+        stub_model.calls = 0
+        sink = memory_sink()
+        total, batches = index_build.dataset_documents(root, batch_size=16)
+        with EmbeddingCache(index_build.EMBED_MODEL, cache_dir) as cache:
+            state = index_build.build_index(batches, total, index_dir=str(tmp_path / "index"), sink=sink,
+                                            cache=cache, full=full, log=lambda *a: None)
+            assert len(cache) == state["checked"]
+        assert state["encoded"] == stub_model.calls
+        return state, sink
+
+    assert build()[0]["encoded"] == 50
+    assert build()[0]["encoded"] == 0
+    write_volume(accident_records(30, " [2016]"), root, year=2016, volume="V2016")
+    state, sink = build()
+    assert state["encoded"] == 30
+    shutil.rmtree(os.path.join(root, "year=2015"))
+    state, _ = build()
+    assert (state["encoded"], state["evicted"]) == (0, 50)
+
+    # Cached vectors are the ones the model gives
+    fresh = stub_model.encode([text for _, text, _ in sink.rows.values()])
+    assert np.array_equal(np.stack([v for _, _, v in sink.rows.values()]), fresh)
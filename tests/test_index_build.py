@@ -0,0 +1,92 @@
+import json
+import os
+import shutil
+import sys
+from collections import Counter
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pytest
+from langchain_core.documents import Document
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import src.storage.index_build as index_build
+from src.storage.dataset import write_volume
+from src.storage.index_build import STATE_FILE, assign_ids, content_hash
+
+def doc(**meta):
+    return Document(page_content="text", metadata={"year": 2015, "volume": "V", "source_doc": "x.pdf", **meta})
+
+def test_ids_are_deterministic_and_numbered_across_batches():
+    batches = [[doc(mine="A"), doc(mine="B")], [doc(mine="A"), doc(mine="A", state="Odisha")]]
+    counts = Counter()
+    ids = [assign_ids(b, counts) for b in batches]
+    a, b = ids[0]
+    assert ids[1][0] == f"{a}-1" and len({a, b, ids[1][1]}) == 3
+    assert [d.id for d in batches[0]] == ids[0]
+    # Same stream, same IDs; text and other metadata don't take part
+    again = [[doc(mine="A", narrative="x"), doc(mine="B")], [doc(mine="A"), doc(mine="A", state="Odisha")]]
+    counts = Counter()
+    assert [assign_ids(b, counts) for b in again] == ids
+
+def test_content_hash_ignores_none_and_itself():
+    h = content_hash("text", {"mine": "A", "owner": None})
+    assert h == content_hash("text", {"mine": "A", index_build.CONTENT_HASH: "old"})
+    assert h != content_hash("text", {"mine": "B"}) and h != content_hash("other", {"mine": "A"})
+
+@pytest.fixture
+def dataset(tmp_path, accident_records):
+    root = str(tmp_path / "dataset")
+    write_volume(accident_records(60), root, year=2015, volume="V2015")
+    return root
+
+def build(root, index_dir, sink, batch_size=16, insert_chunk=32, **kwargs):
+    total, batches = index_build.dataset_documents(root, batch_size=batch_size)
+    return index_build.build_index(batches, total, index_dir=index_dir, sink=sink, insert_chunk=insert_chunk,
+                                   lexical=False, log=lambda *a: None, **kwargs)
+
+def counts(state):
+    return state["upserted"], state["unchanged"], state["deleted"]
+
+def test_builds_write_only_what_changed(tmp_path, dataset, stub_model, memory_sink, accident_records):
+    index_dir, sink = str(tmp_path / "index"), memory_sink()
+    assert counts(build(dataset, index_dir, sink)) == (60, 0, 0)
+    first = {id_: text for id_, (_, text, _) in sink.rows.items()}
+    assert counts(build(dataset, index_dir, sink)) == (0, 60, 0)
+
+    # An edited record keeps its ID
+    records = accident_records(60)
+    narrative = records.column("narrative").to_pylist()
+    narrative[7] += " (corrected)"
+    edited = records.set_column(records.column_names.index("narrative"), "narrative", pa.array(narrative))
+    write_volume(edited, dataset, year=2015, volume="V2015")
+    assert counts(build(dataset, index_dir, sink)) == (1, 59, 0)
+    changed = [id_ for id_, (_, text, _) in sink.rows.items() if first[id_] != text]
+    assert len(changed) == 1 and sink.rows.keys() == first.keys()
+
+    write_volume(accident_records(40, " [2016]"), dataset, year=2016, volume="V2016")
+    assert counts(build(dataset, index_dir, sink)) == (40, 60, 0)
+    shutil.rmtree(os.path.join(dataset, "year=2015"))
+    assert counts(build(dataset, index_dir, sink)) == (0, 40, 60)
+    assert len(sink.rows) == 40
+
+def test_filtered_build_deletes_nothing(tmp_path, dataset, stub_model, memory_sink, accident_records):
+    index_dir, sink = str(tmp_path / "index"), memory_sink()
+    build(dataset, index_dir, sink)
+    write_volume(accident_records(10, " [2016]"), dataset, year=2016, volume="V2016")
+    total, batches = index_build.dataset_documents(dataset, filter=ds.field("year") == 2016)
+    state = index_build.build_index(batches, total, index_dir=index_dir, sink=sink, full=False,
+                                    lexical=False, log=lambda *a: None)
+    assert counts(state) == (10, 0, 0) and len(sink.rows) == 70
+
+def test_crashed_build_resumes(tmp_path, dataset, stub_model, memory_sink):
+    index_dir, sink = str(tmp_path / "index"), memory_sink(fail_after=2)
+    with pytest.raises(RuntimeError):
+        build(dataset, index_dir, sink, batch_size=8, insert_chunk=8)
+    with open(os.path.join(index_dir, STATE_FILE), encoding="utf-8") as f:
+        progress = json.load(f)
+    assert not progress["complete"] and progress["upserted"] == len(sink.rows) == 16
+    sink.fail_after = None
+    state = build(dataset, index_dir, sink, batch_size=8, insert_chunk=8)
+    assert counts(state) == (44, 16, 0) and state["complete"] and len(sink.rows) == 60
@@ -0,0 +1,98 @@
+import multiprocessing as mp
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import src.ingestion.cache as cache_mod
+from src.ingestion.cache import PageCache
+from src.ingestion.sanitizer import clean_page
+
+PAGES = 12
+
+def raw_text(pdf_path, n):
+    return f"STATEMENT NO. {n}\n{os.path.basename(pdf_path)}  page\t{n}"
+
+def fake_page_count(pdf_path, backend=None):
+    return PAGES
+
+def fake_iter_pdf_text(pdf_path, workers=1, pages=None, backend=None):
+    for n in pages:
+        time.sleep(0.002)
+        yield {"page": n, "text": raw_text(pdf_path, n)}
+
+@pytest.fixture
+def pdfs(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_mod, "page_count", fake_page_count)
+    monkeypatch.setattr(cache_mod, "iter_pdf_text", fake_iter_pdf_text)
+    paths = []
+    for i in range(4):
+        paths.append(str(tmp_path / f"vol{i}.pdf"))
+        with open(paths[-1], "wb") as f:
+            f.write(os.urandom(256))
+    return paths
+
+def ingest(cache_path, pdf):
+    stats = {}
+    with PageCache(cache_path) as cache:
+        pages = list(cache.iter_clean_pages(pdf, stats=stats))
+    return pages, stats
+
+def test_second_run_is_cached(tmp_path, pdfs):
+    cache_path = str(tmp_path / "pages.sqlite3")
+    pages, stats = ingest(cache_path, pdfs[0])
+    assert pages == [{"page": n, "text": clean_page(raw_text(pdfs[0], n))} for n in range(1, PAGES + 1)]
+    assert (stats["extracted"], stats["recleaned"], stats["cached"]) == (PAGES, PAGES, 0)
+    again, stats = ingest(cache_path, pdfs[0])
+    assert again == pages
+    assert (stats["extracted"], stats["recleaned"], stats["cached"]) == (0, 0, PAGES)
+
+def test_sanitizer_change_recleans_without_extracting(tmp_path, pdfs, monkeypatch):
+    cache_path = str(tmp_path / "pages.sqlite3")
+    pages, _ = ingest(cache_path, pdfs[0])
+    monkeypatch.setattr(cache_mod, "sanitizer_fingerprint", lambda: "changed")
+    again, stats = ingest(cache_path, pdfs[0])
+    assert again == pages
+    assert (stats["extracted"], stats["recleaned"], stats["cached"]) == (0, PAGES, 0)
+
+def test_backend_version_change_extracts_again(tmp_path, pdfs, monkeypatch):
+    cache_path = str(tmp_path / "pages.sqlite3")
+    ingest(cache_path, pdfs[0])
+    monkeypatch.setattr(cache_mod, "backend_key", lambda backend: f"{backend}-next")
+    _, stats = ingest(cache_path, pdfs[0])
+    assert stats["extracted"] == PAGES
+
+def test_changed_pdf_extracts_again(tmp_path, pdfs):
+    cache_path = str(tmp_path / "pages.sqlite3")
+    ingest(cache_path, pdfs[0])
+    with open(pdfs[0], "ab") as f:
+        f.write(b"appended")
+    _, stats = ingest(cache_path, pdfs[0])
+    assert stats["extracted"] == PAGES
+
+def test_schema_change_drops_old_cache(tmp_path, pdfs, monkeypatch):
+    cache_path = str(tmp_path / "pages.sqlite3")
+    ingest(cache_path, pdfs[0])
+    monkeypatch.setattr(cache_mod, "SCHEMA_VERSION", cache_mod.SCHEMA_VERSION + 1)
+    _, stats = ingest(cache_path, pdfs[0])
+    assert stats["extracted"] == PAGES
+
+def worker(args):
+    try:
+        _, stats = ingest(*args)
+        return "ok", stats["extracted"]
+    except Exception as e:
+        return f"{type(e).__name__}: {e}", 0
+
+def test_workers_share_one_cache(tmp_path, pdfs):
+    # fork, so workers see the patched extractor
+    cache_path = str(tmp_path / "pages.sqlite3")
+    jobs = [(cache_path, p) for p in pdfs]
+    with mp.get_context("fork").Pool(len(pdfs)) as pool:
+        first = pool.map(worker, jobs)
+        again = pool.map(worker, jobs)
+    assert first == [("ok", PAGES)] * len(pdfs)
+    assert again == [("ok", 0)] * len(pdfs)
@@ -0,0 +1,63 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.storage.page_store import PageStore, PageStoreWriter, write_page_store
+
+# Non-ASCII, empty and multi-line pages, and more pages than one batch holds
+PAGES = [{"page": n, "text": f"STATEMENT NO. {n}\nपृष्ठ {n} – Khetri\t{'x' * (n % 7)}" if n % 5 else ""}
+         for n in range(3, 3 + 23)]
+
+@pytest.fixture(params=["zstd", None])
+def store_path(tmp_path, request):
+    path = str(tmp_path / "pages.arrow")
+    write_page_store(PAGES, path, batch_size=4, compression=request.param)
+    return path
+
+def test_round_trip(store_path):
+    with PageStore(store_path) as store:
+        assert len(store) == len(PAGES)
+        assert list(store.page_numbers) == [p["page"] for p in PAGES]
+        assert list(store.iter_pages()) == PAGES
+        assert store.texts() == [p["text"] for p in PAGES]
+        assert [store.page(p["page"]) for p in PAGES] == [p["text"] for p in PAGES]
+
+@pytest.mark.parametrize("start, stop", [(3, 26), (5, 6), (6, 14), (1, 9), (20, 99), (9, 9)])
+def test_page_ranges(store_path, start, stop):
+    expected = [p for p in PAGES if start <= p["page"] < stop]
+    with PageStore(store_path) as store:
+        table = store.pages(start, stop)
+        assert table.column("page").to_pylist() == [p["page"] for p in expected]
+        assert table.column("text").to_pylist() == [p["text"] for p in expected]
+        assert list(store.iter_pages(start, stop)) == expected
+
+def test_missing_page(store_path):
+    with PageStore(store_path) as store:
+        with pytest.raises(IndexError):
+            store.page(2)
+        with pytest.raises(IndexError):
+            store.page(26)
+
+def test_jsonl_export(store_path, tmp_path):
+    out = str(tmp_path / "pages.jsonl")
+    with PageStore(store_path) as store:
+        assert store.to_jsonl(out, 4, 8) == 4
+    with open(out, encoding="utf-8") as f:
+        assert [json.loads(line) for line in f] == PAGES[1:5]
+
+def test_empty_store(tmp_path):
+    path = str(tmp_path / "empty.arrow")
+    assert write_page_store([], path) == 0
+    with PageStore(path) as store:
+        assert len(store) == 0 and list(store.iter_pages()) == []
+        assert store.pages().num_rows == 0
+
+def test_pages_must_be_consecutive(tmp_path):
+    with PageStoreWriter(str(tmp_path / "gap.arrow")) as w:
+        w.write({"page": 1, "text": "a"})
+        with pytest.raises(ValueError):
+            w.write({"page": 3, "text": "c"})
@@ -0,0 +1,93 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.storage.quantize import hamming_scores, int8_scores, pack_signs, quantize_int8
+from src.storage.vectorstore import CODE_FILES, NumpyVectorStore
+
+DIM, N, K = 128, 2000, 5
+
+def unit(x):
+    return (x / np.linalg.norm(x, axis=-1, keepdims=True)).astype(np.float32)
+
+def clustered(seed=0):
+    # Records in topics of 50, queries are noisy copies of records (as in bench_quantization)
+    rng = np.random.default_rng(seed)
+    topics = unit(rng.standard_normal((N // 50, DIM)))
+    vectors = unit(topics[np.arange(N) // 50] + rng.standard_normal((N, DIM)) * 0.9 / np.sqrt(DIM))
+    queries = unit(vectors[rng.integers(0, N, 50)] + rng.standard_normal((50, DIM)) * 0.8 / np.sqrt(DIM))
+    return vectors, queries
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    vectors, queries = clustered()
+    path = str(tmp_path_factory.mktemp("store"))
+    ids = [f"doc{i}" for i in range(N)]
+    s = NumpyVectorStore(path)
+    s.upsert(ids, vectors, ids, [{"odd": i % 2} for i in range(N)])
+    s.flush()
+    exact = [rows for rows, _ in s.search_vectors(queries, K)]
+    return path, vectors, queries, exact
+
+def recall(results, exact):
+    return np.mean([len(set(r) & set(e)) / K for (r, _), e in zip(results, exact)])
+
+@pytest.mark.parametrize("mode, rescore, floor", [
+    ("int8", 0, 0.95), ("int8", 4, 1.0), ("binary", 0, 0.3), ("binary", 4, 0.7), ("binary", 10, 0.95)])
+def test_recall_against_float32(store, mode, rescore, floor):
+    path, _, queries, exact = store
+    assert recall(NumpyVectorStore(path, quantization=mode, rescore=rescore).search_vectors(queries, K),
+                  exact) >= floor
+
+@pytest.mark.parametrize("mode", ["int8", "binary"])
+def test_rescored_scores_are_exact(store, mode):
+    path, vectors, queries, _ = store
+    results = NumpyVectorStore(path, quantization=mode, rescore=4).search_vectors(queries, K)
+    for q, (rows, scores) in zip(queries, results):
+        assert np.allclose(scores, vectors[rows] @ q, atol=1e-6) and np.all(np.diff(scores) <= 0)
+
+@pytest.mark.parametrize("mode", ["int8", "binary"])
+def test_filtered_quantized_search(store, mode):
+    path, _, queries, _ = store
+    for rows, _ in NumpyVectorStore(path, quantization=mode, rescore=4).search_vectors(queries, K, {"odd": 1}):
+        assert len(rows) == K and np.all(rows % 2 == 1)
+
+@pytest.mark.parametrize("mode", ["int8", "binary"])
+def test_codes_are_flushed_and_reused(tmp_path, store, mode):
+    _, vectors, queries, _ = store
+    path = str(tmp_path / mode)
+    s = NumpyVectorStore(path, quantization=mode)
+    s.upsert([str(i) for i in range(100)], vectors[:100], [""] * 100, [{}] * 100)
+    s.flush()
+    assert all(os.path.exists(os.path.join(path, name)) for name in CODE_FILES[mode])
+    before = s.search_vectors(queries, K)
+    reopened = NumpyVectorStore(path, quantization=mode)
+    assert reopened._codes is not None
+    assert all(np.array_equal(a, b) for (a, _), (b, _) in zip(before, reopened.search_vectors(queries, K)))
+
+def test_unknown_quantization(tmp_path):
+    with pytest.raises(ValueError):
+        NumpyVectorStore(str(tmp_path), quantization="int4")
+
+def test_int8_round_trip():
+    vectors, queries = clustered()
+    codes, scales = quantize_int8(vectors)
+    assert codes.dtype == np.int8 and np.abs(codes).max() == 127
+    assert np.abs(codes * scales[:, None] - vectors).max() <= scales.max() / 2 + 1e-7
+    assert np.abs(int8_scores(queries, codes, scales) - queries @ vectors.T).max() < 0.01
+    # Zero rows don't divide by zero
+    codes, scales = quantize_int8(np.zeros((2, DIM)))
+    assert not codes.any() and np.all(scales == 1)
+
+@pytest.mark.parametrize("dim", [8, 13, 64])
+def test_hamming_scores(dim):
+    rng = np.random.default_rng(dim)
+    rows, queries = rng.standard_normal((40, dim)), rng.standard_normal((3, dim))
+    bits = pack_signs(rows)
+    assert bits.shape == (40, (dim + 7) // 8)
+    expected = 1 - 2 * ((queries[:, None] > 0) != (rows[None] > 0)).sum(axis=2) / dim
+    assert np.allclose(hamming_scores(queries, bits, dim), expected)
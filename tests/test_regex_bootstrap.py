@@ -0,0 +1,169 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.extraction.regex_bootstrap import (block_values, iter_blocks, iter_record_dicts, iter_records,
+                                            split_records)
+
+PAGES_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "interim", "2015_pages.jsonl")
+
+# Three records in two cause sections over three pages; record 2 straddles
+# the break between pages 1 and 2, and its header is itself split there
+PAGES = [
+    {"page": 1, "text": (
+        "Summary of Findings of Enquiries\n"
+        "Code : 0111 Fall of Roof\n"
+        "( 2 Deaths)\n"
+        "1. Date - 16/05/15 Mine - KHETRI COPPER MINE\n"
+        "Time - 20.15 Owner - HINDUSTAN COPPER LTD.\n"
+        "Dist. - Jhunjhunu, State - Rajasthan\n"
+        "Person(s) Killed :\n"
+        "1. Vijendra Singh, Driller, Male, 32 Years\n"
+        "While two drillers were connecting a hose, a mass of stone fell from the roof.\n"
+        "Had the workings been kept secured by rock bolts, this accident could have been averted.\n"
+        "2. Date -"
+    )},
+    {"page": 2, "text": (
+        " 03/02/15 Mine - KOLIHAN MINE\n"
+        "Time - 10.30 Owner - HINDUSTAN COPPER LTD.\n"
+        "Dist. - Jhunjhunu, State - Rajasthan\n"
+        "Person(s) Killed :\n"
+        "1. Ram Lal, Loader, Male, 41 Years\n"
+        "A slab fell from the side wall.\n"
+        "Had the sides been dressed, this accident could have been averted.\n"
+        "-----------------------------------------------------------------\n"
+        "Code : 0335 Dumpers\n"
+        "( 1 Deaths)"
+    )},
+    {"page": 3, "text": (
+        "3. Date - 05/01/15 Mine - CHECHAT LIMESTONE MINE\n"
+        "Time - 16.45 Owner - M/S DILIP KUMAR MOTILAL JAIN\n"
+        "Dist. - Kota, State - Rajasthan\n"
+        "Person(s) Killed :\n"
+        "1. Jugraj,Helper, Male, 25 Years\n"
+        "The tipper rolled over the unstable edge.\n"
+        "Had a protective berm been made, this accident could have been averted.\n"
+        "7"
+    )},
+]
+
+def joined(pages):
+    return "\n".join(p["text"] for p in pages)
+
+def repaginate(pages, size):
+    # Same text cut into pages of `size` characters at arbitrary points (joining
+    # them back adds a newline at each cut)
+    text = joined(pages)
+    return [{"page": i + 1, "text": text[s:s + size]} for i, s in enumerate(range(0, len(text), size))]
+
+def test_split_records_keeps_every_block():
+    blocks = split_records(joined(PAGES))
+    assert len(blocks) == 3
+    assert blocks[0].startswith("Date - 16/05/15 Mine - KHETRI COPPER MINE\n")
+    assert blocks[1].startswith("Date -\n 03/02/15 Mine - KOLIHAN MINE\n")
+    assert blocks[2].startswith("Date - 05/01/15 Mine - CHECHAT LIMESTONE MINE\n")
+    assert blocks[2].rstrip().endswith("averted.\n7")
+
+def test_split_records_keeps_date_prefix():
+    for block in split_records(joined(PAGES)):
+        assert block.startswith("Date -")
+    assert [block_values(b, "x.pdf")["date"] for b in split_records(joined(PAGES))] == [
+        "16/05/15", "03/02/15", "05/01/15"]
+
+def test_split_records_without_records():
+    assert split_records("Summary of Findings of Enquiries\nno statements here") == []
+
+def test_iter_blocks_matches_split_records():
+    assert [b for b, _ in iter_blocks(PAGES)] == split_records(joined(PAGES))
+
+@pytest.mark.parametrize("size", [1, 7, 50, 113, 400, 10_000])
+def test_iter_blocks_matches_split_records_under_repagination(size):
+    pages = repaginate(PAGES, size)
+    assert [b for b, _ in iter_blocks(pages)] == split_records(joined(pages))
+
+@pytest.mark.skipif(not os.path.exists(PAGES_FILE), reason="no extracted pages")
+@pytest.mark.parametrize("size", [97, 1000, 5000])
+def test_iter_blocks_matches_split_records_on_real_pages(size):
+    with open(PAGES_FILE, encoding="utf-8") as f:
+        pages = [json.loads(line) for line in f]
+    expected = split_records(joined(pages))
+    assert len(expected) > 1
+    assert [b for b, _ in iter_blocks(pages)] == expected
+    pages = repaginate(pages, size)
+    assert [b for b, _ in iter_blocks(pages)] == split_records(joined(pages))
+
+def test_page_span():
+    assert [span for _, span in iter_blocks(PAGES)] == [[1], [1, 2], [3]]
+
+def test_page_span_skips_page_only_touched_by_whitespace():
+    pages = [{"page": 1, "text": "1. Date - 01/01/15 Mine - A\nbody"},
+             {"page": 2, "text": "   "},
+             {"page": 3, "text": "2. Date - 02/01/15 Mine - B\nbody"}]
+    assert [span for _, span in iter_blocks(pages)] == [[1], [3]]
+
+def test_sections_follow_code_headings():
+    sections = [sec for _, _, sec in iter_blocks(PAGES, sections=True)]
+    assert sections == [("0111", "Fall of Roof"), ("0111", "Fall of Roof"), ("0335", "Dumpers")]
+
+def test_sections_none_before_first_heading():
+    pages = [{"page": 1, "text": "1. Date - 01/01/15 Mine - A\nbody"}]
+    assert [sec for _, _, sec in iter_blocks(pages, sections=True)] == [None]
+
+def test_block_values_sections():
+    (b1, s1, c1), (b2, s2, c2), (b3, s3, c3) = iter_blocks(PAGES, sections=True)
+
+    first = block_values(b1, "VOL.pdf", page_span=s1, section=c1)
+    assert first["mine"] == "KHETRI COPPER MINE"
+    assert first["owner"] == "HINDUSTAN COPPER LTD."
+    assert first["district"] == "Jhunjhunu"
+    assert first["state"] == "Rajasthan"
+    assert first["time"] == "20.15"
+    assert (first["code"], first["cause"]) == ("0111", "Fall of Roof")
+    assert first["victims"] == [{"name": "Vijendra Singh", "role": "Driller", "gender": "Male", "age": 32}]
+    assert first["persons_killed"] == 1
+    assert first["narrative"] == "While two drillers were connecting a hose, a mass of stone fell from the roof."
+    assert first["prevention"] == ("Had the workings been kept secured by rock bolts, "
+                                   "this accident could have been averted.")
+    assert first["page_span"] == [1]
+    assert first["source_doc"] == "VOL.pdf"
+
+    # The next section's rule, heading and death count are not part of the record
+    second = block_values(b2, "VOL.pdf", page_span=s2, section=c2)
+    assert second["narrative"] == "A slab fell from the side wall."
+    assert second["prevention"] == "Had the sides been dressed, this accident could have been averted."
+    assert second["page_span"] == [1, 2]
+
+    # A trailing page number is layout, not narrative
+    third = block_values(b3, "VOL.pdf", page_span=s3, section=c3)
+    assert (third["code"], third["cause"]) == ("0335", "Dumpers")
+    assert third["narrative"] == "The tipper rolled over the unstable edge."
+    assert third["prevention"] == "Had a protective berm been made, this accident could have been averted."
+
+def test_block_values_without_statement_sections():
+    values = block_values("Date - 01/01/15 Mine - A\nsomething happened", "x.pdf")
+    assert values["prevention"] is None
+    assert values["code"] is None and values["cause"] is None
+    assert values["persons_killed"] == 0
+    assert values["narrative"] == "something happened"
+
+def test_record_dicts_match_records():
+    assert list(iter_record_dicts(PAGES, "VOL.pdf")) == [r.model_dump() for r in iter_records(PAGES, "VOL.pdf")]
+
+@pytest.mark.parametrize("workers, chunk_size", [(2, 1), (3, 2), (2, 1000)])
+def test_parallel_parsing_matches_serial(workers, chunk_size):
+    # Many copies of the pages, so chunks are in flight in several workers at once
+    pages = [{"page": i + 1, "text": p["text"]} for i, p in enumerate(PAGES * 20)]
+    serial = list(iter_record_dicts(iter(pages), "VOL.pdf"))
+    assert len(serial) == 60
+    assert list(iter_record_dicts(iter(pages), "VOL.pdf", workers=workers, chunk_size=chunk_size)) == serial
+
+@pytest.mark.skipif(not os.path.exists(PAGES_FILE), reason="no extracted pages")
+def test_parallel_parsing_matches_serial_on_real_pages():
+    with open(PAGES_FILE, encoding="utf-8") as f:
+        pages = [json.loads(line) for line in f]
+    serial = list(iter_record_dicts(pages, "VOL.pdf"))
+    assert list(iter_record_dicts(pages, "VOL.pdf", workers=2, chunk_size=4)) == serial
@@ -0,0 +1,57 @@
+import json
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.ingestion.sanitizer import clean_page, clean_pages
+
+PAGES_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "interim", "2015_pages.jsonl")
+
+_HEADER = re.compile(r"^\s*STATEMENT NO", re.IGNORECASE)
+
+def legacy_clean_page(text: str):
+    # The original regex-per-line sanitizer (with v2's rule: Code lines kept)
+    lines = []
+    for line in text.splitlines():
+        if _HEADER.match(line.strip()):
+            continue
+        lines.append(line)
+
+    cleaned = "\n".join(lines)
+    cleaned = re.sub(r"[ \t]+", " ", cleaned)
+    return cleaned.strip()
+
+PAGES = [
+    "",
+    "   \n\t ",
+    "STATEMENT NO. 1\nCode : 0111 Fall of Roof\n( 2 Deaths)",
+    "  statement no 2 (contd.)  \n1. Date - 16/05/15 Mine - KHETRI\tCOPPER  MINE\n",
+    "Time - 20.15 \t Owner - HINDUSTAN COPPER LTD.\r\nDist. - Jhunjhunu,  State - Rajasthan\r\n",
+    "page one\x0cSTATEMENT NO. 3\x0cpage two\rthird\x0bfourth",
+    "unicode STATEMENT NO breaks\x85and\x1cmore\x1d\x1e",
+    "a mass of stone fell\n\n\nSTATEMENT NO.4\n\nfrom the roof.  \t",
+    "Code : 0335 Dumpers\n( 1 Deaths)\n7",
+]
+
+@pytest.mark.parametrize("text", PAGES)
+def test_clean_page_matches_legacy(text):
+    assert clean_page(text) == legacy_clean_page(text)
+
+def test_clean_pages_matches_clean_page():
+    assert list(clean_pages(PAGES)) == [clean_page(t) for t in PAGES]
+    assert list(clean_pages(iter([]))) == []
+
+def test_clean_page_is_idempotent():
+    for text in PAGES:
+        assert clean_page(clean_page(text)) == clean_page(text)
+
+@pytest.mark.skipif(not os.path.exists(PAGES_FILE), reason="no extracted pages")
+def test_stored_pages_unchanged():
+    with open(PAGES_FILE, encoding="utf-8") as f:
+        stored = [json.loads(line)["text"] for line in f]
+    assert [legacy_clean_page(t) for t in stored] == [clean_page(t) for t in stored]
+    assert list(clean_pages(stored)) == stored
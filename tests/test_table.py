@@ -0,0 +1,64 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.storage.table import (FULL_TEXT_FIELDS, clean_metadata, documents_from_frame, iter_documents,
+                               record_to_text, records_to_documents)
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "processed", "2015.parquet")
+
+def legacy_documents(df, fields=None, max_chars=None):
+    # records_to_documents before the column-wise builder
+    kwargs = {"max_chars": max_chars} if fields is None else {"fields": fields, "max_chars": max_chars}
+    return [(record_to_text(row, **kwargs), clean_metadata(row.to_dict())) for _, row in df.iterrows()]
+
+def pairs(docs):
+    return [(d.page_content, d.metadata) for d in docs]
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "date": ["16/05/15", "", None, "05/01/15"],
+        "mine": ["KHETRI COPPER MINE", "KOLIHAN MINE", "CHECHAT LIMESTONE MINE", None],
+        "owner": ["HINDUSTAN COPPER LTD.", None, "", "M/S DILIP KUMAR"],
+        "state": ["Rajasthan"] * 4,
+        "cause": [None, "Fall of Roof", None, "Dumpers"],
+        "persons_killed": [1, 0, 2, 1],
+        "narrative": ["A mass of stone fell from the roof. " * 20, "A slab fell.", "", "The tipper rolled over."],
+        "prevention": [None, "Had the sides been dressed.", None, None],
+        "victims": [[{"name": "Vijendra Singh", "age": 32}], [], None, [{"name": "Jugraj"}]],
+        "page_span": [np.array([1]), np.array([1, 2]), np.array([], dtype=int), np.array([3])],
+        "fatal": [True, False, True, True],
+    })
+
+@pytest.mark.parametrize("fields, max_chars", [(None, None), (None, 40), (FULL_TEXT_FIELDS, None)])
+def test_documents_match_iterrows(frame, fields, max_chars):
+    kwargs = {} if fields is None else {"fields": fields}
+    assert pairs(documents_from_frame(frame, max_chars=max_chars, **kwargs)) == \
+        legacy_documents(frame, fields, max_chars)
+
+def test_records_to_documents(frame):
+    assert pairs(records_to_documents(frame)) == legacy_documents(frame)
+
+@pytest.mark.parametrize("batch_size", [1, 3, 4, 1024])
+def test_batches_match_whole_frame(frame, batch_size):
+    whole = pairs(records_to_documents(frame))
+    batches = list(iter_documents(frame, batch_size=batch_size))
+    assert all(len(b) <= batch_size for b in batches)
+    assert [p for b in batches for p in pairs(b)] == whole
+
+def test_arrow_batches_match_frame(frame):
+    table = pa.Table.from_pandas(frame.drop(columns=["victims", "page_span"]), preserve_index=False)
+    docs = [p for b in iter_documents(table, batch_size=3) for p in pairs(b)]
+    assert docs == pairs(records_to_documents(table.to_pandas()))
+
+@pytest.mark.skipif(not os.path.exists(DATA_FILE), reason="no extracted records")
+def test_documents_match_iterrows_on_real_records():
+    df = pd.read_parquet(DATA_FILE)
+    assert pairs(records_to_documents(df)) == legacy_documents(df)
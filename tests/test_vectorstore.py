@@ -0,0 +1,102 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.storage.vectorstore import QUERY_BATCH, NumpyVectorStore
+
+STATES = ["Jharkhand", "Odisha", "Rajasthan"]
+FILTER = {"state": "Odisha", "persons_killed": {"$gte": 2}}
+
+def unit(n, dim=32, seed=0):
+    v = np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+def records(n):
+    ids = [f"doc{i}" for i in range(n)]
+    texts = [f"accident record {i}" for i in range(n)]
+    metas = [{"state": STATES[i % 3], "year": 2015 + i % 4, "persons_killed": i % 4} for i in range(n)]
+    return ids, texts, metas
+
+def brute_force(queries, vectors, k, allowed=None):
+    allowed = np.arange(len(vectors)) if allowed is None else allowed
+    return allowed[np.argsort(-(queries @ vectors[allowed].T), axis=1, kind="stable")[:, :k]]
+
+@pytest.fixture
+def corpus():
+    vectors = unit(500)
+    return (*records(500), vectors)
+
+@pytest.fixture
+def store_path(tmp_path, corpus):
+    ids, texts, metas, vectors = corpus
+    path = str(tmp_path / "store")
+    store = NumpyVectorStore(path)
+    store.upsert(ids, vectors, texts, metas)
+    store.flush()
+    return path
+
+@pytest.mark.parametrize("k", [1, 10, 50])
+def test_matches_brute_force(store_path, corpus, k):
+    *_, vectors = corpus
+    queries = unit(QUERY_BATCH + 6, seed=1)     # more than one query batch
+    hits = NumpyVectorStore(store_path).search_vectors(queries, k)
+    for (rows, scores), exact, q in zip(hits, brute_force(queries, vectors, k), queries):
+        assert np.array_equal(rows, exact)
+        assert np.allclose(scores, vectors[rows] @ q, atol=1e-6)
+
+def test_k_beyond_store_returns_every_row(store_path):
+    rows, scores = NumpyVectorStore(store_path).search_vectors(unit(1, seed=1), 600)[0]
+    assert sorted(rows) == list(range(500)) and np.all(np.diff(scores) <= 0)
+
+def test_filtered_matches_brute_force(store_path, corpus):
+    _, _, metas, vectors = corpus
+    queries = unit(8, seed=1)
+    allowed = np.flatnonzero([m["state"] == "Odisha" and m["persons_killed"] >= 2 for m in metas])
+    hits = NumpyVectorStore(store_path).search_vectors(queries, 10, FILTER)
+    assert all(np.array_equal(r, e) for (r, _), e in zip(hits, brute_force(queries, vectors, 10, allowed)))
+
+@pytest.mark.parametrize("flt, expected", [
+    ({"state": {"$in": ["Odisha", "Rajasthan"]}}, lambda m: m["state"] != "Jharkhand"),
+    ({"$or": [{"year": 2015}, {"persons_killed": 0}]}, lambda m: m["year"] == 2015 or m["persons_killed"] == 0),
+    ({"$and": [{"state": {"$ne": "Odisha"}}, {"year": {"$lt": 2017}}]},
+     lambda m: m["state"] != "Odisha" and m["year"] < 2017),
+    ({"missing_key": 1}, lambda m: False),
+])
+def test_filters(store_path, corpus, flt, expected):
+    _, _, metas, vectors = corpus
+    queries = unit(3, seed=2)
+    allowed = np.flatnonzero([expected(m) for m in metas])
+    hits = NumpyVectorStore(store_path).search_vectors(queries, 5, flt)
+    assert all(np.array_equal(r, e) for (r, _), e in zip(hits, brute_force(queries, vectors, 5, allowed)))
+
+def test_upsert_replaces_and_delete_removes(store_path, corpus):
+    ids, texts, metas, vectors = corpus
+    store = NumpyVectorStore(store_path)
+    new = unit(2, seed=3)
+    store.upsert(["doc3", "new"], new, ["replaced", "added"], [{"state": "Odisha"}, {"state": "Odisha"}])
+    store.delete(["doc4", "absent"])
+    store.flush()
+
+    store = NumpyVectorStore(store_path)
+    assert len(store) == 500 and "doc4" not in store.existing()
+    docs = store.get_by_ids(["doc3", "new", "doc4", "doc5"])
+    assert [(d.id, d.page_content) for d in docs] == [("doc3", "replaced"), ("new", "added"),
+                                                      ("doc5", "accident record 5")]
+    assert docs[0].metadata == {"state": "Odisha"} and docs[2].metadata == metas[5]
+
+    # Rows are the surviving originals in order, then the upserted ones
+    keep = [i for i in range(500) if i not in (3, 4)]
+    expected = np.concatenate([vectors[keep], new])
+    queries = unit(4, seed=4)
+    hits = store.search_vectors(queries, 10)
+    assert all(np.array_equal(r, e) for (r, _), e in zip(hits, brute_force(queries, expected, 10)))
+
+def test_empty_store(tmp_path):
+    store = NumpyVectorStore(str(tmp_path / "none"))
+    assert len(store) == 0
+    rows, scores = store.search_vectors(unit(1), 4)[0]
+    assert len(rows) == 0 and len(scores) == 0